@@ -3,11 +3,13 @@ from flask_cors import CORS
 from flask_login import current_user, login_required
 from dotenv import load_dotenv
 from werkzeug.exceptions import HTTPException
-from functools import wraps
+from functools import lru_cache, wraps
 import sys
 import os
 import json
 import hashlib
+import hmac
+import base64
 from pathlib import Path
 from urllib.parse import quote
 
@@ -16,13 +18,15 @@ project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from backend.project.extensions import limiter, generate_csrf_token, validate_csrf_token
+from backend.project.lazy import lazy_module
 from backend.project.game_system import sync_user_progression
+from backend.project import scale_path_codec, scale_path_tokens
 
 import threading
 import requests
 import random
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from backend.project.music.chords.intervals.Major import MajorInterval
 from backend.project.music.chords.intervals.Minor import MinorInterval
@@ -33,8 +37,15 @@ from backend.project.music.chords.intervals.Lydian import LydianInterval
 from backend.project.music.chords.intervals.Mixolydian import MixolydianInterval
 from backend.project.music.chords.intervals.Aeolian import AeolianInterval
 from backend.project.music.chords.intervals.Locrian import LocrianInterval
-from backend.project.llm.ChatGPT import ChatGPT
+from backend.project.music import fretboard, pitchset
 from backend.project.music.Music import Music, get_roman_numeral, get_function_name, generate_fretboard_data
+from backend.project.music.config import SCALE_KEYS
+from backend.project.music.scale_catalog import ScaleAnalysisCatalog
+from backend.project.music.theory import analyze
+
+# Heavy stacks stay unimported until a route or the LLM initializer needs them
+chatgpt = lazy_module('backend.project.llm.ChatGPT')
+music_analysis = lazy_module('backend.project.music_analysis')
 
 # Load environment variables
 load_dotenv()
@@ -321,6 +332,38 @@ def _init_db_background():
     except Exception as e:
         print(f"⚠️  Migration failed (will retry on seed): {e}")
     db_ready = True
+    # Legacy challenge rows and streaks read fine before these batched
+    # backfills reach them, so they run after the app is marked ready.
+    try:
+        from backend.project.api.daily_challenges import backfill_challenge_metadata
+        with app.app_context():
+            updated = backfill_challenge_metadata()
+        if updated:
+            print(f"✅ Backfilled typed metadata on {updated} legacy challenges")
+    except Exception as e:
+        print(f"⚠️  Challenge metadata backfill failed (rerun scripts.backfill_challenge_metadata): {e}")
+    try:
+        from backend.project.api.daily_challenges import rebuild_streaks
+        with app.app_context():
+            rebuilt = rebuild_streaks()
+        if rebuilt:
+            print(f"✅ Materialized streaks for {rebuilt} players")
+    except Exception as e:
+        print(f"⚠️  Streak rebuild failed (rerun scripts.rebuild_streaks): {e}")
+    threading.Thread(target=_scale_path_retention_loop, daemon=True).start()
+
+
+def _scale_path_retention_loop():
+    """Sweep expired Scale Path runs and dead attempts every interval."""
+    while True:
+        try:
+            with app.app_context():
+                stats = scale_path_retention.sweep_scale_path_retention()
+            if stats['runs_deleted'] or stats['attempts_deleted']:
+                print(f"✅ Swept {stats['runs_deleted']} Scale Path runs and {stats['attempts_deleted']} attempts")
+        except Exception as e:
+            print(f"⚠️  Scale Path retention sweep failed (rerun scripts.sweep_scale_path_runs): {e}")
+        time.sleep(scale_path_retention.SWEEP_INTERVAL_SECONDS)
 
 if os.getenv('PYMUSIC_DISABLE_BACKGROUND_INIT') != '1' and __name__ != '__main__':
     threading.Thread(target=_init_db_background, daemon=True).start()
@@ -332,7 +375,8 @@ app.register_blueprint(auth_bp, url_prefix='/api/auth')
 from backend.project.api.protected import api_bp
 app.register_blueprint(api_bp)
 
-from backend.project.api.daily_challenges import daily_bp, seed_challenges
+from backend.project.api.daily_challenges import daily_bp, payload_cache_metrics, seed_challenges
+from backend.project import scale_path_retention
 app.register_blueprint(daily_bp)
 
 from backend.project.api.living_city import living_city_bp
@@ -342,17 +386,25 @@ from backend.project.error_logger import log_error, log_request_error
 import time
 
 # Lazy LLM initialization — start in a background thread so Flask serves
-# immediately and Fly.io health checks don't timeout. While the LLM is
-# loading, route handlers fall back to MockLLM (already handled in each route).
+# immediately and Fly.io health checks don't timeout. The theory routes never
+# need it; langchain is only imported here, and the Music teachers only build
+# their prompt chain when generated text is actually requested.
+#
+# Lazy-import mode (PYMUSIC_LAZY_IMPORTS=1) skips the eager start so a cold
+# machine spends no time importing the LLM stack before it answers its first
+# requests. The health check, the only reader of `llm`, starts it instead.
+LAZY_IMPORTS = os.getenv('PYMUSIC_LAZY_IMPORTS') == '1'
 llm = None
 music_system = None
 llm_ready = False
+_llm_started = False
+_llm_start_guard = threading.Lock()
 
 def _init_llm_background():
     global llm, music_system, llm_ready
     try:
         print("🔄 Initializing LLM (background)...")
-        _llm = ChatGPT()
+        _llm = chatgpt.ChatGPT()
         _music = Music(_llm)
         llm = _llm
         music_system = _music
@@ -362,9 +414,20 @@ def _init_llm_background():
         print(f"⚠️  LLM initialization failed: {e}. Using simplified mode.")
         llm_ready = True  # mark done so health check reflects failure too
 
-if os.getenv('PYMUSIC_DISABLE_BACKGROUND_INIT') != '1':
+def ensure_llm_started():
+    """Start the background LLM initialization once; safe to call repeatedly."""
+    global _llm_started
+    if os.getenv('PYMUSIC_DISABLE_BACKGROUND_INIT') == '1':
+        return
+    with _llm_start_guard:
+        if _llm_started:
+            return
+        _llm_started = True
     threading.Thread(target=_init_llm_background, daemon=True).start()
 
+if not LAZY_IMPORTS:
+    ensure_llm_started()
+
 # Available interval types — all 7 diatonic modes.
 # 'major' and 'minor' are removed (aliases for ionian/aeolian; use those instead).
 INTERVALS = {
@@ -380,13 +443,38 @@ INTERVALS = {
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
+    """Health check endpoint
+
+    Starts the LLM in lazy-import mode, so ``llm_available`` turns true once
+    the background build finishes. This response never waits for it.
+    """
+    ensure_llm_started()
     return jsonify({
         "status": "healthy",
         "llm_available": llm is not None,
         "intervals_available": list(INTERVALS.keys())
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Hit/miss counters for the in-process lookup caches, plus retention sweep totals.
+
+    Operators only: with ``PYMUSIC_METRICS_TOKEN`` set, callers send it as
+    ``Authorization: Bearer <token>``; without it, a signed-in session is required.
+    """
+    metrics_token = os.getenv('PYMUSIC_METRICS_TOKEN')
+    if metrics_token:
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        if not hmac.compare_digest(supplied.encode('utf-8'), metrics_token.encode('utf-8')):
+            return jsonify({'error': 'Metrics token missing or invalid'}), 401
+    elif not current_user.is_authenticated:
+        return jsonify({'error': 'Authentication required'}), 401
+    return jsonify({
+        "scale_analysis": music_analysis.cache_metrics() if music_analysis.loaded else None,
+        "daily_challenge_payloads": payload_cache_metrics(),
+        "scale_path_retention": scale_path_retention.retention_metrics(),
+    })
+
 @app.route('/api/intervals', methods=['GET'])
 def get_available_intervals():
     """Get list of available scale modes"""
@@ -413,6 +501,37 @@ def get_music_config():
         "fretboardDirection": "leftToRight"
     })
 
+def _compute_scale_analysis(key, interval_type, octaves):
+    return analyze(key, interval_type, octaves=octaves).to_dict()
+
+
+# Every /api/scale response is deterministic, so each one is built once and
+# then served from this table as pre-serialized bytes with an ETag.
+scale_catalog = ScaleAnalysisCatalog(_compute_scale_analysis, INTERVALS.keys())
+
+
+def _warm_scale_catalog():
+    try:
+        print(f"✅ Scale catalog warmed ({scale_catalog.warm()} responses)")
+    except Exception as e:
+        print(f"⚠️  Scale catalog warmup failed (entries build on demand): {e}")
+
+def _warm_scale_analysis():
+    try:
+        print(f"✅ Scale analysis cache warmed ({music_analysis.warm_cache()} tonics)")
+    except Exception as e:
+        print(f"⚠️  Scale analysis warmup failed (lookups fill on demand): {e}")
+
+# Loading the Scale Lab match index on boot keeps that cost off the first
+# verify; PYMUSIC_WARM_SCALE_ANALYSIS=0 leaves it to the first request.
+WARM_SCALE_ANALYSIS = os.getenv('PYMUSIC_WARM_SCALE_ANALYSIS', '1') == '1'
+
+if os.getenv('PYMUSIC_DISABLE_BACKGROUND_INIT') != '1':
+    threading.Thread(target=_warm_scale_catalog, daemon=True).start()
+    if WARM_SCALE_ANALYSIS:
+        threading.Thread(target=_warm_scale_analysis, daemon=True).start()
+
+
 @limiter.limit("30 per minute")
 @app.route('/api/scale/<key>', methods=['GET'])
 def get_scale_analysis(key):
@@ -424,22 +543,10 @@ def get_scale_analysis(key):
         if interval_type not in INTERVALS:
             return jsonify({"error": f"Invalid interval type. Available: {list(INTERVALS.keys())}"}), 400
 
-        if music_system:
-            response = music_system.getCompleteScaleAnalysis(key, interval_type, octaves=octaves)
-        else:
-            class MockLLM:
-                def getParser(self):
-                    class MockParser:
-                        def get_format_instructions(self):
-                            return ''
-                    return MockParser()
-                def startingChain(self, prompt):
-                    pass
-
-            music = Music(MockLLM())
-            response = music.getCompleteScaleAnalysis(key, interval_type, octaves=octaves)
-
-        return jsonify(response)
+        entry = scale_catalog.get(key, interval_type, octaves)
+        response = current_app.response_class(entry.body, mimetype='application/json')
+        response.set_etag(entry.etag)
+        return response.make_conditional(request)
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -453,35 +560,12 @@ def get_chord_progressions(key):
         if interval_type not in INTERVALS:
             return jsonify({"error": f"Invalid interval type. Available: {list(INTERVALS.keys())}"}), 400
 
-        if music_system:
-            music_system.setTune(key.upper())
-            interval = INTERVALS[interval_type]()
-            music_system.setInterval(interval)
-            music_system.getNotesFromTune()
-            music_system.getChords()
-            progressions = music_system.getChordProgressions()
-        else:
-            class MockLLM:
-                def getParser(self):
-                    class MockParser:
-                        def get_format_instructions(self):
-                            return ''
-                    return MockParser()
-                def startingChain(self, prompt):
-                    pass
-
-            music = Music(MockLLM())
-            music.setTune(key.upper())
-            interval = INTERVALS[interval_type]()
-            music.setInterval(interval)
-            music.getNotesFromTune()
-            music.getChords()
-            progressions = music.getChordProgressions()
+        analysis = analyze(key, interval_type)
 
         return jsonify({
-            "key": key.upper(),
+            "key": analysis.key,
             "interval_type": interval_type,
-            "progressions": progressions
+            "progressions": analysis.progressions
         })
 
     except Exception as e:
@@ -496,37 +580,14 @@ def get_secondary_dominants(key):
         if interval_type not in INTERVALS:
             return jsonify({"error": f"Invalid interval type. Available: {list(INTERVALS.keys())}"}), 400
 
-        if music_system:
-            music_system.setTune(key.upper())
-            interval = INTERVALS[interval_type]()
-            music_system.setInterval(interval)
-            music_system.getNotesFromTune()
-            chords = music_system.getChords()
-            sevenths = music_system.getSeventhNoteToIt()
-        else:
-            class MockLLM:
-                def getParser(self):
-                    class MockParser:
-                        def get_format_instructions(self):
-                            return ''
-                    return MockParser()
-                def startingChain(self, prompt):
-                    pass
-
-            music = Music(MockLLM())
-            music.setTune(key.upper())
-            interval = INTERVALS[interval_type]()
-            music.setInterval(interval)
-            music.getNotesFromTune()
-            chords = music.getChords()
-            sevenths = music.getSeventhNoteToIt()
+        analysis = analyze(key, interval_type)
 
         return jsonify({
-            "key": key.upper(),
+            "key": analysis.key,
             "interval_type": interval_type,
             "secondary_dominants": [
                 {"target_chord": chord, "dominant_seventh": seventh}
-                for chord, seventh in zip(chords, sevenths) if isinstance(sevenths, list)
+                for chord, seventh in zip(analysis.chords, analysis.secondary_dominants)
             ]
         })
 
@@ -547,8 +608,7 @@ def log_client_error():
 @app.route('/api/keys', methods=['GET'])
 def get_available_keys():
     """Get list of available keys"""
-    keys = ['C', 'C#', 'Db', 'D', 'D#', 'Eb', 'E', 'F', 'F#', 'Gb', 'G', 'G#', 'Ab', 'A', 'A#', 'Bb', 'B']
-    return jsonify({"keys": keys})
+    return jsonify({"keys": list(SCALE_KEYS)})
 
 # Serve static files from frontend/dist
 @app.route('/', defaults={'path': ''})
@@ -578,106 +638,51 @@ def init_db():
 
 # ─── Scale Path (assessed) ─────────────────────────────────────────────────────
 
+# Guitar standard tuning in the same low-E → high-E order used by the
+# shared frontend instrument. This index contract makes server candidates
+# light up on the string the player can actually click.
+SCALE_ROUTE_TUNING = fretboard.STANDARD_TUNING
+
+
 def _build_scale_route(root_key, mode, octaves, fret_count):
     """Generate a playable route of scale notes on the guitar fretboard."""
-    NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-    MODE_INTERVALS = {
-        'ionian': [0, 2, 4, 5, 7, 9, 11],
-        'aeolian': [0, 2, 3, 5, 7, 8, 10],
-        'dorian': [0, 2, 3, 5, 7, 9, 10],
-        'mixolydian': [0, 2, 4, 5, 7, 9, 10],
-        'phrygian': [0, 1, 3, 5, 7, 8, 10],
-        'lydian': [0, 2, 4, 6, 7, 9, 11],
-        'locrian': [0, 1, 3, 5, 6, 8, 10],
-    }
-
     # Keep route generation independent of optional LLM/music-system startup.
     # A Scale Path run must always have a playable, deterministic note set.
-    NOTE_TONES = {
-        'C': 0, 'C#': 1, 'DB': 1, 'D': 2, 'D#': 3, 'EB': 3,
-        'E': 4, 'F': 5, 'F#': 6, 'GB': 6, 'G': 7, 'G#': 8,
-        'AB': 8, 'A': 9, 'A#': 10, 'BB': 10, 'B': 11,
-    }
-    root_tone = NOTE_TONES.get(root_key.upper(), 0)
-    scale_notes = [NOTE_NAMES[(root_tone + interval) % 12] for interval in MODE_INTERVALS.get(mode, MODE_INTERVALS['ionian'])]
-
-    # Guitar standard tuning in the same low-E → high-E order used by the
-    # shared frontend instrument. This index contract makes server candidates
-    # light up on the string the player can actually click.
-    TUNING = [('E', -1), ('A', 0), ('D', 1), ('G', 2), ('B', 3), ('E', 4)]
-
-    def note_to_semitone(note):
-        return NOTE_TONES.get(note.upper(), 0)
-
-    # Build all scale-note positions on the fretboard up to fret_count
-    positions = []
-    for string_note, string_offset in TUNING:
-        base_tone = note_to_semitone(string_note)
-        for fret in range(fret_count + 1):
-            pos_tone = (base_tone + fret) % 12
-            if scale_notes:
-                # Match by note name (handle sharps)
-                matching = [n for n in scale_notes
-                            if note_to_semitone(n) == pos_tone]
-                if matching:
-                    positions.append({
-                        'string': string_note,
-                        'fret': fret,
-                        'note': matching[0],
-                        'stringIndex': TUNING.index((string_note, string_offset)),
-                        'pitch': pos_tone,
-                    })
-            else:
-                # Fallback: any note matching the mode's expected degrees
-                pass
-
-    return positions
+    root_tone = pitchset.pitch_class(root_key[:1].upper() + root_key[1:].lower(), 0)
+    scale_mask = pitchset.transpose(
+        pitchset.SCALE_MASKS[mode if mode in pitchset.MODES else 'ionian'], root_tone,
+    )
+    # The position dicts are shared with the cached route table; callers
+    # copy them ({**position}) before adding fields.
+    return list(fretboard.scale_route(SCALE_ROUTE_TUNING, scale_mask, fret_count))
 
 
 def _select_tier1_fragment(
         positions, root_key, mode, fragment_index=0, seed=0,
-        route_modifier='nearest-position', anchor=None, visited=None):
-    """Select one deterministic movement with several physically playable choices."""
+        route_modifier='nearest-position', anchor=None, visited=None, neighbours=None):
+    """Select one deterministic movement with several physically playable choices.
+
+    A run passes its ``fretboard.RouteNeighbours`` as ``neighbours`` and calls
+    ``visit`` after each move; that index then stands in for ``visited``.
+    """
     if len(positions) < 5:
         return None
     rng = random.Random(seed + fragment_index * 7919)
-    visited_keys = {
-        (position['stringIndex'], position['fret']) for position in (visited or [])
-    }
-    playable = [
-        position for position in positions
-        if 0 <= position['fret'] <= 24
-        and ((position['stringIndex'], position['fret']) not in visited_keys or position == anchor)
-    ]
-    anchor_index = (seed + fragment_index * 5) % max(1, len(playable) - 1)
-    anchor = anchor or playable[anchor_index]
-    open_midi = [40, 45, 50, 55, 59, 64]
-    anchor_midi = open_midi[anchor['stringIndex']] + anchor['fret']
-    eligible = [position for position in playable if position != anchor]
-    if route_modifier == 'same-string':
-        eligible = [position for position in eligible if position['stringIndex'] == anchor['stringIndex']]
-    elif route_modifier == 'alternate-strings':
-        eligible = [position for position in eligible if position['stringIndex'] != anchor['stringIndex']]
-    elif route_modifier == 'ascending':
-        eligible = [position for position in eligible if open_midi[position['stringIndex']] + position['fret'] > anchor_midi]
-    elif route_modifier == 'descending':
-        eligible = [position for position in eligible if open_midi[position['stringIndex']] + position['fret'] < anchor_midi]
-    elif route_modifier == 'octave-target':
-        eligible = [position for position in eligible if position['pitch'] == anchor['pitch']]
-    if not eligible:
-        eligible = [position for position in playable if position != anchor]
-    eligible.sort(key=lambda position: (
-        abs(position['fret'] - anchor['fret']) + abs(position['stringIndex'] - anchor['stringIndex']) * 2,
-        position['stringIndex'], position['fret'],
-    ))
-    choice_window = eligible[:max(1, min(6, len(eligible)))]
+    if neighbours is None:
+        neighbours = fretboard.RouteNeighbours(positions, visited or ())
+    playable = neighbours.playable(anchor)
+    if anchor is None:
+        anchor = playable[(seed + fragment_index * 5) % max(1, len(playable) - 1)]
+    choice_window = (
+        neighbours.nearest(anchor, 6, route_modifier)
+        or neighbours.nearest(anchor, 6)
+    )
     correct_gap = choice_window[(seed + fragment_index) % len(choice_window)]
     suffix_positions = [anchor]
 
-    wrong_options = [
-        position for position in playable
-        if position != correct_gap and position['pitch'] != correct_gap['pitch']
-    ]
+    # The shuffle consumes one draw per option, so the full list is kept to
+    # leave every seeded run exactly as it was.
+    wrong_options = [position for position in playable if position['pitch'] != correct_gap['pitch']]
     rng.shuffle(wrong_options)
     candidates = [{**correct_gap, 'isCorrect': True}]
     used_pitches = {correct_gap['pitch']}
@@ -691,14 +696,14 @@ def _select_tier1_fragment(
     rng.shuffle(candidates)
 
     direction = 'left' if correct_gap['string'] == anchor['string'] else 'up'
-    root_pitch = {'C': 0, 'C#': 1, 'DB': 1, 'D': 2, 'D#': 3, 'EB': 3, 'E': 4, 'F': 5, 'F#': 6, 'GB': 6, 'G': 7, 'G#': 8, 'AB': 8, 'A': 9, 'A#': 10, 'BB': 10, 'B': 11}.get(root_key.upper(), 0)
-    intervals = {
-        'ionian': [0, 2, 4, 5, 7, 9, 11], 'dorian': [0, 2, 3, 5, 7, 9, 10],
-        'phrygian': [0, 1, 3, 5, 7, 8, 10], 'lydian': [0, 2, 4, 6, 7, 9, 11],
-        'mixolydian': [0, 2, 4, 5, 7, 9, 10], 'aeolian': [0, 2, 3, 5, 7, 8, 10],
-        'locrian': [0, 1, 3, 5, 6, 8, 10],
-    }.get(mode, [0, 2, 4, 5, 7, 9, 11])
-    degree = intervals.index((correct_gap['pitch'] - root_pitch) % 12) + 1
+    # Unknown roots and modes fall back to C and ionian, as in _build_scale_route.
+    root_pitch = pitchset.pitch_class(root_key[:1].upper() + root_key[1:].lower(), 0)
+    scale_mask = pitchset.SCALE_MASKS[mode if mode in pitchset.MODES else 'ionian']
+    offset = (correct_gap['pitch'] - root_pitch) % 12
+    if not pitchset.contains(scale_mask, offset):
+        raise ValueError(f'pitch {correct_gap["pitch"]} is not in {root_key} {mode}')
+    # The degree is one more than the scale tones below the gap's offset.
+    degree = pitchset.POPCOUNT[scale_mask & ((1 << offset) - 1)] + 1
 
     return {
         'root': root_key.upper(),
@@ -726,98 +731,140 @@ def _public_scale_path_fragment(fragment):
     }
 
 
+# Regenerated runs, keyed by everything that shapes them. Completions for a
+# run usually land on the worker that started it, so most are cache hits.
+# Entries are packed with scale_path_codec: about 130 bytes a run, where the
+# dicts took over 10 KB.
+SCALE_PATH_RUN_CACHE_SIZE = 1024
+
+
+def _generate_scale_path_run(seed, root, mode, octaves, route_modifier):
+    """Return ``(positions, fragments)`` for a run, answers included."""
+    fret_count = {1: 12, 2: 17, 3: 22}.get(octaves, 12)
+    positions = _build_scale_route(root, mode, octaves, fret_count)
+
+    # Every run is a real multi-step journey. The displayed die result is
+    # determined by the seed before its animation starts.
+    fragments = []
+    journey_anchor = None
+    neighbours = fretboard.RouteNeighbours(positions)
+    for i in range(6 + (seed % 2)):
+        frag = _select_tier1_fragment(
+            positions, root, mode, i, seed, route_modifier,
+            anchor=journey_anchor, neighbours=neighbours,
+        )
+        if frag:
+            frag['fragmentIndex'] = i
+            fragments.append(frag)
+            journey_anchor = frag['gap']
+            neighbours.visit(frag['gap'])
+    return positions, fragments
+
+
+@lru_cache(maxsize=SCALE_PATH_RUN_CACHE_SIZE)
+def _scale_path_run(seed, root, mode, octaves, route_modifier):
+    """Return a run's positions and fragments, answers included, as a packed blob."""
+    positions, fragments = _generate_scale_path_run(seed, root, mode, octaves, route_modifier)
+    return scale_path_codec.encode_run(root, mode, positions, fragments)
+
+
 @app.route('/api/scale-path/run', methods=['GET'])
 @login_required
 def get_scale_path_run():
     """Get a seeded Scale Trail run with exactly six or seven movements.
 
-    The server also stores the run so the completion endpoint can validate
-    submitted positions without trusting client-supplied correctness.
+    The run id is a signed token naming the run's inputs, so the completion
+    endpoint can regenerate the run and validate submitted positions without
+    trusting client-supplied correctness or storing the run.
+
+    ``encoding=packed`` replaces ``positions`` and ``fragments`` with
+    ``packed``, the base64 scale_path_codec blob of both, and ``codec``, its
+    version.
     """
     try:
         seed_text = request.args.get('seed') or os.urandom(8).hex()
         seed = int(hashlib.sha256(seed_text.encode('utf-8')).hexdigest()[:12], 16)
         rng = random.Random(seed)
-        root = request.args.get('root') or rng.choice(['C', 'G', 'D', 'A', 'E', 'F'])
+        root = (request.args.get('root') or rng.choice(['C', 'G', 'D', 'A', 'E', 'F'])).upper()
         mode = request.args.get('mode') or rng.choice(['ionian', 'aeolian', 'dorian', 'mixolydian'])
+        if root not in scale_path_tokens.ROOTS:
+            return jsonify({'error': f'Unknown root: {root}'}), 400
+        if mode not in scale_path_tokens.MODES:
+            return jsonify({'error': f'Unknown mode: {mode}'}), 400
         octaves = max(1, min(3, int(request.args.get('octaves', 1))))
         difficulty = max(1, min(5, int(request.args.get('difficulty', 1))))
         fret_count = {1: 12, 2: 17, 3: 22}.get(octaves, 12)
-        move_count = 6 + (seed % 2)
-        route_modifier = rng.choice([
-            'ascending', 'descending', 'same-string', 'nearest-position',
-            'alternate-strings', 'octave-target', 'listen-first',
-        ])
-
-        # Build full route for this run
-        positions = _build_scale_route(root, mode, octaves, fret_count)
-
-        # Every run is a real multi-step journey. The displayed die result is
-        # determined here before its animation starts.
-        fragments = []
-        journey_anchor = None
-        visited_positions = []
-        for i in range(move_count):
-            frag = _select_tier1_fragment(
-                positions, root, mode, i, seed, route_modifier,
-                anchor=journey_anchor, visited=visited_positions,
-            )
-            if frag:
-                frag['fragmentIndex'] = i
-                fragments.append(frag)
-                journey_anchor = frag['gap']
-                visited_positions.append(frag['gap'])
-
-        run_id = f'scale-path-{root}-{mode}-{int(time.time())}-{os.urandom(4).hex()}'
-        user_id = current_user.id if current_user.is_authenticated else None
-
-        # Persist the run so completion requests can be validated against it.
-        # We keep the run for 24h; the request body is small and authoritative.
-        from backend.project.models.user import ScalePathRun
-        run_row = ScalePathRun(
-            run_id=run_id,
-            user_id=user_id,
-            root=root.upper(),
-            mode=mode,
-            difficulty=difficulty,
-            octaves=octaves,
-            fret_count=fret_count,
-            fragments_json=json.dumps(fragments),
-            positions_json=json.dumps(positions),
-            expires_at=datetime.utcnow() + timedelta(hours=24),
+        route_modifier = rng.choice(scale_path_tokens.ROUTE_MODIFIERS)
+
+        positions, fragments = scale_path_codec.decode_run(
+            _scale_path_run(seed, root, mode, octaves, route_modifier)
         )
-        db.session.add(run_row)
-        db.session.commit()
+        run_id = scale_path_tokens.encode_run_token(scale_path_tokens.RunToken(
+            user_id=current_user.id, issued_at=int(time.time()), seed=seed, root=root, mode=mode,
+            route_modifier=route_modifier, octaves=octaves, difficulty=difficulty,
+        ), current_app.config['SECRET_KEY'])
 
-        return jsonify({
+        run = {
             'runId': run_id,
-            'root': root.upper(),
+            'root': root,
             'mode': mode,
             'difficulty': difficulty,
             'octaves': octaves,
             'fretCount': fret_count,
             'seed': seed_text,
-            'dieResult': move_count,
+            'dieResult': 6 + (seed % 2),
             'routeModifier': route_modifier,
+        }
+        if request.args.get('encoding') == 'packed':
+            packed = scale_path_codec.encode_run(root, mode, positions[:60], fragments, with_answers=False)
+            return jsonify({**run, 'codec': scale_path_codec.CODEC_VERSION,
+                            'packed': base64.b64encode(packed).decode('ascii')})
+        return jsonify({
+            **run,
             'positions': positions[:60],  # Send capped positions for the game
             'fragments': [_public_scale_path_fragment(fragment) for fragment in fragments],
         })
     except Exception as e:
-        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 
+def _load_scale_path_fragment(run_id, fragment_index):
+    """Return ``(user_id, expires_at, difficulty, fragment)`` for a run id, or None.
+
+    ``fragment`` is None when the run has no such fragment. Signed ids are
+    regenerated and only the requested fragment is unpacked. Ids from before
+    signed runs still resolve through their ``scale_path_runs`` row until it
+    expires.
+    """
+    token = scale_path_tokens.decode_run_token(run_id, current_app.config['SECRET_KEY'])
+    if token is not None:
+        packed = _scale_path_run(token.seed, token.root, token.mode, token.octaves, token.route_modifier)
+        fragment = (
+            scale_path_codec.decode_fragment(packed, fragment_index)
+            if 0 <= fragment_index < scale_path_codec.fragment_count(packed) else None
+        )
+        return token.user_id, datetime.utcfromtimestamp(token.expires_at), token.difficulty, fragment
+
+    from backend.project.models.user import ScalePathRun
+    run = ScalePathRun.query.filter_by(run_id=run_id).first()
+    if not run:
+        return None
+    fragments = json.loads(run.fragments_json)
+    fragment = fragments[fragment_index] if 0 <= fragment_index < len(fragments) else None
+    return run.user_id, run.expires_at, run.difficulty, fragment
+
+
 @app.route('/api/scale-path/complete', methods=['POST'])
 @limiter.limit('60 per minute', override_defaults=True)
 def complete_scale_path_fragment():
     """Submit a Scale Path fragment result; the server validates correctness
-    against the stored run and only awards XP for genuinely correct answers.
+    against the regenerated run and only awards XP for genuinely correct answers.
 
     Idempotent per (user, run, fragment) — replays return the original result
     without re-awarding XP.
     """
     try:
-        from backend.project.models.user import ScalePathRun, ScalePathAttempt
+        from backend.project.models.user import ScalePathAttempt
 
         if not current_user.is_authenticated:
             return jsonify({
@@ -828,26 +875,25 @@ def complete_scale_path_fragment():
             }), 401
 
         data = request.get_json() or {}
-        run_id = data.get('runId', '')
+        run_id = str(data.get('runId', ''))
         fragment_index = int(data.get('fragmentIndex', 0))
         submitted_position = data.get('submittedPosition') or {}
         submitted_midi = data.get('submittedMidi')
 
-        run = ScalePathRun.query.filter_by(run_id=run_id).first()
+        run = _load_scale_path_fragment(run_id, fragment_index)
         if not run:
             return jsonify({'error': 'Unknown run. Start a new run before submitting.'}), 400
-        if run.user_id != current_user.id:
+        run_user_id, expires_at, difficulty, fragment = run
+        if run_user_id != current_user.id:
             return jsonify({'error': 'This run belongs to another account.'}), 403
-        if run.expires_at and run.expires_at < datetime.utcnow():
+        if expires_at and expires_at < datetime.utcnow():
             return jsonify({'error': 'This run has expired. Start a new run before submitting.'}), 410
 
-        fragments = json.loads(run.fragments_json)
-        if fragment_index < 0 or fragment_index >= len(fragments):
+        if fragment is None:
             return jsonify({'error': 'Fragment index out of range'}), 400
-        fragment = fragments[fragment_index]
         correct_gap = fragment.get('gap') or {}
 
-        # The server compares the submitted position against the stored
+        # The server compares the submitted position against the run's
         # answer. The client cannot mark itself correct.
         guitar_correct = (
             submitted_position.get('string') == correct_gap.get('string')
@@ -877,7 +923,7 @@ def complete_scale_path_fragment():
 
         xp_awarded = 0
         if is_correct:
-            xp_awarded = min(50, max(10, 10 * (run.difficulty or 1)))
+            xp_awarded = min(50, max(10, 10 * (difficulty or 1)))
 
         attempt = ScalePathAttempt(
             user_id=current_user.id,
@@ -891,13 +937,12 @@ def complete_scale_path_fragment():
             current_user.xp = (current_user.xp or 0) + xp_awarded
             current_user.lifetime_points = (current_user.lifetime_points or 0) + xp_awarded
             sync_user_progression(current_user)
-        from backend.project.api.daily_challenges import _record_quest_progress
+        from backend.project.api.daily_challenges import _record_quest_progress_many
         period_key = datetime.utcnow().strftime('%Y-%m-%d')
-        _record_quest_progress(current_user.id, 'play', 'daily', period_key)
-        _record_quest_progress(current_user.id, 'play', 'milestone', 'lifetime')
+        quest_entries = [('play', period_key), ('play', 'lifetime')]
         if is_correct:
-            _record_quest_progress(current_user.id, 'correct', 'daily', period_key)
-            _record_quest_progress(current_user.id, 'correct', 'milestone', 'lifetime')
+            quest_entries += [('correct', period_key), ('correct', 'lifetime')]
+        _record_quest_progress_many(current_user.id, quest_entries)
         db.session.commit()
 
         return jsonify({
@@ -915,20 +960,38 @@ def complete_scale_path_fragment():
 
 @app.route('/api/scale-path/verify', methods=['POST'])
 def verify_scale_lab_build():
-    """Analyze a Scale Lab formula with music21. No XP is awarded here."""
+    """Analyze a Scale Lab formula against the music21-derived match index. No XP is awarded here."""
     try:
         data = request.get_json() or {}
         root = data.get('root', 'C').upper()
         mode = data.get('mode', 'ionian')
         selected_notes = data.get('selectedNotes', [])
-        from backend.project.music_analysis import analyze_scale_build
-        return jsonify(analyze_scale_build(root, mode, selected_notes))
+        return jsonify(music_analysis.analyze_scale_build(root, mode, selected_notes))
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+SCALE_VERIFY_BATCH_LIMIT = 100
+
+
+@app.route('/api/scale-path/verify-batch', methods=['POST'])
+def verify_scale_lab_builds():
+    """Analyze several Scale Lab formulas in one request. No XP is awarded here.
+
+    Results come back in item order; an invalid item gets an ``error`` entry
+    in its slot while the rest of the batch is still analyzed.
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get('items')
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'items must be a non-empty list'}), 400
+    if len(items) > SCALE_VERIFY_BATCH_LIMIT:
+        return jsonify({'error': f'At most {SCALE_VERIFY_BATCH_LIMIT} items per batch'}), 400
+    return jsonify({'results': music_analysis.analyze_scale_builds(items)})
+
+
 if __name__ == '__main__':
     init_db()
     print("🎵 Starting Music Theory API...")
@@ -11,21 +11,30 @@ Endpoints:
   GET  /api/user/streak             — compute current daily streak
 """
 import json
+import os
 import random
 import re
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import islice
 
 from flask import Blueprint, current_app, request, jsonify
 from flask_login import current_user, login_required
-from sqlalchemy.exc import IntegrityError
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
 
 from backend.project.extensions import limiter
 from ..daily_challenge_explanations import build_daily_challenge_explanation
 from ..game_system import get_mode_base_xp, sync_user_progression
 from backend.project.models import db
 from backend.project.models.user import (
-    DailyChallenge, ChallengeAttempt, DailyHintUsage, DailyHintReveal, QuestProgress,
+    DailyChallenge, ChallengeAttempt, DailyHintUsage, DailyHintReveal, QuestProgress, SkillReview, UserStreak,
 )
+from backend.project.music import pitchset
 from backend.project.music.chord_inventory import (
     CHORD_QUALITIES,
     PITCH_CLASSES,
@@ -35,6 +44,7 @@ from backend.project.music.chord_inventory import (
     inventory_payload,
 )
 from ..gamification import quest_period_key
+from ..spaced_repetition import START_EASE, review_quality, sm2_step
 
 daily_bp = Blueprint('daily', __name__, url_prefix='/api')
 
@@ -168,21 +178,20 @@ def _tone_name(note_index, octave):
 
 def _scale_visual(root, scale_type):
     intervals = SCALE_FORMULAS[scale_type]
-    root_index = NOTES.index(root)
+    root_index = pitchset.PITCH_CLASS_OF[root]
     return {
         'kind': 'scale', 'root': root, 'intervals': intervals,
         'degrees': SCALE_DEGREES[:len(intervals)],
-        'notes': [NOTES[(root_index + interval) % 12] for interval in intervals],
-        'pitch_classes': [(root_index + interval) % 12 for interval in intervals],
+        'notes': pitchset.spell(root_index, intervals),
+        'pitch_classes': pitchset.scale_pitch_classes(root_index, intervals),
     }
 
 
 def _chord_visual(root, label):
     intervals = CHORD_INTERVALS[label]
-    root_index = NOTES.index(root)
     return {'kind': 'chord', 'chords': [{
         'root': root, 'intervals': intervals,
-        'notes': [NOTES[(root_index + interval) % 12] for interval in intervals],
+        'notes': pitchset.spell(pitchset.PITCH_CLASS_OF[root], intervals),
         'degrees': ['1', '3', '5', '7'][:len(intervals)],
     }]}
 
@@ -372,29 +381,84 @@ def build_ear_exercise(challenge):
     }
 
 
+CHALLENGE_PAYLOAD_CACHE_SIZE = int(os.getenv('PYMUSIC_CHALLENGE_PAYLOAD_CACHE_SIZE', '4096'))
+_payload_cache = OrderedDict()
+_payload_cache_lock = threading.Lock()
+_payload_cache_counts = {'hits': 0, 'misses': 0}
+
+
 def serialize_challenge(challenge):
     """Serialize a challenge row for the public Daily API.
 
     Correctness is intentionally omitted. The browser submits an option index
     to the completion endpoint and learns the verdict only after the server
     compares it with the stored answer.
+
+    The payload is a pure function of the row, so it is kept in a bounded LRU
+    keyed on ``(id, stimulus_version, created_at)``; `created_at` changes when
+    a reseed reuses an id. Each call gets a shallow copy, and nested values
+    are shared between responses, so callers must not mutate them.
     """
+    key = (challenge.id, challenge.stimulus_version, challenge.created_at)
+    with _payload_cache_lock:
+        cached = _payload_cache.get(key)
+        if cached is not None:
+            _payload_cache.move_to_end(key)
+            _payload_cache_counts['hits'] += 1
+        else:
+            _payload_cache_counts['misses'] += 1
+    if cached is None:
+        cached = _build_payload(challenge)
+        if CHALLENGE_PAYLOAD_CACHE_SIZE > 0:
+            with _payload_cache_lock:
+                _payload_cache[key] = cached
+                while len(_payload_cache) > CHALLENGE_PAYLOAD_CACHE_SIZE:
+                    _payload_cache.popitem(last=False)
+
+    payload, correct_index = cached
+    data = dict(payload)
+    if current_app.config.get('E2E_EXPOSE_ANSWERS') and correct_index is not None:
+        data['correct_index'] = correct_index
+    return data
+
+
+def clear_payload_cache():
+    with _payload_cache_lock:
+        _payload_cache.clear()
+
+
+def payload_cache_metrics():
+    """Hit/miss counters for the serialized challenge payload cache."""
+    with _payload_cache_lock:
+        hits, misses = _payload_cache_counts['hits'], _payload_cache_counts['misses']
+        size = len(_payload_cache)
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'size': size,
+        'max_size': CHALLENGE_PAYLOAD_CACHE_SIZE,
+        'hit_rate': round(hits / lookups, 4) if lookups else None,
+    }
+
+
+def _build_payload(challenge):
+    """Return ``(public payload, answer index)`` for one challenge row."""
     data = challenge.to_dict()
     data['xp_reward'] = get_mode_base_xp('challenge', challenge.difficulty)
-    # Backfill typed metadata from the legacy row so the curriculum contract is
-    # satisfied without re-seeding. Newly seeded rows already persist this.
+    # Legacy rows get their typed metadata from `backfill_challenge_metadata`;
+    # until that has reached them, derive the same values without writing.
     if not challenge.skill_id:
-        _backfill_challenge_metadata(challenge, data)
+        data.update(_legacy_metadata(challenge))
     if not data['visual']:
         data['visual'], data['question_type'], data['question'] = _legacy_visual(challenge)
-    data.pop('correct_index', None)
-    if current_app.config.get('E2E_EXPOSE_ANSWERS'):
-        data['correct_index'] = challenge.correct_index
+    correct_index = data.pop('correct_index', None)
     if challenge.category != 'ear_training':
-        return data
+        return data, correct_index
 
     exercise = build_ear_exercise(challenge)
-    e2e_correct_index = exercise.get('correct_index')
+    if exercise.get('correct_index') is not None:
+        correct_index = exercise['correct_index']
     data.update({
         'title': exercise['title'],
         'question': exercise['question'],
@@ -405,32 +469,66 @@ def serialize_challenge(challenge):
         'visual': _ear_visual(exercise),
     })
     data['exercise'].pop('correct_index', None)
-    if current_app.config.get('E2E_EXPOSE_ANSWERS') and e2e_correct_index is not None:
-        data['correct_index'] = e2e_correct_index
-    return data
+    return data, correct_index
 
 
-def _backfill_challenge_metadata(challenge, data):
-    """Fill skill_id, modality, rank band, and difficulty axis for legacy rows
-    based on the existing category and question_type. This is a one-time
-    migration; new rows set these values during seed_challenges."""
+def _legacy_metadata(challenge):
+    """Typed metadata for a legacy row, as `backfill_challenge_metadata` stores it."""
     category = challenge.category
     meta = CATEGORY_METADATA.get(category)
     if not meta:
-        return
-    challenge.skill_id = challenge.skill_id or f'{category}.{challenge.question_type or "generic"}'
-    challenge.modality = challenge.modality or meta['modality']
-    challenge.rank_band_min = challenge.rank_band_min or meta['rank_min']
-    challenge.rank_band_max = challenge.rank_band_max or meta['rank_max']
-    challenge.difficulty_axis = challenge.difficulty_axis or meta['axis']
-    challenge.stimulus_version = challenge.stimulus_version or STIMULUS_VERSION
-    db.session.add(challenge)
-    data['skill_id'] = challenge.skill_id
-    data['modality'] = challenge.modality
-    data['rank_band_min'] = challenge.rank_band_min
-    data['rank_band_max'] = challenge.rank_band_max
-    data['difficulty_axis'] = challenge.difficulty_axis
-    data['stimulus_version'] = challenge.stimulus_version
+        return {}
+    return {
+        'skill_id': challenge.skill_id or f'{category}.{challenge.question_type or "generic"}',
+        'modality': challenge.modality or meta['modality'],
+        'rank_band_min': challenge.rank_band_min or meta['rank_min'],
+        'rank_band_max': challenge.rank_band_max or meta['rank_max'],
+        'difficulty_axis': challenge.difficulty_axis or meta['axis'],
+        'stimulus_version': challenge.stimulus_version or STIMULUS_VERSION,
+    }
+
+
+BACKFILL_BATCH_SIZE = 2000
+
+
+def backfill_challenge_metadata(batch_size=BACKFILL_BATCH_SIZE, progress=None):
+    """Persist skill_id, modality, rank band, difficulty axis and stimulus
+    version on legacy rows, from their category and question_type.
+
+    Rows are walked in id order, `batch_size` at a time, with one UPDATE per
+    category per batch and a commit after each batch. Finished rows no longer
+    have a NULL skill_id, so an interrupted run resumes where it stopped.
+    `progress(updated, last_id)` is called after every batch. Returns the
+    number of rows updated. New rows get these values from seed_challenges.
+    """
+    table = DailyChallenge.__table__
+    updated = 0
+    last_id = 0
+    while True:
+        ids = db.session.execute(
+            sa.select(table.c.id)
+            .where(table.c.skill_id.is_(None), table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            return updated
+        batch = sa.and_(table.c.id.between(ids[0], ids[-1]), table.c.skill_id.is_(None))
+        for category, meta in CATEGORY_METADATA.items():
+            updated += db.session.execute(
+                table.update().where(batch, table.c.category == category).values(
+                    skill_id=table.c.category + '.' + sa.func.coalesce(sa.func.nullif(table.c.question_type, ''), 'generic'),
+                    modality=sa.func.coalesce(table.c.modality, meta['modality']),
+                    rank_band_min=sa.func.coalesce(table.c.rank_band_min, meta['rank_min']),
+                    rank_band_max=sa.func.coalesce(table.c.rank_band_max, meta['rank_max']),
+                    difficulty_axis=sa.func.coalesce(table.c.difficulty_axis, meta['axis']),
+                    stimulus_version=sa.func.coalesce(table.c.stimulus_version, STIMULUS_VERSION),
+                )
+            ).rowcount
+        db.session.commit()
+        last_id = ids[-1]
+        if progress is not None:
+            progress(updated, last_id)
 
 
 def _eligible_for_scoring(challenge):
@@ -452,7 +550,7 @@ def _ear_visual(exercise):
     chords = [
         {
             'root': item['root'], 'intervals': item['intervals'],
-            'notes': [NOTES[(NOTES.index(item['root']) + interval) % 12] for interval in item['intervals']],
+            'notes': pitchset.spell(pitchset.PITCH_CLASS_OF[item['root']], item['intervals']),
         }
         for item in definitions
     ]
@@ -492,325 +590,337 @@ def chord_inventory():
 
 def _semitone_distance(n1, n2):
     """Return semitone distance (positive) between two note names."""
-    i1 = NOTES.index(n1)
-    i2 = NOTES.index(n2)
-    return (i2 - i1) % 12
+    return (pitchset.PITCH_CLASS_OF[n2] - pitchset.PITCH_CLASS_OF[n1]) % 12
 
 
-def _random_note():
-    return random.choice(NOTES)
+def _random_note(rng):
+    return rng.choice(NOTES)
 
 
-def _random_chord_type():
-    return random.choice(CHORD_TYPES)
+def _random_chord_type(rng):
+    return rng.choice(CHORD_TYPES)
 
 
-# ─── Category generators ───────────────────────────────────────────────────────
+BANK_SEED = 42
+
 
-def generate_scales_questions(count):
-    questions = []
-    for _ in range(count):
-        root = _random_note()
-        scale_type = random.choice(list(SCALE_NAMES.keys()))
+def question_rng(category, index, seed=BANK_SEED):
+    """Independent random stream for question `index` of `category`.
+
+    String seeds are hashed with SHA-512 by `random.Random`, so the stream is
+    the same in every process regardless of `PYTHONHASHSEED`. Nothing here
+    touches the module-level `random` state.
+    """
+    return random.Random(f'{seed}:{category}:{index}')
+
+
+# ─── Category generators ───────────────────────────────────────────────────────
+# Each generator yields questions `start` .. `start + count - 1` of its
+# category, drawing question `i` from `question_rng(category, i)` alone, so any
+# slice can be generated on its own, in another process, or again later.
+
+def generate_scales_questions(count, start=0, seed=BANK_SEED):
+    for index in range(start, start + count):
+        rng = question_rng('scales', index, seed)
+        root = _random_note(rng)
+        scale_type = rng.choice(list(SCALE_NAMES.keys()))
         names = SCALE_NAMES[scale_type]
         correct_name = names[0]
 
         # Pick 3 wrong scale names
         wrong = []
         pool = [n for k, v in SCALE_NAMES.items() for n in v if n != correct_name]
-        wrong = random.sample(pool, min(3, len(pool)))
+        wrong = rng.sample(pool, min(3, len(pool)))
 
         options = [correct_name] + wrong
-        random.shuffle(options)
+        rng.shuffle(options)
         correct_idx = options.index(correct_name)
 
-        questions.append({
+        yield {
             'category': 'scales',
             'title': f'Scale: {scale_type.replace("_", " ").title()}',
             'question': 'Which scale is this?',
             'options': options,
             'correct_index': correct_idx,
             'explanation': build_daily_challenge_explanation('scales', f'Identify the {scale_type.replace("_", " ").title()} Scale', f'Which scale type is built on the root note {root} with the interval pattern: {", ".join(MAJOR_SCALE_INTERVALS if "major" in scale_type or scale_type in ("ionian", "lydian", "mixolydian") else MINOR_SCALE_INTERVALS)}?', options, correct_idx),
-            'xp_reward': random.choice([25, 50, 75]),
-            'difficulty': random.choice([1, 2]),
+            'xp_reward': rng.choice([25, 50, 75]),
+            'difficulty': rng.choice([1, 2]),
             'question_type': 'scale-identification',
             'visual': _scale_visual(root, scale_type),
             'skill_id': f'fretboard.scale.{scale_type}.identify',
-        })
-    return questions
+        }
 
 
-def generate_chords_questions(count):
-    questions = []
-    for _ in range(count):
-        root = _random_note()
-        chord_label, chord_aliases = _random_chord_type()
+def generate_chords_questions(count, start=0, seed=BANK_SEED):
+    for index in range(start, start + count):
+        rng = question_rng('chords', index, seed)
+        root = _random_note(rng)
+        chord_label, chord_aliases = _random_chord_type(rng)
         correct_name = chord_aliases[0]
 
         # Wrong chord types
         wrong_pool = [c[1][0] for c in CHORD_TYPES if c[1][0] != correct_name]
-        wrong = random.sample(wrong_pool, min(3, len(wrong_pool)))
+        wrong = rng.sample(wrong_pool, min(3, len(wrong_pool)))
 
         options = [correct_name] + wrong
-        random.shuffle(options)
+        rng.shuffle(options)
         correct_idx = options.index(correct_name)
 
-        questions.append({
+        yield {
             'category': 'chords',
             'title': 'Chord Stack',
             'question': 'What quality is this chord?',
             'options': options,
             'correct_index': correct_idx,
             'explanation': build_daily_challenge_explanation('chords', f'Identify the {root} Chord', f'What type of chord is {root}{correct_name}? (e.g., Major, Minor, Seventh, etc.)', options, correct_idx),
-            'xp_reward': random.choice([25, 50, 75]),
-            'difficulty': random.choice([1, 2, 3]),
+            'xp_reward': rng.choice([25, 50, 75]),
+            'difficulty': rng.choice([1, 2, 3]),
             'question_type': 'chord-quality',
             'visual': _chord_visual(root, chord_label),
             'skill_id': f'chord.quality.{chord_label.lower().replace(" ", "-")}.identify',
-        })
-    return questions
+        }
 
 
-def generate_intervals_questions(count):
-    questions = []
-    for _ in range(count):
-        n1 = _random_note()
-        n2 = _random_note()
+def generate_intervals_questions(count, start=0, seed=BANK_SEED):
+    for index in range(start, start + count):
+        rng = question_rng('intervals', index, seed)
+        n1 = _random_note(rng)
+        n2 = _random_note(rng)
         if n1 == n2:
-            n2 = NOTES[(NOTES.index(n1) + random.choice([2, 3, 4, 5, 7])) % 12]
+            n2 = pitchset.spell(pitchset.PITCH_CLASS_OF[n1], (rng.choice([2, 3, 4, 5, 7]),))[0]
         semitones = _semitone_distance(n1, n2)
         correct_name = INTERVAL_NAMES_REVERSE.get(semitones, f'{semitones} semitones')
 
         # Wrong interval names
         wrong_pool = [v for k, v in INTERVAL_NAMES_REVERSE.items() if v != correct_name]
-        wrong = random.sample(wrong_pool, min(3, len(wrong_pool)))
+        wrong = rng.sample(wrong_pool, min(3, len(wrong_pool)))
 
         options = [correct_name] + wrong
-        random.shuffle(options)
+        rng.shuffle(options)
         correct_idx = options.index(correct_name)
 
-        questions.append({
+        yield {
             'category': 'intervals',
             'title': 'Leap Check',
             'question': 'Name this interval.',
             'options': options,
             'correct_index': correct_idx,
             'explanation': build_daily_challenge_explanation('intervals', 'Identify the Interval', f'What is the interval between {n1} and {n2}? ({n1} → {n2} = {semitones} semitones)', options, correct_idx),
-            'xp_reward': random.choice([25, 50]),
-            'difficulty': random.choice([1, 2]),
+            'xp_reward': rng.choice([25, 50]),
+            'difficulty': rng.choice([1, 2]),
             'question_type': 'interval-identification',
             'visual': _interval_visual(n1, n2, semitones),
             'skill_id': f'ear.interval.semitone-{semitones}.identify',
-        })
-    return questions
+        }
 
 
-def generate_theory_questions(count):
-    """Generate music theory trivia questions."""
-    theory_bank = [
-        {
-            'question': 'How many semitones are in a Perfect 5th?',
-            'options': ['5', '6', '7', '8'],
-            'correct_index': 2,
-            'xp_reward': 25,
-            'difficulty': 1,
-        },
-        {
-            'question': 'What is the interval pattern of a Major scale?',
-            'options': ['W-W-H-W-W-W-H', 'W-H-W-W-H-W-W', 'H-W-W-H-W-W-W', 'W-W-W-H-W-W-H'],
-            'correct_index': 0,
-            'xp_reward': 50,
-            'difficulty': 1,
-        },
-        {
-            'question': 'How many notes are in a standard pentatonic scale?',
-            'options': ['5', '6', '7', '8'],
-            'correct_index': 0,
-            'xp_reward': 25,
-            'difficulty': 1,
-        },
-        {
-            'question': 'What does "CAGED" stand for in guitar theory?',
-            'options': ['Five chord shapes: C, A, G, E, D', 'A tuning method', 'A scale pattern', 'A strumming pattern'],
-            'correct_index': 0,
-            'xp_reward': 50,
-            'difficulty': 2,
-        },
-        {
-            'question': 'How many sharps are in the key of A Major?',
-            'options': ['1', '2', '3', '4'],
-            'correct_index': 2,
-            'xp_reward': 50,
-            'difficulty': 2,
-        },
-        {
-            'question': 'What is the relative minor of C Major?',
-            'options': ['A Minor', 'E Minor', 'D Minor', 'G Minor'],
-            'correct_index': 0,
-            'xp_reward': 25,
-            'difficulty': 1,
-        },
-        {
-            'question': 'What is the tonic of the D Major scale?',
-            'options': ['D', 'A', 'F#', 'G'],
-            'correct_index': 0,
-            'xp_reward': 25,
-            'difficulty': 1,
-        },
-        {
-            'question': 'What is a "triad"?',
-            'options': ['A three-note chord', 'A three-beat rhythm', 'A three-string technique', 'A three-note scale'],
-            'correct_index': 0,
-            'xp_reward': 50,
-            'difficulty': 1,
-        },
-        {
-            'question': 'What is the interval between the 1st and 3rd note of a Major scale?',
-            'options': ['Major 3rd', 'Minor 3rd', 'Perfect 5th', 'Major 2nd'],
-            'correct_index': 0,
-            'xp_reward': 50,
-            'difficulty': 2,
-        },
-        {
-            'question': 'Which scale contains all 12 notes?',
-            'options': ['Chromatic', 'Whole Tone', 'Pentatonic', 'Blues'],
-            'correct_index': 0,
-            'xp_reward': 25,
-            'difficulty': 1,
-        },
-        {
-            'question': 'How many strings does a standard guitar have?',
-            'options': ['4', '5', '6', '7'],
-            'correct_index': 2,
-            'xp_reward': 25,
-            'difficulty': 1,
-        },
-        {
-            'question': 'What is the standard tuning of a guitar from low to high?',
-            'options': ['E-A-D-G-B-E', 'E-B-G-D-A-E', 'A-D-G-C-E-A', 'D-A-D-G-B-E'],
-            'correct_index': 0,
-            'xp_reward': 50,
-            'difficulty': 1,
-        },
-        {
-            'question': 'What note is the 5th of C Major?',
-            'options': ['G', 'F', 'A', 'E'],
-            'correct_index': 0,
-            'xp_reward': 25,
-            'difficulty': 2,
-        },
-        {
-            'question': 'Which mode starts on the 2nd degree of a Major scale?',
-            'options': ['Dorian', 'Phrygian', 'Lydian', 'Mixolydian'],
-            'correct_index': 0,
-            'xp_reward': 75,
-            'difficulty': 3,
-        },
-        {
-            'question': 'What is a "barre chord"?',
-            'options': ['A chord where one finger presses multiple strings', 'A chord played with a pick', 'A chord with no open strings', 'A power chord'],
-            'correct_index': 0,
-            'xp_reward': 25,
-            'difficulty': 1,
-        },
-        {
-            'question': 'How many half steps (semitones) are in an octave?',
-            'options': ['10', '11', '12', '13'],
-            'correct_index': 2,
-            'xp_reward': 25,
-            'difficulty': 1,
-        },
-        {
-            'question': 'What is a "dominant 7th" chord?',
-            'options': ['A major triad with a minor 7th', 'A minor triad with a major 7th', 'A major triad with a major 7th', 'A diminished triad with a minor 7th'],
-            'correct_index': 0,
-            'xp_reward': 50,
-            'difficulty': 2,
-        },
-        {
-            'question': 'What does "tempo" mean in music?',
-            'options': ['Speed of the beat', 'Volume of the sound', 'Pitch of the notes', 'Duration of a song'],
-            'correct_index': 0,
-            'xp_reward': 25,
-            'difficulty': 1,
-        },
-        {
-            'question': 'What is the subdominant of G Major?',
-            'options': ['C', 'D', 'E', 'F'],
-            'correct_index': 0,
-            'xp_reward': 50,
-            'difficulty': 3,
-        },
-        {
-            'question': 'How many beats are in a standard 4/4 time signature?',
-            'options': ['4', '3', '2', '6'],
-            'correct_index': 0,
-            'xp_reward': 25,
-            'difficulty': 1,
-        },
-        {
-            'question': 'What is an "arpggio"?',
-            'options': ['Notes of a chord played sequentially', 'A fast scale', 'A repeated note', 'A chord played all at once'],
-            'correct_index': 0,
-            'xp_reward': 25,
-            'difficulty': 1,
-        },
-        {
-            'question': 'What is the mediant of C Major?',
-            'options': ['E', 'D', 'F', 'G'],
-            'correct_index': 0,
-            'xp_reward': 50,
-            'difficulty': 3,
-        },
-        {
-            'question': 'Which notes are in a C Major triad?',
-            'options': ['C-E-G', 'C-D-E', 'C-F-G', 'C-E-A'],
-            'correct_index': 0,
-            'xp_reward': 25,
-            'difficulty': 1,
-        },
-        {
-            'question': 'What is a "diminished" triad?',
-            'options': ['Minor 3rd + Minor 3rd', 'Major 3rd + Minor 3rd', 'Major 3rd + Major 3rd', 'Minor 3rd + Major 3rd'],
-            'correct_index': 0,
-            'xp_reward': 50,
-            'difficulty': 2,
-        },
-        {
-            'question': 'How many keys are in the Circle of Fifths?',
-            'options': ['12', '24', '15', '7'],
-            'correct_index': 2,
-            'xp_reward': 75,
-            'difficulty': 3,
-        },
-    ]
-    # Generate variations from the bank
-    questions = []
-    theory_types = [
-        'perfect-fifth', 'major-scale-pattern', 'pentatonic-count', 'caged', 'key-signature',
-        'relative-minor', 'tonic', 'triad', 'scale-degree-interval', 'chromatic-scale',
-        'guitar-strings', 'guitar-tuning', 'scale-degree-note', 'mode-degree', 'barre-chord',
-        'octave', 'dominant-seventh', 'tempo', 'subdominant', 'meter', 'arpeggio', 'mediant',
-        'major-triad', 'diminished-triad', 'circle-of-fifths',
-    ]
-    theory_visuals = [
-        _interval_visual('C4', 'G4', 7), _scale_visual('C', 'major'),
-        _scale_visual('C', 'pentatonic_major'), {'kind': 'fretboard', 'tuning': ['E2', 'A2', 'D3', 'G3', 'B3', 'E4'], 'chordShape': 'C-A-G-E-D'},
-        {'kind': 'key-signature', 'tonic': 'A', 'mode': 'major', 'accidentals': ['F#', 'C#', 'G#']},
-        {'kind': 'circle-of-fifths', 'activeKey': 'C', 'relation': 'relative-minor'},
-        {'kind': 'key-signature', 'tonic': 'D', 'mode': 'major', 'accidentals': ['F#', 'C#']},
-        _chord_visual('C', 'Major'), _interval_visual('C4', 'E4', 4), _scale_visual('C', 'chromatic'),
-        {'kind': 'instrument', 'instrument': 'guitar', 'strings': 6}, {'kind': 'fretboard', 'tuning': ['E2', 'A2', 'D3', 'G3', 'B3', 'E4']},
-        _scale_visual('C', 'major'), _scale_visual('C', 'dorian'), {'kind': 'fretboard', 'tuning': ['E2', 'A2', 'D3', 'G3', 'B3', 'E4'], 'chordShape': 'barre'},
-        _interval_visual('C4', 'C5', 12), _chord_visual('C', 'Dominant 7th'), {'kind': 'tempo', 'marking': 'tempo', 'bpmRange': [60, 120]},
-        _scale_visual('G', 'major'), {'kind': 'rhythm', 'meter': [4, 4], 'events': [{'value': 'quarter', 'beat': 1}]},
-        {'kind': 'technique', 'subject': 'arpeggio', 'frames': []}, _scale_visual('C', 'major'), _chord_visual('C', 'Major'),
-        _chord_visual('C', 'Diminished'), {'kind': 'circle-of-fifths', 'activeKey': 'C'},
-    ]
-    for _ in range(count):
-        q = random.choice(theory_bank)
-        index = theory_bank.index(q)
-        questions.append({
+THEORY_BANK = [
+    {
+        'question': 'How many semitones are in a Perfect 5th?',
+        'options': ['5', '6', '7', '8'],
+        'correct_index': 2,
+        'xp_reward': 25,
+        'difficulty': 1,
+    },
+    {
+        'question': 'What is the interval pattern of a Major scale?',
+        'options': ['W-W-H-W-W-W-H', 'W-H-W-W-H-W-W', 'H-W-W-H-W-W-W', 'W-W-W-H-W-W-H'],
+        'correct_index': 0,
+        'xp_reward': 50,
+        'difficulty': 1,
+    },
+    {
+        'question': 'How many notes are in a standard pentatonic scale?',
+        'options': ['5', '6', '7', '8'],
+        'correct_index': 0,
+        'xp_reward': 25,
+        'difficulty': 1,
+    },
+    {
+        'question': 'What does "CAGED" stand for in guitar theory?',
+        'options': ['Five chord shapes: C, A, G, E, D', 'A tuning method', 'A scale pattern', 'A strumming pattern'],
+        'correct_index': 0,
+        'xp_reward': 50,
+        'difficulty': 2,
+    },
+    {
+        'question': 'How many sharps are in the key of A Major?',
+        'options': ['1', '2', '3', '4'],
+        'correct_index': 2,
+        'xp_reward': 50,
+        'difficulty': 2,
+    },
+    {
+        'question': 'What is the relative minor of C Major?',
+        'options': ['A Minor', 'E Minor', 'D Minor', 'G Minor'],
+        'correct_index': 0,
+        'xp_reward': 25,
+        'difficulty': 1,
+    },
+    {
+        'question': 'What is the tonic of the D Major scale?',
+        'options': ['D', 'A', 'F#', 'G'],
+        'correct_index': 0,
+        'xp_reward': 25,
+        'difficulty': 1,
+    },
+    {
+        'question': 'What is a "triad"?',
+        'options': ['A three-note chord', 'A three-beat rhythm', 'A three-string technique', 'A three-note scale'],
+        'correct_index': 0,
+        'xp_reward': 50,
+        'difficulty': 1,
+    },
+    {
+        'question': 'What is the interval between the 1st and 3rd note of a Major scale?',
+        'options': ['Major 3rd', 'Minor 3rd', 'Perfect 5th', 'Major 2nd'],
+        'correct_index': 0,
+        'xp_reward': 50,
+        'difficulty': 2,
+    },
+    {
+        'question': 'Which scale contains all 12 notes?',
+        'options': ['Chromatic', 'Whole Tone', 'Pentatonic', 'Blues'],
+        'correct_index': 0,
+        'xp_reward': 25,
+        'difficulty': 1,
+    },
+    {
+        'question': 'How many strings does a standard guitar have?',
+        'options': ['4', '5', '6', '7'],
+        'correct_index': 2,
+        'xp_reward': 25,
+        'difficulty': 1,
+    },
+    {
+        'question': 'What is the standard tuning of a guitar from low to high?',
+        'options': ['E-A-D-G-B-E', 'E-B-G-D-A-E', 'A-D-G-C-E-A', 'D-A-D-G-B-E'],
+        'correct_index': 0,
+        'xp_reward': 50,
+        'difficulty': 1,
+    },
+    {
+        'question': 'What note is the 5th of C Major?',
+        'options': ['G', 'F', 'A', 'E'],
+        'correct_index': 0,
+        'xp_reward': 25,
+        'difficulty': 2,
+    },
+    {
+        'question': 'Which mode starts on the 2nd degree of a Major scale?',
+        'options': ['Dorian', 'Phrygian', 'Lydian', 'Mixolydian'],
+        'correct_index': 0,
+        'xp_reward': 75,
+        'difficulty': 3,
+    },
+    {
+        'question': 'What is a "barre chord"?',
+        'options': ['A chord where one finger presses multiple strings', 'A chord played with a pick', 'A chord with no open strings', 'A power chord'],
+        'correct_index': 0,
+        'xp_reward': 25,
+        'difficulty': 1,
+    },
+    {
+        'question': 'How many half steps (semitones) are in an octave?',
+        'options': ['10', '11', '12', '13'],
+        'correct_index': 2,
+        'xp_reward': 25,
+        'difficulty': 1,
+    },
+    {
+        'question': 'What is a "dominant 7th" chord?',
+        'options': ['A major triad with a minor 7th', 'A minor triad with a major 7th', 'A major triad with a major 7th', 'A diminished triad with a minor 7th'],
+        'correct_index': 0,
+        'xp_reward': 50,
+        'difficulty': 2,
+    },
+    {
+        'question': 'What does "tempo" mean in music?',
+        'options': ['Speed of the beat', 'Volume of the sound', 'Pitch of the notes', 'Duration of a song'],
+        'correct_index': 0,
+        'xp_reward': 25,
+        'difficulty': 1,
+    },
+    {
+        'question': 'What is the subdominant of G Major?',
+        'options': ['C', 'D', 'E', 'F'],
+        'correct_index': 0,
+        'xp_reward': 50,
+        'difficulty': 3,
+    },
+    {
+        'question': 'How many beats are in a standard 4/4 time signature?',
+        'options': ['4', '3', '2', '6'],
+        'correct_index': 0,
+        'xp_reward': 25,
+        'difficulty': 1,
+    },
+    {
+        'question': 'What is an "arpggio"?',
+        'options': ['Notes of a chord played sequentially', 'A fast scale', 'A repeated note', 'A chord played all at once'],
+        'correct_index': 0,
+        'xp_reward': 25,
+        'difficulty': 1,
+    },
+    {
+        'question': 'What is the mediant of C Major?',
+        'options': ['E', 'D', 'F', 'G'],
+        'correct_index': 0,
+        'xp_reward': 50,
+        'difficulty': 3,
+    },
+    {
+        'question': 'Which notes are in a C Major triad?',
+        'options': ['C-E-G', 'C-D-E', 'C-F-G', 'C-E-A'],
+        'correct_index': 0,
+        'xp_reward': 25,
+        'difficulty': 1,
+    },
+    {
+        'question': 'What is a "diminished" triad?',
+        'options': ['Minor 3rd + Minor 3rd', 'Major 3rd + Minor 3rd', 'Major 3rd + Major 3rd', 'Minor 3rd + Major 3rd'],
+        'correct_index': 0,
+        'xp_reward': 50,
+        'difficulty': 2,
+    },
+    {
+        'question': 'How many keys are in the Circle of Fifths?',
+        'options': ['12', '24', '15', '7'],
+        'correct_index': 2,
+        'xp_reward': 75,
+        'difficulty': 3,
+    },
+]
+THEORY_TYPES = [
+    'perfect-fifth', 'major-scale-pattern', 'pentatonic-count', 'caged', 'key-signature',
+    'relative-minor', 'tonic', 'triad', 'scale-degree-interval', 'chromatic-scale',
+    'guitar-strings', 'guitar-tuning', 'scale-degree-note', 'mode-degree', 'barre-chord',
+    'octave', 'dominant-seventh', 'tempo', 'subdominant', 'meter', 'arpeggio', 'mediant',
+    'major-triad', 'diminished-triad', 'circle-of-fifths',
+]
+THEORY_VISUALS = [
+    _interval_visual('C4', 'G4', 7), _scale_visual('C', 'major'),
+    _scale_visual('C', 'pentatonic_major'), {'kind': 'fretboard', 'tuning': ['E2', 'A2', 'D3', 'G3', 'B3', 'E4'], 'chordShape': 'C-A-G-E-D'},
+    {'kind': 'key-signature', 'tonic': 'A', 'mode': 'major', 'accidentals': ['F#', 'C#', 'G#']},
+    {'kind': 'circle-of-fifths', 'activeKey': 'C', 'relation': 'relative-minor'},
+    {'kind': 'key-signature', 'tonic': 'D', 'mode': 'major', 'accidentals': ['F#', 'C#']},
+    _chord_visual('C', 'Major'), _interval_visual('C4', 'E4', 4), _scale_visual('C', 'chromatic'),
+    {'kind': 'instrument', 'instrument': 'guitar', 'strings': 6}, {'kind': 'fretboard', 'tuning': ['E2', 'A2', 'D3', 'G3', 'B3', 'E4']},
+    _scale_visual('C', 'major'), _scale_visual('C', 'dorian'), {'kind': 'fretboard', 'tuning': ['E2', 'A2', 'D3', 'G3', 'B3', 'E4'], 'chordShape': 'barre'},
+    _interval_visual('C4', 'C5', 12), _chord_visual('C', 'Dominant 7th'), {'kind': 'tempo', 'marking': 'tempo', 'bpmRange': [60, 120]},
+    _scale_visual('G', 'major'), {'kind': 'rhythm', 'meter': [4, 4], 'events': [{'value': 'quarter', 'beat': 1}]},
+    {'kind': 'technique', 'subject': 'arpeggio', 'frames': []}, _scale_visual('C', 'major'), _chord_visual('C', 'Major'),
+    _chord_visual('C', 'Diminished'), {'kind': 'circle-of-fifths', 'activeKey': 'C'},
+]
+
+
+def generate_theory_questions(count, start=0, seed=BANK_SEED):
+    """Yield music theory trivia questions."""
+    for index in range(start, start + count):
+        rng = question_rng('theory', index, seed)
+        bank_index = rng.randrange(len(THEORY_BANK))
+        q = THEORY_BANK[bank_index]
+        yield {
             'category': 'theory',
             'title': 'Theory Quest',
             'question': q['question'],
@@ -819,41 +929,39 @@ def generate_theory_questions(count):
             'explanation': build_daily_challenge_explanation('theory', 'Music Theory', q['question'], q['options'], q['correct_index']),
             'xp_reward': q['xp_reward'],
             'difficulty': q['difficulty'],
-            'question_type': f'theory-{theory_types[index]}',
-            'visual': theory_visuals[index],
-        })
-    return questions
+            'question_type': f'theory-{THEORY_TYPES[bank_index]}',
+            'visual': THEORY_VISUALS[bank_index],
+        }
 
 
-def generate_ear_training_questions(count):
-    """Generate interval identification questions."""
-    questions = []
+def generate_ear_training_questions(count, start=0, seed=BANK_SEED):
+    """Yield interval identification questions."""
     interval_choices = ['Minor 3rd', 'Major 3rd', 'Perfect 4th', 'Perfect 5th', 'Octave', 'Minor 7th', 'Major 7th']
-    for _ in range(count):
-        correct = random.choice(interval_choices)
-        wrong = random.sample([i for i in interval_choices if i != correct], 3)
+    for index in range(start, start + count):
+        rng = question_rng('ear_training', index, seed)
+        correct = rng.choice(interval_choices)
+        wrong = rng.sample([i for i in interval_choices if i != correct], 3)
         options = [correct] + wrong
-        random.shuffle(options)
+        rng.shuffle(options)
         correct_idx = options.index(correct)
 
-        n1 = _random_note()
+        n1 = _random_note(rng)
         semitones = INTERVAL_SEMITONES[correct]
-        n2 = NOTES[(NOTES.index(n1) + semitones) % 12]
+        n2 = pitchset.spell(pitchset.PITCH_CLASS_OF[n1], (semitones,))[0]
 
-        questions.append({
+        yield {
             'category': 'ear_training',
             'title': 'Ear Check',
             'question': 'What interval do you hear?',
             'options': options,
             'correct_index': correct_idx,
             'explanation': build_daily_challenge_explanation('ear_training', 'Interval Recognition', f'From {n1} to {n2}, what interval do you hear? (Distance: {semitones} semitones)', options, correct_idx),
-            'xp_reward': random.choice([50, 75, 100]),
-            'difficulty': random.choice([2, 3, 4]),
+            'xp_reward': rng.choice([50, 75, 100]),
+            'difficulty': rng.choice([2, 3, 4]),
             'question_type': 'ear-training-legacy',
             'visual': _interval_visual(n1, n2, semitones),
             'skill_id': f'ear.interval.{correct.lower().replace(" ", "-")}.identify',
-        })
-    return questions
+        }
 
 
 # ─── Retired banks ──────────────────────────────────────────────────────────────
@@ -863,103 +971,110 @@ def generate_ear_training_questions(count):
 # the migration is documented, but a re-seed cannot resurrect them.
 
 
-def generate_general_questions(count):
-    """Fill up remaining slots with general music knowledge."""
-    general_bank = [
-        ('Note Values', 'How many quarter notes equal a whole note?', ['2', '3', '4', '6'], 2, 25, 1),
-        ('Note Values', 'How many eighth notes equal a half note?', ['2', '4', '6', '8'], 1, 25, 1),
-        ('Note Values', 'How many sixteenth notes in a quarter note?', ['2', '4', '6', '8'], 1, 25, 1),
-        ('Note Values', 'A dotted half note equals how many quarter notes?', ['2', '3', '4', '6'], 1, 25, 1),
-        ('Note Values', 'How many beats is a whole note in 4/4?', ['1', '2', '3', '4'], 3, 25, 1),
-        ('Clefs', 'What is the most common clef in guitar music?', ['Treble Clef', 'Bass Clef', 'Alto Clef', 'Tenor Clef'], 0, 25, 1),
-        ('Clefs', 'What clef is also known as the "G clef"?', ['Treble Clef', 'Bass Clef', 'Alto Clef', 'Soprano Clef'], 0, 25, 1),
-        ('Clefs', 'What clef is commonly used for bass instruments?', ['Bass Clef', 'Treble Clef', 'Alto Clef', 'Tenor Clef'], 0, 25, 1),
-        ('Clefs', 'What is the center line of the treble clef?', ['B', 'D', 'G', 'A'], 1, 25, 2),
-        ('Clefs', 'What is the first leger line above the treble clef?', ['A', 'C', 'E', 'G'], 0, 50, 2),
-        ('Dynamics', 'What does "forte" mean?', ['Loud', 'Soft', 'Fast', 'Slow'], 0, 25, 1),
-        ('Dynamics', 'What does "piano" mean?', ['Soft', 'Loud', 'Fast', 'Slow'], 0, 25, 1),
-        ('Dynamics', 'What does "crescendo" mean?', ['Gradually louder', 'Gradually softer', 'Suddenly loud', 'Very soft'], 0, 50, 2),
-        ('Dynamics', 'What does "fortissimo" mean?', ['Very loud', 'Very soft', 'Moderately loud', 'Extremely fast'], 0, 50, 2),
-        ('Dynamics', 'What does "mezzo piano" mean?', ['Moderately soft', 'Very soft', 'Moderately loud', 'Extremely soft'], 0, 50, 2),
-        ('Rhythm', 'What is syncopation?', ['Emphasis on weak beats', 'Playing off-beat notes', 'A fast tempo', 'A type of chord'], 0, 50, 3),
-        ('Rhythm', 'What is a dotted quarter note worth?', ['1.5 beats', '1 beat', '2 beats', '0.75 beats'], 0, 50, 2),
-        ('Rhythm', 'How many beats in a measure of 3/4 time?', ['2', '3', '4', '6'], 1, 25, 1),
-        ('Rhythm', 'What is a "triplet"?', ['Three notes in the space of two', 'Three notes of equal value', 'A three-beat rhythm', 'A three-chord progression'], 0, 50, 2),
-        ('Rhythm', 'What does "accelerando" mean?', ['Gradually faster', 'Gradually slower', 'Return to original tempo', 'Suddenly faster'], 0, 50, 2),
-        ('Instruments', 'How many strings does a standard 4-string bass have?', ['4', '5', '6', '3'], 0, 25, 1),
-        ('Instruments', 'What family does the violin belong to?', ['String', 'Woodwind', 'Brass', 'Percussion'], 0, 25, 1),
-        ('Instruments', 'How many keys does a standard piano have?', ['88', '76', '61', '108'], 0, 25, 1),
-        ('Instruments', 'What instrument has pedals called "swell", "sustain" and "soft"?', ['Piano', 'Organ', 'Harp', 'Vibraphone'], 0, 50, 2),
-        ('Instruments', 'What is the highest-pitched string instrument in a standard orchestra?', ['Violin', 'Viola', 'Cello', 'Double Bass'], 0, 50, 2),
-        ('Notation', 'What does a sharp (♯) do to a note?', ['Raises by a semitone', 'Lowers by a semitone', 'Doubles the value', 'Cancels previous accidental'], 0, 25, 1),
-        ('Notation', 'What does a flat (♭) do to a note?', ['Lowers by a semitone', 'Raises by a semitone', 'Halves the value', 'Cancels previous accidental'], 0, 25, 1),
-        ('Notation', 'What is a "natural" sign?', ['Cancels a sharp or flat', 'Raises by a semitone', 'Lowers by a semitone', 'Adds emphasis'], 0, 25, 1),
-        ('Notation', 'What is a "double sharp"?', ['Raises by two semitones', 'Lowers by two semitones', 'Cancels a previous sharp', 'Adds two sharps to the key signature'], 0, 50, 2),
-        ('Notation', 'What is a "staccato" mark?', ['Play the note short and detached', 'Play the note long and sustained', 'Play the note with emphasis', 'Play the note quietly'], 0, 25, 1),
-        ('Harmony', 'What is a "cadence"?', ['A harmonic resolution', 'A melodic pattern', 'A rhythmic figure', 'A type of scale'], 0, 50, 2),
-        ('Harmony', 'What is a "perfect authentic cadence"?', ['V → I', 'IV → I', 'V → vi', 'ii → V'], 0, 50, 3),
-        ('Harmony', 'What is a "plagal cadence"?', ['IV → I', 'V → I', 'V → vi', 'I → V'], 0, 75, 3),
-        ('Harmony', 'What is a "deceptive cadence"?', ['V → vi', 'V → I', 'IV → I', 'ii → V'], 0, 75, 3),
-        ('Harmony', 'What is "counterpoint"?', ['Combining independent melodies', 'Playing chords together', 'A fast tempo', 'A type of ornament'], 0, 75, 3),
-        ('History', 'What century did the modern guitar originate?', ['19th century', '18th century', '16th century', '20th century'], 0, 75, 3),
-        ('History', 'Who is known as the father of modern classical guitar?', ['Andrés Segovia', 'Paco de Lucía', 'Jimi Hendrix', 'Julian Bream'], 0, 75, 2),
-        ('History', 'In what period did J.S. Bach compose?', ['Baroque', 'Classical', 'Romantic', 'Renaissance'], 0, 50, 2),
-        ('History', 'Who composed "The Four Seasons"?', ['Vivaldi', 'Bach', 'Mozart', 'Beethoven'], 0, 50, 1),
-        ('History', 'Which band released "Sgt. Pepper\'s Lonely Hearts Club Band"?', ['The Beatles', 'The Rolling Stones', 'Led Zeppelin', 'Pink Floyd'], 0, 25, 1),
-        ('Tuning', 'What note is the 1st string (high E) on a guitar?', ['E4', 'E3', 'E2', 'E5'], 0, 50, 2),
-        ('Tuning', 'What is the standard guitar tuning from low to high?', ['E-A-D-G-B-E', 'E-B-G-D-A-E', 'A-D-G-C-E-A', 'D-A-D-G-B-E'], 0, 50, 1),
-        ('Tuning', 'What is the tuning of a standard ukulele?', ['G-C-E-A', 'C-G-E-A', 'A-D-F-B', 'E-A-D-G'], 0, 50, 2),
-        ('Tuning', 'How many frets does a typical electric guitar have?', ['21-24', '12-15', '18-20', '27-30'], 0, 50, 2),
-        ('Tuning', 'What is "drop D" tuning?', ['D-A-D-G-B-E', 'D-G-D-G-B-D', 'E-A-D-G-B-E', 'D-A-D-F#-A-D'], 0, 50, 2),
-        ('Tempo', 'What BPM range is "Andante"?', ['76-108 BPM', '40-60 BPM', '120-168 BPM', '60-76 BPM'], 0, 25, 1),
-        ('Tempo', 'What BPM range is "Presto"?', ['168-200 BPM', '76-108 BPM', '120-168 BPM', '40-60 BPM'], 0, 50, 2),
-        ('Tempo', 'What BPM range is "Adagio"?', ['66-76 BPM', '40-60 BPM', '76-108 BPM', '168-200 BPM'], 0, 50, 2),
-        ('Tempo', 'What does "Allegro" mean?', ['Fast and lively', 'Slow and stately', 'Moderate walking pace', 'Very fast'], 0, 25, 1),
-        ('Tempo', 'What does "Lento" mean?', ['Slow', 'Fast', 'Moderate', 'Very fast'], 0, 25, 1),
-        ('Modes', 'Which mode is described as "dark and sad"?', ['Aeolian', 'Locrian', 'Phrygian', 'Dorian'], 0, 50, 2),
-        ('Modes', 'Which mode is described as "bright and happy"?', ['Ionian', 'Lydian', 'Mixolydian', 'Dorian'], 0, 50, 2),
-        ('Modes', 'Which mode starts on the 3rd degree of the major scale?', ['Phrygian', 'Dorian', 'Lydian', 'Mixolydian'], 0, 75, 3),
-        ('Modes', 'Which mode has a raised 4th?', ['Lydian', 'Mixolydian', 'Locrian', 'Dorian'], 0, 75, 3),
-        ('Modes', 'Which mode has a flat 7th?', ['Mixolydian', 'Lydian', 'Dorian', 'Ionian'], 0, 75, 3),
-        ('Chords', 'What notes make up a G Major chord?', ['G-B-D', 'G-A-C', 'G-C-E', 'G-D-F#'], 0, 25, 1),
-        ('Chords', 'What notes make up an Am chord?', ['A-C-E', 'A-D-F', 'A-E-G', 'A-C#-E'], 0, 25, 1),
-        ('Chords', 'What notes make up a D Major chord?', ['D-F#-A', 'D-F-A', 'D-G-B', 'D-E-F#'], 0, 25, 1),
-        ('Chords', 'What notes make up an E Minor chord?', ['E-G-B', 'E-G#-B', 'E-A-C', 'E-F#-G#'], 0, 25, 1),
-        ('Chords', 'What is a "power chord"?', ['Root and fifth only', 'Root and third only', 'A full triad', 'A seventh chord'], 0, 25, 1),
-        ('Chords', 'What is the difference between Major and Minor chords?', ['The third interval', 'The fifth interval', 'The root note', 'The seventh'], 0, 50, 2),
-        ('Chords', 'What does a "sus2" chord replace?', ['The third with the second', 'The fifth with the second', 'The root with the second', 'The seventh with the second'], 0, 50, 2),
-        ('Chords', 'What does a "sus4" chord replace?', ['The third with the fourth', 'The fifth with the fourth', 'The root with the fourth', 'The seventh with the fourth'], 0, 50, 2),
-        ('Chords', 'How many notes in a standard seventh chord?', ['4', '3', '5', '6'], 0, 25, 1),
-        ('Chords', 'What is an "inversion"?', ['A chord with a note other than the root in the bass', 'A chord played backwards', 'A chord with added notes', 'A chord played quietly'], 0, 50, 2),
-        ('Glossary', 'What is a "capo"?', ['A device that clamps across the fretboard', 'A type of guitar pick', 'A tuning peg', 'A string damper'], 0, 25, 1),
-        ('Glossary', 'What is "vibrato"?', ['A slight variation in pitch for expression', 'A fast strumming pattern', 'A bend in the guitar neck', 'A type of chord'], 0, 25, 1),
-        ('Glossary', 'What is "harmonics"?', ['Overtones produced by lightly touching a string', 'A type of chord', 'A specific tuning', 'A strumming technique'], 0, 25, 1),
-        ('Glossary', 'What is "tremolo"?', ['Rapid repetition of a note', 'A variation in pitch', 'A sliding technique', 'A picking technique'], 0, 50, 2),
-        ('Glossary', 'What is a "riff"?', ['A short repeated musical phrase', 'A type of chord progression', 'A guitar solo', 'A strumming pattern'], 0, 25, 1),
-        ('Scales', 'How many notes are in a standard major scale?', ['7', '5', '8', '6'], 0, 25, 1),
-        ('Scales', 'How many notes are in a pentatonic scale?', ['5', '7', '6', '8'], 0, 25, 1),
-        ('Scales', 'What is the 5th note of the C Major scale?', ['G', 'F', 'A', 'E'], 0, 25, 1),
-        ('Scales', 'What is the 3rd note of the D Major scale?', ['F#', 'F', 'G', 'E'], 0, 50, 2),
-        ('Scales', 'What is the relative minor of G Major?', ['E Minor', 'A Minor', 'D Minor', 'B Minor'], 0, 50, 2),
-        ('Scales', 'What is the relative major of A Minor?', ['C Major', 'G Major', 'F Major', 'D Major'], 0, 50, 2),
-        ('Scales', 'What is a "blues scale"?', ['Pentatonic minor with a flat 5th', 'Major scale with flat 3rd and 7th', 'A six-note scale', 'The chromatic scale'], 0, 75, 3),
-        ('Scales', 'What are the notes of the E Minor pentatonic scale?', ['E-G-A-B-D', 'E-F#-G-A-B', 'E-F-G-A-B', 'E-G-A-C-D'], 0, 75, 3),
-        ('Articulation', 'What does "legato" mean?', ['Smooth and connected', 'Short and detached', 'Heavy and accented', 'Very soft'], 0, 25, 1),
-        ('Articulation', 'What does "pizzicato" mean?', ['Plucking the strings', 'Bowing the strings', 'Playing with a mute', 'Playing loudly'], 0, 50, 2),
-        ('Articulation', 'What is a "glissando"?', ['A rapid slide between notes', 'A series of fast notes', 'A type of ornament', 'A chord played quickly'], 0, 50, 2),
-        ('Articulation', 'What is "arpeggio"?', ['Notes of a chord played sequentially', 'A fast scale run', 'A strumming pattern', 'A repeated note'], 0, 25, 1),
-        ('Intervals', 'What interval is C to G?', ['Perfect 5th', 'Perfect 4th', 'Major 3rd', 'Major 6th'], 0, 25, 1),
-        ('Intervals', 'What interval is C to F?', ['Perfect 4th', 'Perfect 5th', 'Major 3rd', 'Major 2nd'], 0, 25, 1),
-        ('Intervals', 'What interval is C to E?', ['Major 3rd', 'Minor 3rd', 'Perfect 5th', 'Major 6th'], 0, 25, 1),
-        ('Intervals', 'What interval is A to C?', ['Minor 3rd', 'Major 3rd', 'Minor 2nd', 'Perfect 4th'], 0, 50, 2),
-        ('Intervals', 'What interval is C to B?', ['Major 7th', 'Minor 7th', 'Octave', 'Major 6th'], 0, 50, 2),
-    ]
-    questions = []
-    bank_copy = list(general_bank)
-    random.shuffle(bank_copy)
-    for i in range(count):
-        title, question, options, correct_idx, xp, diff = bank_copy[i % len(bank_copy)]
-        questions.append({
+GENERAL_BANK = [
+    ('Note Values', 'How many quarter notes equal a whole note?', ['2', '3', '4', '6'], 2, 25, 1),
+    ('Note Values', 'How many eighth notes equal a half note?', ['2', '4', '6', '8'], 1, 25, 1),
+    ('Note Values', 'How many sixteenth notes in a quarter note?', ['2', '4', '6', '8'], 1, 25, 1),
+    ('Note Values', 'A dotted half note equals how many quarter notes?', ['2', '3', '4', '6'], 1, 25, 1),
+    ('Note Values', 'How many beats is a whole note in 4/4?', ['1', '2', '3', '4'], 3, 25, 1),
+    ('Clefs', 'What is the most common clef in guitar music?', ['Treble Clef', 'Bass Clef', 'Alto Clef', 'Tenor Clef'], 0, 25, 1),
+    ('Clefs', 'What clef is also known as the "G clef"?', ['Treble Clef', 'Bass Clef', 'Alto Clef', 'Soprano Clef'], 0, 25, 1),
+    ('Clefs', 'What clef is commonly used for bass instruments?', ['Bass Clef', 'Treble Clef', 'Alto Clef', 'Tenor Clef'], 0, 25, 1),
+    ('Clefs', 'What is the center line of the treble clef?', ['B', 'D', 'G', 'A'], 1, 25, 2),
+    ('Clefs', 'What is the first leger line above the treble clef?', ['A', 'C', 'E', 'G'], 0, 50, 2),
+    ('Dynamics', 'What does "forte" mean?', ['Loud', 'Soft', 'Fast', 'Slow'], 0, 25, 1),
+    ('Dynamics', 'What does "piano" mean?', ['Soft', 'Loud', 'Fast', 'Slow'], 0, 25, 1),
+    ('Dynamics', 'What does "crescendo" mean?', ['Gradually louder', 'Gradually softer', 'Suddenly loud', 'Very soft'], 0, 50, 2),
+    ('Dynamics', 'What does "fortissimo" mean?', ['Very loud', 'Very soft', 'Moderately loud', 'Extremely fast'], 0, 50, 2),
+    ('Dynamics', 'What does "mezzo piano" mean?', ['Moderately soft', 'Very soft', 'Moderately loud', 'Extremely soft'], 0, 50, 2),
+    ('Rhythm', 'What is syncopation?', ['Emphasis on weak beats', 'Playing off-beat notes', 'A fast tempo', 'A type of chord'], 0, 50, 3),
+    ('Rhythm', 'What is a dotted quarter note worth?', ['1.5 beats', '1 beat', '2 beats', '0.75 beats'], 0, 50, 2),
+    ('Rhythm', 'How many beats in a measure of 3/4 time?', ['2', '3', '4', '6'], 1, 25, 1),
+    ('Rhythm', 'What is a "triplet"?', ['Three notes in the space of two', 'Three notes of equal value', 'A three-beat rhythm', 'A three-chord progression'], 0, 50, 2),
+    ('Rhythm', 'What does "accelerando" mean?', ['Gradually faster', 'Gradually slower', 'Return to original tempo', 'Suddenly faster'], 0, 50, 2),
+    ('Instruments', 'How many strings does a standard 4-string bass have?', ['4', '5', '6', '3'], 0, 25, 1),
+    ('Instruments', 'What family does the violin belong to?', ['String', 'Woodwind', 'Brass', 'Percussion'], 0, 25, 1),
+    ('Instruments', 'How many keys does a standard piano have?', ['88', '76', '61', '108'], 0, 25, 1),
+    ('Instruments', 'What instrument has pedals called "swell", "sustain" and "soft"?', ['Piano', 'Organ', 'Harp', 'Vibraphone'], 0, 50, 2),
+    ('Instruments', 'What is the highest-pitched string instrument in a standard orchestra?', ['Violin', 'Viola', 'Cello', 'Double Bass'], 0, 50, 2),
+    ('Notation', 'What does a sharp (♯) do to a note?', ['Raises by a semitone', 'Lowers by a semitone', 'Doubles the value', 'Cancels previous accidental'], 0, 25, 1),
+    ('Notation', 'What does a flat (♭) do to a note?', ['Lowers by a semitone', 'Raises by a semitone', 'Halves the value', 'Cancels previous accidental'], 0, 25, 1),
+    ('Notation', 'What is a "natural" sign?', ['Cancels a sharp or flat', 'Raises by a semitone', 'Lowers by a semitone', 'Adds emphasis'], 0, 25, 1),
+    ('Notation', 'What is a "double sharp"?', ['Raises by two semitones', 'Lowers by two semitones', 'Cancels a previous sharp', 'Adds two sharps to the key signature'], 0, 50, 2),
+    ('Notation', 'What is a "staccato" mark?', ['Play the note short and detached', 'Play the note long and sustained', 'Play the note with emphasis', 'Play the note quietly'], 0, 25, 1),
+    ('Harmony', 'What is a "cadence"?', ['A harmonic resolution', 'A melodic pattern', 'A rhythmic figure', 'A type of scale'], 0, 50, 2),
+    ('Harmony', 'What is a "perfect authentic cadence"?', ['V → I', 'IV → I', 'V → vi', 'ii → V'], 0, 50, 3),
+    ('Harmony', 'What is a "plagal cadence"?', ['IV → I', 'V → I', 'V → vi', 'I → V'], 0, 75, 3),
+    ('Harmony', 'What is a "deceptive cadence"?', ['V → vi', 'V → I', 'IV → I', 'ii → V'], 0, 75, 3),
+    ('Harmony', 'What is "counterpoint"?', ['Combining independent melodies', 'Playing chords together', 'A fast tempo', 'A type of ornament'], 0, 75, 3),
+    ('History', 'What century did the modern guitar originate?', ['19th century', '18th century', '16th century', '20th century'], 0, 75, 3),
+    ('History', 'Who is known as the father of modern classical guitar?', ['Andrés Segovia', 'Paco de Lucía', 'Jimi Hendrix', 'Julian Bream'], 0, 75, 2),
+    ('History', 'In what period did J.S. Bach compose?', ['Baroque', 'Classical', 'Romantic', 'Renaissance'], 0, 50, 2),
+    ('History', 'Who composed "The Four Seasons"?', ['Vivaldi', 'Bach', 'Mozart', 'Beethoven'], 0, 50, 1),
+    ('History', 'Which band released "Sgt. Pepper\'s Lonely Hearts Club Band"?', ['The Beatles', 'The Rolling Stones', 'Led Zeppelin', 'Pink Floyd'], 0, 25, 1),
+    ('Tuning', 'What note is the 1st string (high E) on a guitar?', ['E4', 'E3', 'E2', 'E5'], 0, 50, 2),
+    ('Tuning', 'What is the standard guitar tuning from low to high?', ['E-A-D-G-B-E', 'E-B-G-D-A-E', 'A-D-G-C-E-A', 'D-A-D-G-B-E'], 0, 50, 1),
+    ('Tuning', 'What is the tuning of a standard ukulele?', ['G-C-E-A', 'C-G-E-A', 'A-D-F-B', 'E-A-D-G'], 0, 50, 2),
+    ('Tuning', 'How many frets does a typical electric guitar have?', ['21-24', '12-15', '18-20', '27-30'], 0, 50, 2),
+    ('Tuning', 'What is "drop D" tuning?', ['D-A-D-G-B-E', 'D-G-D-G-B-D', 'E-A-D-G-B-E', 'D-A-D-F#-A-D'], 0, 50, 2),
+    ('Tempo', 'What BPM range is "Andante"?', ['76-108 BPM', '40-60 BPM', '120-168 BPM', '60-76 BPM'], 0, 25, 1),
+    ('Tempo', 'What BPM range is "Presto"?', ['168-200 BPM', '76-108 BPM', '120-168 BPM', '40-60 BPM'], 0, 50, 2),
+    ('Tempo', 'What BPM range is "Adagio"?', ['66-76 BPM', '40-60 BPM', '76-108 BPM', '168-200 BPM'], 0, 50, 2),
+    ('Tempo', 'What does "Allegro" mean?', ['Fast and lively', 'Slow and stately', 'Moderate walking pace', 'Very fast'], 0, 25, 1),
+    ('Tempo', 'What does "Lento" mean?', ['Slow', 'Fast', 'Moderate', 'Very fast'], 0, 25, 1),
+    ('Modes', 'Which mode is described as "dark and sad"?', ['Aeolian', 'Locrian', 'Phrygian', 'Dorian'], 0, 50, 2),
+    ('Modes', 'Which mode is described as "bright and happy"?', ['Ionian', 'Lydian', 'Mixolydian', 'Dorian'], 0, 50, 2),
+    ('Modes', 'Which mode starts on the 3rd degree of the major scale?', ['Phrygian', 'Dorian', 'Lydian', 'Mixolydian'], 0, 75, 3),
+    ('Modes', 'Which mode has a raised 4th?', ['Lydian', 'Mixolydian', 'Locrian', 'Dorian'], 0, 75, 3),
+    ('Modes', 'Which mode has a flat 7th?', ['Mixolydian', 'Lydian', 'Dorian', 'Ionian'], 0, 75, 3),
+    ('Chords', 'What notes make up a G Major chord?', ['G-B-D', 'G-A-C', 'G-C-E', 'G-D-F#'], 0, 25, 1),
+    ('Chords', 'What notes make up an Am chord?', ['A-C-E', 'A-D-F', 'A-E-G', 'A-C#-E'], 0, 25, 1),
+    ('Chords', 'What notes make up a D Major chord?', ['D-F#-A', 'D-F-A', 'D-G-B', 'D-E-F#'], 0, 25, 1),
+    ('Chords', 'What notes make up an E Minor chord?', ['E-G-B', 'E-G#-B', 'E-A-C', 'E-F#-G#'], 0, 25, 1),
+    ('Chords', 'What is a "power chord"?', ['Root and fifth only', 'Root and third only', 'A full triad', 'A seventh chord'], 0, 25, 1),
+    ('Chords', 'What is the difference between Major and Minor chords?', ['The third interval', 'The fifth interval', 'The root note', 'The seventh'], 0, 50, 2),
+    ('Chords', 'What does a "sus2" chord replace?', ['The third with the second', 'The fifth with the second', 'The root with the second', 'The seventh with the second'], 0, 50, 2),
+    ('Chords', 'What does a "sus4" chord replace?', ['The third with the fourth', 'The fifth with the fourth', 'The root with the fourth', 'The seventh with the fourth'], 0, 50, 2),
+    ('Chords', 'How many notes in a standard seventh chord?', ['4', '3', '5', '6'], 0, 25, 1),
+    ('Chords', 'What is an "inversion"?', ['A chord with a note other than the root in the bass', 'A chord played backwards', 'A chord with added notes', 'A chord played quietly'], 0, 50, 2),
+    ('Glossary', 'What is a "capo"?', ['A device that clamps across the fretboard', 'A type of guitar pick', 'A tuning peg', 'A string damper'], 0, 25, 1),
+    ('Glossary', 'What is "vibrato"?', ['A slight variation in pitch for expression', 'A fast strumming pattern', 'A bend in the guitar neck', 'A type of chord'], 0, 25, 1),
+    ('Glossary', 'What is "harmonics"?', ['Overtones produced by lightly touching a string', 'A type of chord', 'A specific tuning', 'A strumming technique'], 0, 25, 1),
+    ('Glossary', 'What is "tremolo"?', ['Rapid repetition of a note', 'A variation in pitch', 'A sliding technique', 'A picking technique'], 0, 50, 2),
+    ('Glossary', 'What is a "riff"?', ['A short repeated musical phrase', 'A type of chord progression', 'A guitar solo', 'A strumming pattern'], 0, 25, 1),
+    ('Scales', 'How many notes are in a standard major scale?', ['7', '5', '8', '6'], 0, 25, 1),
+    ('Scales', 'How many notes are in a pentatonic scale?', ['5', '7', '6', '8'], 0, 25, 1),
+    ('Scales', 'What is the 5th note of the C Major scale?', ['G', 'F', 'A', 'E'], 0, 25, 1),
+    ('Scales', 'What is the 3rd note of the D Major scale?', ['F#', 'F', 'G', 'E'], 0, 50, 2),
+    ('Scales', 'What is the relative minor of G Major?', ['E Minor', 'A Minor', 'D Minor', 'B Minor'], 0, 50, 2),
+    ('Scales', 'What is the relative major of A Minor?', ['C Major', 'G Major', 'F Major', 'D Major'], 0, 50, 2),
+    ('Scales', 'What is a "blues scale"?', ['Pentatonic minor with a flat 5th', 'Major scale with flat 3rd and 7th', 'A six-note scale', 'The chromatic scale'], 0, 75, 3),
+    ('Scales', 'What are the notes of the E Minor pentatonic scale?', ['E-G-A-B-D', 'E-F#-G-A-B', 'E-F-G-A-B', 'E-G-A-C-D'], 0, 75, 3),
+    ('Articulation', 'What does "legato" mean?', ['Smooth and connected', 'Short and detached', 'Heavy and accented', 'Very soft'], 0, 25, 1),
+    ('Articulation', 'What does "pizzicato" mean?', ['Plucking the strings', 'Bowing the strings', 'Playing with a mute', 'Playing loudly'], 0, 50, 2),
+    ('Articulation', 'What is a "glissando"?', ['A rapid slide between notes', 'A series of fast notes', 'A type of ornament', 'A chord played quickly'], 0, 50, 2),
+    ('Articulation', 'What is "arpeggio"?', ['Notes of a chord played sequentially', 'A fast scale run', 'A strumming pattern', 'A repeated note'], 0, 25, 1),
+    ('Intervals', 'What interval is C to G?', ['Perfect 5th', 'Perfect 4th', 'Major 3rd', 'Major 6th'], 0, 25, 1),
+    ('Intervals', 'What interval is C to F?', ['Perfect 4th', 'Perfect 5th', 'Major 3rd', 'Major 2nd'], 0, 25, 1),
+    ('Intervals', 'What interval is C to E?', ['Major 3rd', 'Minor 3rd', 'Perfect 5th', 'Major 6th'], 0, 25, 1),
+    ('Intervals', 'What interval is A to C?', ['Minor 3rd', 'Major 3rd', 'Minor 2nd', 'Perfect 4th'], 0, 50, 2),
+    ('Intervals', 'What interval is C to B?', ['Major 7th', 'Minor 7th', 'Octave', 'Major 6th'], 0, 50, 2),
+]
+
+
+@lru_cache(maxsize=8)
+def _shuffled_general_bank(seed):
+    bank = list(GENERAL_BANK)
+    question_rng('general', 0, seed).shuffle(bank)
+    return tuple(bank)
+
+
+def generate_general_questions(count, start=0, seed=BANK_SEED):
+    """Yield general music knowledge questions to fill the remaining slots."""
+    bank = _shuffled_general_bank(seed)
+    for index in range(start, start + count):
+        title, question, options, correct_idx, xp, diff = bank[index % len(bank)]
+        yield {
             'category': 'general',
             'title': f'Groove Quiz: {title}',
             'question': question,
@@ -970,23 +1085,23 @@ def generate_general_questions(count):
             'difficulty': diff,
             'question_type': f'general-{title.lower().replace(" ", "-")}',
             'visual': _general_visual(title),
-        })
-    return questions
+        }
 
 
-def seed_challenges(target=1000):
-    """Generate or regenerate the scored Daily challenge bank.
+SEED_CHUNK_SIZE = 500
+SEED_SHADOW_TABLE = 'daily_challenges_shadow'
 
-    Only typed musical-action categories are seeded. The old `theory` and
-    `general` trivia banks were retired from the scored surface per the
-    curriculum contract; the optional unscored `Music context` cards
-    remain an internal future feature and are not produced here.
-    """
-    random.seed(42)  # deterministic seed for reproducibility
 
-    DailyChallenge.query.delete()
-    db.session.commit()
+CHALLENGE_GENERATORS = {
+    'scales':       generate_scales_questions,
+    'chords':       generate_chords_questions,
+    'intervals':    generate_intervals_questions,
+    'ear_training': generate_ear_training_questions,
+}
+
 
+def bank_layout(target):
+    """Return ``[(category, count), ...]`` in bank order for `target` rows."""
     # Re-balance counts into the four scored categories. `theory` and
     # `general` no longer receive any share; remaining budget flows into
     # ear_training, which is the most musical of the four.
@@ -997,95 +1112,609 @@ def seed_challenges(target=1000):
         'ear_training': target * 20 // 100,
     }
     # Top up to the target without touching retired categories.
-    used = sum(counts.values())
-    counts['ear_training'] += target - used
-
-    generators = {
-        'scales':       generate_scales_questions,
-        'chords':       generate_chords_questions,
-        'intervals':    generate_intervals_questions,
-        'ear_training': generate_ear_training_questions,
+    counts['ear_training'] += target - sum(counts.values())
+    return list(counts.items())
+
+
+def bank_position(target, position):
+    """Map a 0-based row `position` in a `target`-row bank to ``(category, index)``."""
+    if not 0 <= position < target:
+        raise IndexError(position)
+    for category, count in bank_layout(target):
+        if position < count:
+            return category, position
+        position -= count
+
+
+def _challenge_row(question):
+    meta = CATEGORY_METADATA[question['category']]
+    return {
+        'category': question['category'],
+        'title': question['title'],
+        'question': question['question'],
+        'options_json': json.dumps(question['options']),
+        'correct_index': question['correct_index'],
+        'explanation': question.get('explanation'),
+        'question_type': question.get('question_type'),
+        'visual_json': json.dumps(question['visual']),
+        'xp_reward': question['xp_reward'],
+        'difficulty': question['difficulty'],
+        'skill_id': question.get('skill_id') or f'{question["category"]}.{question.get("question_type") or "generic"}',
+        'modality': meta['modality'],
+        'rank_band_min': meta['rank_min'],
+        'rank_band_max': meta['rank_max'],
+        'difficulty_axis': meta['axis'],
+        'stimulus_version': STIMULUS_VERSION,
     }
 
-    challenges = []
-    for cat, gen in generators.items():
-        qs = gen(counts[cat])
-        meta = CATEGORY_METADATA[cat]
-        for q in qs:
-            challenges.append(DailyChallenge(
-                category=q['category'],
-                title=q['title'],
-                question=q['question'],
-                options_json=json.dumps(q['options']),
-                correct_index=q['correct_index'],
-                explanation=q.get('explanation'),
-                question_type=q.get('question_type'),
-                visual_json=json.dumps(q['visual']),
-                xp_reward=q['xp_reward'],
-                difficulty=q['difficulty'],
-                skill_id=q.get('skill_id') or f'{cat}.{q.get("question_type") or "generic"}',
-                modality=meta['modality'],
-                rank_band_min=meta['rank_min'],
-                rank_band_max=meta['rank_max'],
-                difficulty_axis=meta['axis'],
-                stimulus_version=STIMULUS_VERSION,
-            ))
-
-    db.session.add_all(challenges)
+
+def generate_question(category, index, seed=BANK_SEED):
+    """Regenerate question `index` of `category` without generating the rest."""
+    return next(CHALLENGE_GENERATORS[category](1, start=index, seed=seed))
+
+
+def _challenge_rows(target, start=0, stop=None, seed=BANK_SEED):
+    """Yield `daily_challenges` row dicts for bank positions `start` .. `stop`.
+
+    Rows come out in bank order (see `bank_layout`), so concatenating
+    slices gives exactly the rows of one full pass.
+    """
+    stop = target if stop is None else min(stop, target)
+    offset = 0
+    for category, count in bank_layout(target):
+        first, last = max(start - offset, 0), min(stop - offset, count)
+        if first < last:
+            for question in CHALLENGE_GENERATORS[category](last - first, start=first, seed=seed):
+                yield _challenge_row(question)
+        offset += count
+
+
+def _challenge_row_slice(target, start, stop, seed=BANK_SEED):
+    return list(_challenge_rows(target, start, stop, seed))
+
+
+def _parallel_challenge_rows(target, workers, slice_size=SEED_CHUNK_SIZE * 10, seed=BANK_SEED):
+    """`_challenge_rows` generated by a pool of `workers` processes.
+
+    Slices are yielded in bank order, with at most two per worker in
+    flight, so memory stays bounded when the consumer is the slower side.
+    """
+    starts = iter(range(0, target, slice_size))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque(
+            pool.submit(_challenge_row_slice, target, start, start + slice_size, seed)
+            for start in islice(starts, workers * 2)
+        )
+        while pending:
+            rows = pending.popleft().result()
+            start = next(starts, None)
+            if start is not None:
+                pending.append(pool.submit(_challenge_row_slice, target, start, start + slice_size, seed))
+            yield from rows
+
+
+def _insert_chunks(table, rows, target, chunk_size, progress):
+    """Executemany `rows` into `table`, committing every `chunk_size` rows."""
+    inserted = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return inserted
+        db.session.execute(table.insert(), chunk)
+        db.session.commit()
+        inserted += len(chunk)
+        if progress is not None:
+            progress(inserted, target)
+
+
+def seed_challenges(target=1000, chunk_size=SEED_CHUNK_SIZE, progress=None, shadow=False, workers=1):
+    """Generate or regenerate the scored Daily challenge bank.
+
+    Only typed musical-action categories are seeded. The old `theory` and
+    `general` trivia banks were retired from the scored surface per the
+    curriculum contract; the optional unscored `Music context` cards
+    remain an internal future feature and are not produced here.
+
+    Rows are streamed from the generators and inserted `chunk_size` at a
+    time, each chunk in its own short transaction; `progress(inserted,
+    target)` is called after every chunk. With `shadow=True` the bank is
+    built in `daily_challenges_shadow` and swapped in by one transaction,
+    so players never see a partially seeded bank.
+
+    The bank is deterministic (see `question_rng`); `workers > 1` generates
+    it in a process pool and inserts the same rows in the same order.
+    """
+    rows = _challenge_rows(target) if workers <= 1 else _parallel_challenge_rows(target, workers)
+    live = DailyChallenge.__table__
+    if not shadow:
+        db.session.execute(live.delete())
+        db.session.commit()
+        count = _insert_chunks(live, rows, target, chunk_size, progress)
+        _invalidate_bank_caches()
+        return count
+
+    staging = live.to_metadata(sa.MetaData(), name=SEED_SHADOW_TABLE)
+    # Index names are database-wide on SQLite, and the staging table is only
+    # appended to and then copied in id order, so it carries none.
+    staging.indexes.clear()
+    staging.drop(db.session.connection(), checkfirst=True)
+    staging.create(db.session.connection())
+    db.session.commit()
+    count = _insert_chunks(staging, rows, target, chunk_size, progress)
+
+    # Copy without `id` so the live table's own sequence numbers the rows,
+    # exactly as a direct seed would. The DELETE opens the transaction on
+    # SQLite, so the copy and the DROP commit or roll back together.
+    columns = [column.name for column in live.columns if column.name != 'id']
+    db.session.execute(live.delete())
+    db.session.execute(live.insert().from_select(
+        columns,
+        sa.select(*(staging.c[name] for name in columns)).order_by(staging.c.id),
+    ))
+    staging.drop(db.session.connection())
     db.session.commit()
-    return len(challenges)
+    _invalidate_bank_caches()
+    return count
 
 
-def compute_streak(user_id):
-    """Calculate consecutive-day streak from ChallengeAttempt records."""
-    today = datetime.utcnow().strftime('%Y-%m-%d')
-    yesterday = (datetime.utcnow() - timedelta(days=1)).strftime('%Y-%m-%d')
+# ─── Virtual bank ──────────────────────────────────────────────────────────────
+# With PYMUSIC_DAILY_BANK=virtual nothing is seeded: a challenge id names a
+# (category, index) pair, and with `BANK_SEED` and `STIMULUS_VERSION` that
+# fixes the question, so it is rendered from the generators on demand. Only
+# attempts and hint reveals are stored. Virtual ids start at
+# `VIRTUAL_ID_BASE`, clear of any seeded row, and each category owns a span
+# of `VIRTUAL_CATEGORY_SPAN` ids so they fit a 32-bit INTEGER column.
+
+DAILY_BANK_MODE = os.getenv('PYMUSIC_DAILY_BANK', 'stored')
+VIRTUAL_BANK_SIZE = int(os.getenv('PYMUSIC_VIRTUAL_BANK_SIZE', '1000000'))
+VIRTUAL_ID_BASE = 1_000_000_000
+VIRTUAL_CATEGORY_SPAN = 100_000_000
+VIRTUAL_CATEGORIES = tuple(CHALLENGE_GENERATORS)
+
+
+def virtual_bank_enabled():
+    return DAILY_BANK_MODE == 'virtual'
+
+
+def virtual_challenge_id(category, index):
+    return VIRTUAL_ID_BASE + VIRTUAL_CATEGORIES.index(category) * VIRTUAL_CATEGORY_SPAN + index
+
+
+def virtual_challenge_key(challenge_id, size=None):
+    """Return ``(category, index)`` for a virtual id inside the bank, else None."""
+    slot, index = divmod(challenge_id - VIRTUAL_ID_BASE, VIRTUAL_CATEGORY_SPAN)
+    if challenge_id < VIRTUAL_ID_BASE or slot >= len(VIRTUAL_CATEGORIES):
+        return None
+    category = VIRTUAL_CATEGORIES[slot]
+    if index >= dict(bank_layout(size or VIRTUAL_BANK_SIZE))[category]:
+        return None
+    return category, index
+
+
+def _virtual_position_id(position, layout):
+    for category, count in layout:
+        if position < count:
+            return virtual_challenge_id(category, position)
+        position -= count
+    return None
+
+
+def _virtual_id_position(challenge_id, layout):
+    slot, index = divmod(challenge_id - VIRTUAL_ID_BASE, VIRTUAL_CATEGORY_SPAN)
+    return sum(count for _, count in layout[:slot]) + index
+
+
+def render_virtual_challenge(challenge_id, seed=BANK_SEED):
+    """Build the transient `DailyChallenge` a virtual id stands for, or None.
+
+    The object is never added to the session. Its fields are exactly the row
+    `seed_challenges` would store for the same bank position.
+    """
+    key = virtual_challenge_key(challenge_id)
+    if key is None:
+        return None
+    return DailyChallenge(id=challenge_id, **_challenge_row(generate_question(*key, seed=seed)))
+
+
+def load_challenge(challenge_id):
+    """A stored challenge row, or the virtual challenge for a virtual id."""
+    if challenge_id >= VIRTUAL_ID_BASE:
+        return render_virtual_challenge(challenge_id) if virtual_bank_enabled() else None
+    return db.session.get(DailyChallenge, challenge_id)
+
+
+def _completed_among(user_id, challenge_ids):
+    if not challenge_ids:
+        return set()
+    return {row[0] for row in db.session.query(ChallengeAttempt.challenge_id).filter(
+        ChallengeAttempt.user_id == user_id,
+        ChallengeAttempt.completed == True,
+        ChallengeAttempt.challenge_id.in_(challenge_ids),
+    )}
+
+
+def _virtual_daily_challenges(limit, offset, random_mode, exclude_ids, after):
+    """`get_daily_challenges` over the virtual bank.
+
+    Pages walk bank positions (see `bank_layout`) from `offset`, or from just
+    after the virtual id `after`, skipping this player's completions a batch
+    at a time. Random mode draws positions uniformly and drops completed or
+    excluded ids, which costs one attempts lookup per draw.
+    """
+    size = VIRTUAL_BANK_SIZE
+    layout = bank_layout(size)
+    user_id = current_user.id if current_user.is_authenticated else None
+    excluded = {challenge_id for challenge_id in exclude_ids if virtual_challenge_key(challenge_id)}
+
+    def open_ids(candidates):
+        skip = excluded | (_completed_among(user_id, candidates) if user_id else set())
+        return [challenge_id for challenge_id in candidates if challenge_id not in skip]
+
+    start = 0 if random_mode else (_virtual_id_position(after, layout) + 1 if after else min(offset, size))
+    start_id = _virtual_position_id(start, layout) or VIRTUAL_ID_BASE + len(VIRTUAL_CATEGORIES) * VIRTUAL_CATEGORY_SPAN
+    completed_count = completed_ahead = 0
+    if user_id:
+        completed_count, completed_ahead = db.session.query(
+            sa.func.count(ChallengeAttempt.id),
+            sa.func.sum(sa.case((ChallengeAttempt.challenge_id >= start_id, 1), else_=0)),
+        ).filter(
+            ChallengeAttempt.user_id == user_id,
+            ChallengeAttempt.completed == True,
+            ChallengeAttempt.challenge_id >= VIRTUAL_ID_BASE,
+        ).one()
+    excluded_ahead = len([challenge_id for challenge_id in open_ids(list(excluded)) if challenge_id >= start_id])
+    # Open challenges from `start` on: positions left minus completions and
+    # exclusions at or after it, as the stored bank counts its window.
+    available_total = size - start - (completed_ahead or 0) - excluded_ahead
+
+    picked = []
+    next_cursor = None
+    if random_mode:
+        for _ in range(RANDOM_PROBE_ROUNDS):
+            draw = min(size, 2 * (limit - len(picked)) + len(excluded))
+            candidates = [_virtual_position_id(position, layout) for position in random.sample(range(size), draw)]
+            picked.extend(challenge_id for challenge_id in open_ids(candidates) if challenge_id not in picked)
+            if len(picked) >= limit:
+                break
+        picked = picked[:limit]
+    else:
+        position = start
+        while len(picked) < limit and position < size:
+            stop = min(position + 2 * limit, size)
+            candidates = [_virtual_position_id(index, layout) for index in range(position, stop)]
+            picked.extend(open_ids(candidates)[:limit - len(picked)])
+            position = stop
+    remaining = max(available_total - len(picked), 0)
+    if remaining and picked and not random_mode:
+        next_cursor = str(picked[-1])
+
+    return {
+        'challenges': [serialize_challenge(render_virtual_challenge(challenge_id)) for challenge_id in picked],
+        'total': size,
+        'completed': completed_count,
+        'remaining': remaining,
+        'limit': limit,
+        'offset': 0 if after else offset,
+        'next_cursor': next_cursor,
+    }
+
+
+def _streak_from_dates(dates):
+    """Return ``(run ending on the latest date, longest run, latest date)``
+    for distinct YYYY-MM-DD strings sorted newest first."""
+    if not dates:
+        return 0, 0, None
+    current = longest = run = 1
+    in_current = True
+    previous = date.fromisoformat(dates[0])
+    for value in dates[1:]:
+        day = date.fromisoformat(value)
+        if (previous - day).days == 1:
+            run += 1
+        else:
+            in_current = False
+            run = 1
+        if in_current:
+            current = run
+        longest = max(longest, run)
+        previous = day
+    return current, longest, dates[0]
+
 
-    completed_dates = db.session.query(
+def _completed_dates(user_id):
+    rows = db.session.query(
         db.distinct(ChallengeAttempt.challenge_date)
     ).filter(
         ChallengeAttempt.user_id == user_id,
         ChallengeAttempt.completed == True
     ).order_by(ChallengeAttempt.challenge_date.desc()).all()
+    return [row[0] for row in rows]
 
-    dates = [d[0] for d in completed_dates]
-    if not dates:
-        return 0
 
-    # Check if the streak is active (today or yesterday was completed)
-    if dates[0] != today and dates[0] != yesterday:
+def _live_streak(current, last_active_date, today):
+    """A stored run only counts while its last day is today or yesterday."""
+    if not last_active_date:
         return 0
+    yesterday = (date.fromisoformat(today) - timedelta(days=1)).isoformat()
+    return current if last_active_date in (today, yesterday) else 0
+
+
+def streak_state(user_id, today=None):
+    """Return ``(current streak, longest streak, last active date)``.
+
+    Reads the materialized `UserStreak` row. Users that predate the table
+    and have not been reached by `rebuild_streaks` yet are computed from
+    their attempts, without writing.
+    """
+    today = today or datetime.utcnow().strftime('%Y-%m-%d')
+    row = db.session.get(UserStreak, user_id)
+    if row is not None:
+        current, longest, last_active = row.current_streak, row.longest_streak, row.last_active_date
+    else:
+        current, longest, last_active = _streak_from_dates(_completed_dates(user_id))
+    return _live_streak(current, last_active, today), longest, last_active
+
+
+def compute_streak(user_id):
+    """Current consecutive-day streak for the user."""
+    return streak_state(user_id)[0]
+
+
+def _advance_streak(user_id, today):
+    """Count a completion on `today` towards the user's materialized streak.
 
-    streak = 0
-    check = dates[0]
+    The common case is a single UPDATE whose CASE expressions read the row's
+    previous values, so concurrent completions cannot lose an increment.
+    """
+    streaks = UserStreak.__table__
+    yesterday = (date.fromisoformat(today) - timedelta(days=1)).isoformat()
+    advanced = sa.case(
+        (streaks.c.last_active_date == today, streaks.c.current_streak),
+        (streaks.c.last_active_date == yesterday, streaks.c.current_streak + 1),
+        else_=1,
+    )
+    updated = db.session.execute(streaks.update().where(streaks.c.user_id == user_id).values(
+        current_streak=advanced,
+        longest_streak=sa.case(
+            (advanced > streaks.c.longest_streak, advanced), else_=streaks.c.longest_streak,
+        ),
+        last_active_date=today,
+        updated_at=datetime.utcnow(),
+    )).rowcount
+    if updated:
+        return
+    # First completion since the table was added: start from history, which
+    # already includes today's attempt.
+    current, longest, last_active = _streak_from_dates(_completed_dates(user_id))
+    db.session.execute(_dialect_insert(streaks).values(
+        user_id=user_id, current_streak=current, longest_streak=longest,
+        last_active_date=last_active, updated_at=datetime.utcnow(),
+    ).on_conflict_do_nothing())
+
+
+STREAK_REBUILD_BATCH_SIZE = 500
+
+
+def rebuild_streaks(batch_size=STREAK_REBUILD_BATCH_SIZE, only_missing=True, progress=None):
+    """Materialize `UserStreak` rows from `challenge_attempts` history.
+
+    Users are walked in id order, `batch_size` at a time, reading each
+    batch's distinct completion dates in one query and committing after each
+    batch. With `only_missing` the walk skips users that already have a row,
+    so an interrupted run resumes; otherwise every row is recomputed.
+    `progress(rebuilt, last_user_id)` is called after every batch. Returns
+    the number of rows written.
+    """
+    attempts = ChallengeAttempt.__table__
+    streaks = UserStreak.__table__
+    rebuilt = 0
+    last_user_id = 0
     while True:
-        if check in dates:
-            streak += 1
-            # Previous day
-            d = datetime.strptime(check, '%Y-%m-%d') - timedelta(days=1)
-            check = d.strftime('%Y-%m-%d')
-        else:
-            break
+        users = sa.select(attempts.c.user_id).where(
+            attempts.c.completed == True, attempts.c.user_id > last_user_id,
+        )
+        if only_missing:
+            users = users.where(~sa.exists().where(streaks.c.user_id == attempts.c.user_id))
+        user_ids = db.session.execute(
+            users.distinct().order_by(attempts.c.user_id).limit(batch_size)
+        ).scalars().all()
+        if not user_ids:
+            return rebuilt
+        dates = {user_id: [] for user_id in user_ids}
+        for user_id, challenge_date in db.session.execute(
+            sa.select(attempts.c.user_id, attempts.c.challenge_date)
+            .where(attempts.c.completed == True, attempts.c.user_id.in_(user_ids))
+            .distinct()
+            .order_by(attempts.c.user_id, attempts.c.challenge_date.desc())
+        ):
+            dates[user_id].append(challenge_date)
+        now = datetime.utcnow()
+        rows = []
+        for user_id, history in dates.items():
+            current, longest, last_active = _streak_from_dates(history)
+            rows.append({'user_id': user_id, 'current_streak': current, 'longest_streak': longest,
+                         'last_active_date': last_active, 'updated_at': now})
+        db.session.execute(streaks.delete().where(streaks.c.user_id.in_(user_ids)))
+        db.session.execute(streaks.insert(), rows)
+        db.session.commit()
+        rebuilt += len(rows)
+        last_user_id = user_ids[-1]
+        if progress is not None:
+            progress(rebuilt, last_user_id)
 
-    return streak
 
+def _schedule_review(user_id, skill_id, correct, now):
+    """Feed one graded Daily answer into the user's review queue for `skill_id`."""
+    row = SkillReview.query.filter_by(user_id=user_id, skill_id=skill_id).with_for_update().first()
+    if row is None:
+        # A first answer for this skill. A racing request for the same skill
+        # may create the row first, so insert idempotently and read it back.
+        reviews = SkillReview.__table__
+        db.session.execute(_dialect_insert(reviews).values(
+            user_id=user_id, skill_id=skill_id, ease=START_EASE, interval_days=0,
+            repetitions=0, lapses=0, due_at=now,
+        ).on_conflict_do_nothing())
+        row = SkillReview.query.filter_by(user_id=user_id, skill_id=skill_id).with_for_update().one()
+    row.ease, row.interval_days, row.repetitions = sm2_step(
+        row.ease, row.interval_days, row.repetitions, review_quality(correct),
+    )
+    if not correct:
+        row.lapses += 1
+    row.due_at = now + timedelta(days=row.interval_days)
+    row.last_reviewed_at = now
 
-def _utc_hint_state(user, now=None):
+
+def _review_picks(available_query, user_id, limit, now=None):
+    """The lowest-id open challenge for each of the user's due skills, most
+    overdue first.
+
+    One query: due reviews from the `(user_id, due_at)` index joined to the
+    open challenges of their skill, so a due skill with nothing left to
+    answer takes no slot.
+    """
+    reviews = SkillReview.__table__
+    picks = available_query.join(reviews, sa.and_(
+        reviews.c.user_id == user_id, reviews.c.skill_id == DailyChallenge.skill_id,
+    )).filter(reviews.c.due_at <= (now or datetime.utcnow())).with_entities(
+        sa.func.min(DailyChallenge.id).label('challenge_id'),
+        sa.func.min(reviews.c.due_at).label('due_at'),
+    ).group_by(DailyChallenge.skill_id).order_by(None).order_by('due_at').limit(limit).subquery()
+    return DailyChallenge.query.join(picks, DailyChallenge.id == picks.c.challenge_id) \
+        .order_by(picks.c.due_at, DailyChallenge.id).all()
+
+
+def _hint_window(user, now=None):
+    """Return ``(usage_date, limit, reset_at)`` for `user`'s current UTC day."""
     now = now or datetime.utcnow()
     usage_date = now.strftime('%Y-%m-%d')
     reset_at = (datetime(now.year, now.month, now.day) + timedelta(days=1)).isoformat() + 'Z'
     rank_id = (user.rank_id or 'unranked').lower()
-    limit = HINT_LIMITS.get(rank_id, HINT_LIMITS['unranked'])
+    return usage_date, HINT_LIMITS.get(rank_id, HINT_LIMITS['unranked']), reset_at
+
+
+def _utc_hint_state(user, now=None):
+    usage_date, limit, reset_at = _hint_window(user, now)
     usage = DailyHintUsage.query.filter_by(user_id=user.id, usage_date=usage_date).first()
     used = usage.used_count if usage else 0
     return usage_date, limit, used, reset_at
 
 
+HINT_ALLOWANCE_TTL_SECONDS = float(os.getenv('PYMUSIC_HINT_ALLOWANCE_TTL', '15'))
+HINT_ALLOWANCE_CACHE_SIZE = 10000
+_hint_allowance_cache = {}
+_hint_allowance_lock = threading.Lock()
+
+
+def _remember_hints_used(user_id, usage_date, used):
+    now = time.monotonic()
+    with _hint_allowance_lock:
+        if len(_hint_allowance_cache) >= HINT_ALLOWANCE_CACHE_SIZE:
+            for key in [key for key, (expires, _) in _hint_allowance_cache.items() if expires <= now]:
+                del _hint_allowance_cache[key]
+            if len(_hint_allowance_cache) >= HINT_ALLOWANCE_CACHE_SIZE:
+                _hint_allowance_cache.clear()
+        _hint_allowance_cache[(str(db.engine.url), user_id, usage_date)] = (now + HINT_ALLOWANCE_TTL_SECONDS, used)
+
+
 def _hint_allowance(user):
-    _, limit, used, reset_at = _utc_hint_state(user)
+    """Remaining hints for the list endpoint, cached per user for a few seconds.
+
+    `reveal_hint` refreshes this process's entry after every spend, so the
+    TTL only bounds how stale another worker's figure can be; the reveal
+    itself always checks the limit in the database.
+    """
+    usage_date, limit, reset_at = _hint_window(user)
+    cached = _hint_allowance_cache.get((str(db.engine.url), user.id, usage_date))
+    if cached and cached[0] > time.monotonic():
+        used = cached[1]
+    else:
+        used = db.session.execute(sa.select(DailyHintUsage.used_count).where(
+            DailyHintUsage.user_id == user.id, DailyHintUsage.usage_date == usage_date,
+        )).scalar() or 0
+        _remember_hints_used(user.id, usage_date, used)
     return {'remaining': max(limit - used, 0), 'limit': limit, 'reset_at': reset_at, 'local_only': False}
 
 
+BANK_TOTALS_TTL_SECONDS = float(os.getenv('PYMUSIC_BANK_TOTALS_TTL', '60'))
+_bank_totals_cache = {}
+
+
+def _invalidate_bank_caches():
+    _bank_totals_cache.pop(str(db.engine.url), None)
+    clear_payload_cache()
+
+
+def _bank_totals():
+    """Return ``(all rows, scored rows, lowest id, highest id)`` in the bank.
+
+    These only change when the bank is reseeded, so they are cached per
+    database for `BANK_TOTALS_TTL_SECONDS`; `seed_challenges` drops the entry
+    for its own process, and the TTL bounds staleness in other workers. An
+    empty scored bank is never cached: it triggers a destructive reseed, so
+    every worker must see the live count before deciding to seed.
+    """
+    key = str(db.engine.url)
+    cached = _bank_totals_cache.get(key)
+    now = time.monotonic()
+    if cached and cached[0] > now:
+        return cached[1]
+    scored = sa.func.sum(sa.case((DailyChallenge.category.in_(SCORED_CATEGORIES), 1), else_=0))
+    total, scored_total, low_id, high_id = db.session.query(
+        sa.func.count(DailyChallenge.id), scored, sa.func.min(DailyChallenge.id), sa.func.max(DailyChallenge.id),
+    ).one()
+    totals = (total, scored_total or 0, low_id or 0, high_id or 0)
+    if totals[1]:
+        _bank_totals_cache[key] = (now + BANK_TOTALS_TTL_SECONDS, totals)
+    return totals
+
+
+RANDOM_PROBE_BATCH = 500
+RANDOM_PROBE_ROUNDS = 4
+RANDOM_PROBE_MIN_DENSITY = 0.02
+
+
+def _sample_available(available_query, available_total, k, low_id, high_id):
+    """Return up to `k` uniformly random rows of `available_query`.
+
+    Draws candidate ids uniformly from ``[low_id, high_id]`` and keeps the
+    ones the query still returns, which is rejection sampling and therefore
+    uniform over the available rows. Only the ids are fetched while probing;
+    the winners are hydrated at the end. When too few ids in the range are
+    available for probing to pay off, it samples from the available ids
+    instead, still without loading full rows.
+    """
+    if k <= 0 or available_total <= 0:
+        return []
+    span = high_id - low_id + 1
+    picked = []
+    if span > 0 and available_total / span >= RANDOM_PROBE_MIN_DENSITY:
+        density = available_total / span
+        seen = set()
+        for _ in range(RANDOM_PROBE_ROUNDS):
+            fresh = [
+                candidate for candidate in random.sample(
+                    range(low_id, high_id + 1),
+                    min(span, RANDOM_PROBE_BATCH, int((k - len(picked)) / density * 1.25) + 1),
+                )
+                if candidate not in seen
+            ]
+            if not fresh:
+                continue
+            seen.update(fresh)
+            hits = {row[0] for row in available_query.with_entities(DailyChallenge.id)
+                    .filter(DailyChallenge.id.in_(fresh))}
+            picked.extend(candidate for candidate in fresh if candidate in hits)
+            if len(picked) >= k or len(seen) >= span:
+                break
+        picked = picked[:k]
+    if len(picked) < k:
+        taken = set(picked)
+        pool = [row[0] for row in available_query.with_entities(DailyChallenge.id) if row[0] not in taken]
+        picked.extend(random.sample(pool, min(k - len(picked), len(pool))))
+    rows = {challenge.id: challenge for challenge in available_query.filter(DailyChallenge.id.in_(picked))}
+    return [rows[challenge_id] for challenge_id in picked if challenge_id in rows]
+
+
 def _apply_rank_xp(user, amount):
     """Compatibility wrapper: rank now follows the single account level."""
     if amount:
@@ -1097,10 +1726,21 @@ def _apply_rank_xp(user, amount):
 @daily_bp.route('/daily-challenges', methods=['GET'])
 @limiter.limit('120 per minute', override_defaults=True)
 def get_daily_challenges():
-    """Return challenges the current user hasn't completed yet."""
+    """Return challenges the current user hasn't completed yet.
+
+    Pages are ordered by (difficulty, id). Pass the previous response's
+    `next_cursor` as `after` to fetch the next page; `offset` is still honoured
+    when `after` is absent. A virtual bank pages in bank order instead and its
+    cursor is the last challenge id.
+
+    `review=1` (signed in, stored bank) leads the page with one open
+    challenge per skill due in the player's review queue and fills the rest
+    in the usual order; such a page has no cursor.
+    """
     limit = min(int(request.args.get('limit', 10)), 50)
     offset = int(request.args.get('offset', 0))
     random_mode = request.args.get('random', '0') == '1'
+    review_mode = request.args.get('review', '0') == '1' and current_user.is_authenticated
     exclude_ids_raw = request.args.get('exclude_ids', '')
     exclude_ids = {
         int(part)
@@ -1108,55 +1748,113 @@ def get_daily_challenges():
         if part.strip().isdigit()
     }
 
+    after_raw = request.args.get('after')
+    if virtual_bank_enabled():
+        if after_raw and not (after_raw.isdigit() and virtual_challenge_key(int(after_raw))):
+            return jsonify({'error': 'after must be a challenge id from this bank'}), 400
+        page = _virtual_daily_challenges(limit, offset, random_mode, exclude_ids, int(after_raw or 0))
+        page['hint_allowance'] = _hint_allowance(current_user) if current_user.is_authenticated else {
+            'remaining': None, 'limit': None, 'reset_at': None, 'local_only': True,
+        }
+        return jsonify(page)
+
+    cursor = None
+    if after_raw:
+        try:
+            cursor = tuple(int(part) for part in after_raw.split(':'))
+        except ValueError:
+            cursor = ()
+        if len(cursor) != 2:
+            return jsonify({'error': 'after must be "<difficulty>:<id>"'}), 400
+
     # A fresh deployment must be playable on its first request. Previously an
     # empty production database exposed the maintenance-only bank reload flow
     # to players. Seed a compact bank automatically only when no scored row
     # exists; an exhausted user's filtered result must remain exhausted.
-    if DailyChallenge.query.filter(DailyChallenge.category.in_(SCORED_CATEGORIES)).count() == 0:
+    bank_total, scored_total, low_id, high_id = _bank_totals()
+    if scored_total == 0:
         seed_challenges(target=200)
+        bank_total, scored_total, low_id, high_id = _bank_totals()
 
-    # Get IDs of completed challenges
-    completed_ids = set()
+    # Scored-bank filter: history, band, instrument-fact, and glossary rows are
+    # retired from the Daily reward surface. The curriculum contract requires a
+    # typed musical action.
+    window = [DailyChallenge.category.in_(SCORED_CATEGORIES)]
+    if cursor and not random_mode and not review_mode:
+        # Keyset pagination on (difficulty, id): the client passes the previous
+        # page's `next_cursor` and `offset` is ignored. Old clients still page
+        # with `offset`.
+        difficulty, last_id = cursor
+        window.append(sa.or_(
+            DailyChallenge.difficulty > difficulty,
+            sa.and_(DailyChallenge.difficulty == difficulty, DailyChallenge.id > last_id),
+        ))
+        offset = 0
+    available_query = DailyChallenge.query.filter(*window)
+
+    completed_count = 0
+    completed_in_window = 0
     if current_user.is_authenticated:
-        completed_rows = db.session.query(ChallengeAttempt.challenge_id).filter(
+        # Anti-join rather than `NOT IN (<every completed id>)`: the probe is
+        # answered from the attempts index however long the history is.
+        available_query = available_query.filter(~sa.exists().where(
+            ChallengeAttempt.user_id == current_user.id,
+            ChallengeAttempt.challenge_id == DailyChallenge.id,
+            ChallengeAttempt.completed == True,
+        ))
+        user_completed = db.session.query(sa.func.count(ChallengeAttempt.id)).filter(
             ChallengeAttempt.user_id == current_user.id,
             ChallengeAttempt.completed == True,
             ChallengeAttempt.challenge_id.isnot(None),
-        ).all()
-        completed_ids = {c[0] for c in completed_rows}
-
-    # Fetch challenges excluding completed ones before paginating so offsets stay stable.
-    # Scored-bank filter: history, band, instrument-fact, and glossary rows are
-    # retired from the Daily reward surface. The curriculum contract requires a
-    # typed musical action.
-    available_query = DailyChallenge.query.filter(
-        DailyChallenge.category.in_(SCORED_CATEGORIES)
-    )
-    if completed_ids:
-        available_query = available_query.filter(~DailyChallenge.id.in_(completed_ids))
+        )
+        completed_count = user_completed.scalar()
+        if completed_count:
+            completed_in_window = user_completed.join(
+                DailyChallenge, DailyChallenge.id == ChallengeAttempt.challenge_id,
+            ).filter(*window).scalar()
+    excluded_open = 0
     if exclude_ids:
+        excluded_open = available_query.filter(DailyChallenge.id.in_(exclude_ids)).count()
         available_query = available_query.filter(~DailyChallenge.id.in_(exclude_ids))
 
-    available_total = available_query.count()
+    # Count what is left as bank rows minus this player's completions, so the
+    # cost follows their history instead of re-running the anti-join over the
+    # whole bank.
+    window_total = scored_total if len(window) == 1 else DailyChallenge.query.filter(*window).count()
+    available_total = window_total - completed_in_window - excluded_open
 
+    next_cursor = None
     if random_mode:
-        candidates = available_query.all()
-        challenges = random.sample(candidates, k=min(limit, len(candidates))) if candidates else []
+        challenges = _sample_available(available_query, available_total, limit, low_id, high_id)
+        remaining = max(available_total - len(challenges), 0)
+    elif review_mode:
+        # Due reviews first, then the regular order fills the page.
+        offset = 0
+        challenges = _review_picks(available_query, current_user.id, limit)
+        if len(challenges) < limit:
+            challenges += available_query \
+                .filter(~DailyChallenge.id.in_([challenge.id for challenge in challenges])) \
+                .order_by(DailyChallenge.difficulty.asc(), DailyChallenge.id.asc()) \
+                .limit(limit - len(challenges)).all()
+        remaining = max(available_total - len(challenges), 0)
     else:
         challenges = available_query \
             .order_by(DailyChallenge.difficulty.asc(), DailyChallenge.id.asc()) \
             .offset(offset).limit(limit).all()
+        remaining = max(available_total - offset - len(challenges), 0)
+        if remaining and challenges:
+            next_cursor = f'{challenges[-1].difficulty}:{challenges[-1].id}'
 
     result = [serialize_challenge(c) for c in challenges]
-    completed_count = len(completed_ids)
 
     return jsonify({
         'challenges': result,
-        'total': DailyChallenge.query.count(),
+        'total': bank_total,
         'completed': completed_count,
-        'remaining': max(available_total - len(result), 0) if random_mode else max(available_total - offset - len(result), 0),
+        'remaining': remaining,
         'limit': limit,
         'offset': offset,
+        'next_cursor': next_cursor,
         'hint_allowance': _hint_allowance(current_user) if current_user.is_authenticated else {
             'remaining': None, 'limit': None, 'reset_at': None, 'local_only': True,
         },
@@ -1168,60 +1866,50 @@ def get_daily_challenges():
 @limiter.limit('120 per hour', override_defaults=True)
 def reveal_hint(challenge_id):
     """Spend at most one UTC daily hint for this user's challenge reveal."""
-    challenge = DailyChallenge.query.get(challenge_id)
+    challenge = load_challenge(challenge_id)
     if not challenge:
         return jsonify({'error': 'Challenge not found'}), 404
 
-    usage_date, limit, _, reset_at = _utc_hint_state(current_user)
-    # The reveal row is the idempotency key. Locking the usage row keeps supported
-    # databases from overspending the daily counter under simultaneous requests.
-    reveal = DailyHintReveal.query.filter_by(
-        user_id=current_user.id, challenge_id=challenge_id, usage_date=usage_date,
-    ).first()
-    usage = DailyHintUsage.query.filter_by(
-        user_id=current_user.id, usage_date=usage_date,
-    ).with_for_update().first()
-    if reveal:
-        used = usage.used_count if usage else 0
+    usage_date, limit, reset_at = _hint_window(current_user)
+    now = datetime.utcnow()
+    # The reveal row is the idempotency key: claiming it is an insert that
+    # does nothing if this challenge was already revealed today.
+    reveals = DailyHintReveal.__table__
+    claimed = db.session.execute(_dialect_insert(reveals).values(
+        user_id=current_user.id, challenge_id=challenge_id, usage_date=usage_date, created_at=now,
+    ).on_conflict_do_nothing().returning(reveals.c.id)).first()
+    usage = DailyHintUsage.__table__
+    if claimed is None:
+        used = db.session.execute(sa.select(usage.c.used_count).where(
+            usage.c.user_id == current_user.id, usage.c.usage_date == usage_date,
+        )).scalar() or 0
         return jsonify({
             'remaining': max(limit - used, 0), 'limit': limit, 'reset_at': reset_at,
             'explanation': challenge.to_dict()['explanation'], 'already_revealed': True,
         })
-    if usage is None:
-        usage = DailyHintUsage(user_id=current_user.id, usage_date=usage_date, used_count=0)
-        db.session.add(usage)
-    if usage.used_count >= limit:
+
+    # Spend one hint only while under the limit. The increment and the check
+    # are one statement, so simultaneous reveals cannot overspend the day.
+    insert = _dialect_insert(usage).values(
+        user_id=current_user.id, usage_date=usage_date, used_count=1, created_at=now, updated_at=now,
+    )
+    used = db.session.execute(insert.on_conflict_do_update(
+        index_elements=[usage.c.user_id, usage.c.usage_date],
+        set_={'used_count': usage.c.used_count + 1, 'updated_at': insert.excluded.updated_at},
+        where=usage.c.used_count < limit,
+    ).returning(usage.c.used_count)).scalar()
+    if used is None:
+        db.session.rollback()
         return jsonify({
             'remaining': 0, 'limit': limit, 'reset_at': reset_at,
             'error': 'No daily hints remaining',
         }), 429
-
-    usage.used_count += 1
-    db.session.add(DailyHintReveal(
-        user_id=current_user.id, challenge_id=challenge_id, usage_date=usage_date,
-    ))
-    try:
-        db.session.commit()
-    except IntegrityError:
-        # A concurrent request may have inserted this reveal after our initial
-        # read. The unique idempotency key makes that request a successful reopen.
-        db.session.rollback()
-        reveal = DailyHintReveal.query.filter_by(
-            user_id=current_user.id, challenge_id=challenge_id, usage_date=usage_date,
-        ).first()
-        if reveal:
-            usage = DailyHintUsage.query.filter_by(
-                user_id=current_user.id, usage_date=usage_date,
-            ).first()
-            used = usage.used_count if usage else 0
-            return jsonify({
-                'remaining': max(limit - used, 0), 'limit': limit, 'reset_at': reset_at,
-                'explanation': challenge.to_dict()['explanation'], 'already_revealed': True,
-            })
-        raise
+    user_id, explanation = current_user.id, challenge.to_dict()['explanation']
+    db.session.commit()
+    _remember_hints_used(user_id, usage_date, used)
     return jsonify({
-        'remaining': limit - usage.used_count, 'limit': limit, 'reset_at': reset_at,
-        'explanation': challenge.to_dict()['explanation'], 'already_revealed': False,
+        'remaining': limit - used, 'limit': limit, 'reset_at': reset_at,
+        'explanation': explanation, 'already_revealed': False,
     })
 
 
@@ -1235,7 +1923,7 @@ def complete_challenge(challenge_id):
     match. `xp_award` and any other client-supplied reward amount is ignored
     — XP is computed from the server formula.
     """
-    challenge = DailyChallenge.query.get(challenge_id)
+    challenge = load_challenge(challenge_id)
     if not challenge:
         return jsonify({'error': 'Challenge not found'}), 404
 
@@ -1289,12 +1977,29 @@ def complete_challenge(challenge_id):
     xp_award = base_xp if is_correct else 0
 
     # One reward per challenge: completed challenges are filtered out of the list,
-    # so a visible challenge should pay its own reward exactly once.
-    existing = ChallengeAttempt.query.filter_by(
+    # so a visible challenge should pay its own reward exactly once. The upsert
+    # only touches a missing or unfinished attempt; an already-completed one
+    # returns no row, which also settles two racing submissions.
+    attempts = ChallengeAttempt.__table__
+    insert = _dialect_insert(attempts).values(
         user_id=current_user.id,
         challenge_id=challenge_id,
-    ).first()
-    if existing and existing.completed:
+        challenge_date=today,
+        score=xp_award,
+        completed=True,
+        is_correct=is_correct,
+    )
+    recorded = db.session.execute(insert.on_conflict_do_update(
+        index_elements=[attempts.c.user_id, attempts.c.challenge_id],
+        set_={
+            'challenge_date': insert.excluded.challenge_date,
+            'score': insert.excluded.score,
+            'completed': True,
+            'is_correct': insert.excluded.is_correct,
+        },
+        where=attempts.c.completed.isnot(True),
+    ).returning(attempts.c.id)).first()
+    if recorded is None:
         return jsonify({
             'authenticated': True,
             'xp': current_user.xp,
@@ -1306,32 +2011,20 @@ def complete_challenge(challenge_id):
             'message': 'Challenge already completed.',
         })
 
-    if existing:
-        existing.challenge_date = today
-        existing.score = xp_award
-        existing.completed = True
-        existing.is_correct = is_correct
-    else:
-        attempt = ChallengeAttempt(
-            user_id=current_user.id,
-            challenge_id=challenge_id,
-            challenge_date=today,
-            score=xp_award,
-            completed=True,
-            is_correct=is_correct,
-        )
-        db.session.add(attempt)
-
     if is_correct:
         current_user.xp = (current_user.xp or 0) + xp_award
         current_user.lifetime_points = (current_user.lifetime_points or 0) + xp_award
         _apply_rank_xp(current_user, xp_award)
 
+    _advance_streak(current_user.id, today)
+    _schedule_review(
+        current_user.id, challenge.skill_id or _legacy_metadata(challenge)['skill_id'], is_correct, datetime.utcnow(),
+    )
+
     if is_correct:
-        _record_quest_progress(current_user.id, 'play', 'daily', today)
-        _record_quest_progress(current_user.id, 'correct', 'daily', today)
-        _record_quest_progress(current_user.id, 'play', 'milestone', 'lifetime')
-        _record_quest_progress(current_user.id, 'correct', 'milestone', 'lifetime')
+        _record_quest_progress_many(current_user.id, [
+            ('play', today), ('correct', today), ('play', 'lifetime'), ('correct', 'lifetime'),
+        ])
 
     db.session.commit()
 
@@ -1348,6 +2041,17 @@ def complete_challenge(challenge_id):
     })
 
 
+def _dialect_insert(table):
+    """`INSERT` construct with `on_conflict_*` for the active dialect.
+
+    The app runs on SQLite locally and PostgreSQL in production; both
+    spell the upsert the same way.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
 def _record_quest_progress(user_id, metric, cadence, period_key):
     """Server-side quest progress bookkeeping.
 
@@ -1355,15 +2059,25 @@ def _record_quest_progress(user_id, metric, cadence, period_key):
     updated when the server validates a real challenge attempt or scale
     path result. Claim eligibility still depends on `QuestClaim` rows.
     """
-    row = QuestProgress.query.filter_by(
-        user_id=user_id, metric=metric, period_key=period_key,
-    ).with_for_update().first()
-    if row is None:
-        row = QuestProgress(
-            user_id=user_id, metric=metric, period_key=period_key, count=0,
-        )
-        db.session.add(row)
-    row.count += 1
+    _record_quest_progress_many(user_id, [(metric, period_key)])
+
+
+def _record_quest_progress_many(user_id, entries):
+    """Bump several `(metric, period_key)` counters in one upsert statement.
+
+    Missing rows are inserted at 1 and existing ones incremented in the
+    database, so concurrent answers never read-modify-write a stale count.
+    """
+    progress = QuestProgress.__table__
+    now = datetime.utcnow()
+    insert = _dialect_insert(progress).values([
+        {'user_id': user_id, 'metric': metric, 'period_key': period_key, 'count': 1, 'updated_at': now}
+        for metric, period_key in dict.fromkeys(entries)
+    ])
+    db.session.execute(insert.on_conflict_do_update(
+        index_elements=[progress.c.user_id, progress.c.metric, progress.c.period_key],
+        set_={'count': progress.c.count + 1, 'updated_at': insert.excluded.updated_at},
+    ))
 
 
 def get_user_quest_progress(user_id, metric, cadence):
@@ -1387,7 +2101,7 @@ def get_user_quest_progress(user_id, metric, cadence):
 @login_required
 def seed():
     """(Re)generate the daily challenge question bank."""
-    count = seed_challenges(1000)
+    count = seed_challenges(1000, shadow=True)
     return jsonify({
         'message': f'✅ Seeded {count} daily challenges',
         'count': count,
@@ -1404,16 +2118,11 @@ def get_streak():
             'completed_today': False,
         })
 
-    streak = compute_streak(current_user.id)
-
     today = datetime.utcnow().strftime('%Y-%m-%d')
-    completed_today = ChallengeAttempt.query.filter_by(
-        user_id=current_user.id,
-        challenge_date=today,
-        completed=True,
-    ).first() is not None
+    streak, longest, last_active = streak_state(current_user.id, today)
 
     return jsonify({
         'streak': streak,
-        'completed_today': completed_today,
+        'longest_streak': longest,
+        'completed_today': last_active == today,
     })
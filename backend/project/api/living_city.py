@@ -5,11 +5,11 @@ from flask import Blueprint, jsonify, request
 from flask_login import current_user, login_required
 from sqlalchemy.exc import IntegrityError
 
+from backend.project.api.daily_challenges import load_challenge
 from backend.project.models import db
 from backend.project.models.user import (
     ActivityPlay,
     AnalyticsEvent,
-    DailyChallenge,
     FocusTransaction,
     QuestClaim,
     User,
@@ -234,7 +234,7 @@ def sound_gates_power():
     ).first()
     if not play or play.completed_at:
         return jsonify({'error': 'Power requires an active Sound Gates run.'}), 409
-    challenge = db.session.get(DailyChallenge, challenge_id)
+    challenge = load_challenge(challenge_id)
     if not challenge or challenge.category != 'ear_training':
         return jsonify({'error': 'Ear-training challenge not found.'}), 404
 
@@ -0,0 +1,48 @@
+"""Deferred imports for the heavy optional stacks (LLM, music21, rich).
+
+``lazy_module('music21')`` returns a stand-in that imports the real module on
+first attribute access, so importing the Flask app does not pay for stacks a
+process may never use. ``import_module`` already serializes concurrent first
+imports, so the proxy needs no lock of its own.
+"""
+from __future__ import annotations
+
+import importlib
+import sys
+from types import ModuleType
+
+
+class LazyModule:
+    """Module stand-in that loads ``name`` on first attribute access."""
+
+    def __init__(self, name: str):
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_module', None)
+
+    def _load(self) -> ModuleType:
+        module = self._module
+        if module is None:
+            module = importlib.import_module(self._name)
+            object.__setattr__(self, '_module', module)
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self._name in sys.modules
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._load(), attribute)
+
+    def __setattr__(self, attribute: str, value) -> None:
+        setattr(self._load(), attribute, value)
+
+    def __delattr__(self, attribute: str) -> None:
+        delattr(self._load(), attribute)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f'<lazy module {self._name!r} ({state})>'
+
+
+def lazy_module(name: str) -> LazyModule:
+    return LazyModule(name)
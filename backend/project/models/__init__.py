@@ -6,4 +6,4 @@ bcrypt = Bcrypt()
 
 # Import all model classes so they register with SQLAlchemy before
 # db.create_all() is called in app.py at import time.
-from .user import User, Progression, Favorite, ChallengeAttempt, QuestClaim, DailyHintUsage, DailyHintReveal
+from .user import User, Progression, Favorite, ChallengeAttempt, QuestClaim, DailyHintUsage, DailyHintReveal, UserStreak, SkillReview
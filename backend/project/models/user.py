@@ -1,9 +1,20 @@
+import os
 from datetime import datetime
 
 from ..daily_challenge_explanations import build_daily_challenge_explanation
 from . import db, bcrypt
 
 
+# Virtual Daily challenges (PYMUSIC_DAILY_BANK=virtual, see `VIRTUAL_ID_BASE`
+# in api/daily_challenges.py) are rendered on demand and have no stored row,
+# so only that bank drops the references from attempts and hint reveals.
+VIRTUAL_DAILY_BANK = os.getenv('PYMUSIC_DAILY_BANK', 'stored') == 'virtual'
+
+
+def _daily_challenge_fk():
+    return () if VIRTUAL_DAILY_BANK else (db.ForeignKey('daily_challenges.id'),)
+
+
 class User(db.Model):
     __tablename__ = 'users'
 
@@ -179,6 +190,13 @@ class DailyChallenge(db.Model):
     stimulus_version = db.Column(db.Integer, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Keyset pagination order for GET /api/daily-challenges.
+        db.Index('ix_daily_challenges_difficulty_id', 'difficulty', 'id'),
+        # Review mode: the first open challenge for each due skill.
+        db.Index('ix_daily_challenges_skill_id_id', 'skill_id', 'id'),
+    )
+
     def to_dict(self):
         assert self.options_json is not None  # column is nullable=False; narrow for type checkers
         options = json.loads(self.options_json)
@@ -216,7 +234,7 @@ class ChallengeAttempt(db.Model):
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    challenge_id = db.Column(db.Integer, db.ForeignKey('daily_challenges.id'), nullable=True)
+    challenge_id = db.Column(db.Integer, *_daily_challenge_fk(), nullable=True)
     challenge_date = db.Column(db.String(10), nullable=False)  # YYYY-MM-DD
     score = db.Column(db.Integer, default=0)
     completed = db.Column(db.Boolean, default=False)
@@ -227,9 +245,14 @@ class ChallengeAttempt(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint('user_id', 'challenge_id', name='unique_user_challenge'),
+        # Covers the "not completed by this user" anti-join without a table read.
+        db.Index('ix_challenge_attempts_user_challenge_completed', 'user_id', 'challenge_id', 'completed'),
     )
 
-    challenge = db.relationship('DailyChallenge', backref='attempts', lazy=True)
+    challenge = db.relationship(
+        'DailyChallenge', primaryjoin='foreign(ChallengeAttempt.challenge_id) == DailyChallenge.id',
+        backref='attempts', lazy=True,
+    )
 
     def to_dict(self):
         return {
@@ -243,6 +266,48 @@ class ChallengeAttempt(db.Model):
         }
 
 
+class UserStreak(db.Model):
+    """Materialized daily streak, advanced by each Daily completion.
+
+    `current_streak` is the run of consecutive UTC days ending on
+    `last_active_date`; it only counts as live if that date is today or
+    yesterday. Rebuilt from `challenge_attempts` by `rebuild_streaks`.
+    """
+
+    __tablename__ = 'user_streaks'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    current_streak = db.Column(db.Integer, nullable=False, default=0)
+    longest_streak = db.Column(db.Integer, nullable=False, default=0)
+    last_active_date = db.Column(db.String(10), nullable=True)  # UTC YYYY-MM-DD
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SkillReview(db.Model):
+    """Spaced-repetition state (SM-2) for one user and one Daily `skill_id`.
+
+    Advanced by every Daily completion. `(user_id, due_at)` is indexed so
+    the skills due next are a range scan, however long the history is.
+    """
+
+    __tablename__ = 'skill_reviews'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    skill_id = db.Column(db.String(120), nullable=False)
+    ease = db.Column(db.Float, nullable=False, default=2.5)
+    interval_days = db.Column(db.Integer, nullable=False, default=0)
+    repetitions = db.Column(db.Integer, nullable=False, default=0)
+    lapses = db.Column(db.Integer, nullable=False, default=0)
+    due_at = db.Column(db.DateTime, nullable=False)  # UTC
+    last_reviewed_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'skill_id', name='unique_user_skill_review'),
+        db.Index('ix_skill_reviews_user_due', 'user_id', 'due_at'),
+    )
+
+
 class QuestClaim(db.Model):
     __tablename__ = 'quest_claims'
 
@@ -277,7 +342,7 @@ class DailyHintReveal(db.Model):
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    challenge_id = db.Column(db.Integer, db.ForeignKey('daily_challenges.id'), nullable=False)
+    challenge_id = db.Column(db.Integer, *_daily_challenge_fk(), nullable=False)  # stored or virtual Daily challenge id
     usage_date = db.Column(db.String(10), nullable=False)  # UTC YYYY-MM-DD
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -289,7 +354,10 @@ class DailyHintReveal(db.Model):
 class ScalePathRun(db.Model):
     """Server-owned, seeded Scale Path run. Stores the correct answer list so
     the server can validate the player's selected position instead of trusting
-    the client's `correct` boolean."""
+    the client's `correct` boolean.
+
+    New runs are signed tokens regenerated on completion (see
+    `scale_path_tokens`); rows only back run ids issued before that."""
 
     __tablename__ = 'scale_path_runs'
 
@@ -320,7 +388,8 @@ class ScalePathAttempt(db.Model):
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    run_id = db.Column(db.String(80), db.ForeignKey('scale_path_runs.run_id'), nullable=False)
+    # A signed run id (see `scale_path_tokens`) or a legacy `scale_path_runs` id.
+    run_id = db.Column(db.String(80), nullable=False)
     fragment_index = db.Column(db.Integer, nullable=False)
     correct = db.Column(db.Boolean, nullable=False, default=False)
     xp_awarded = db.Column(db.Integer, nullable=False, default=0)
@@ -331,6 +400,24 @@ class ScalePathAttempt(db.Model):
     )
 
 
+class ScalePathDailyTotal(db.Model):
+    """Per-player, per-day Scale Path totals kept when the retention sweep
+    deletes the attempts they summarize (see `scale_path_retention`)."""
+
+    __tablename__ = 'scale_path_daily_totals'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    day = db.Column(db.String(10), nullable=False)  # YYYY-MM-DD (UTC) of the attempts
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    correct = db.Column(db.Integer, nullable=False, default=0)
+    xp_awarded = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'day', name='unique_user_scale_path_day'),
+    )
+
+
 class QuestProgress(db.Model):
     """Server-tracked quest progress. Daily/wins/perfect values come from
     ChallengeAttempt aggregates; milestone values come from lifetime attempts.
@@ -522,5 +609,32 @@ def run_migrations():
             db.session.commit()
             print(f"✅ Added {column} column to daily_challenges")
 
+    # Scale Path attempts name signed runs, which have no `scale_path_runs`
+    # row. With the virtual Daily bank, attempts and hint reveals name
+    # challenges with no `daily_challenges` row. SQLite does not enforce the
+    # old references (foreign_keys is off); other databases drop them. A
+    # stored bank keeps its references.
+    if db.engine.dialect.name != 'sqlite':
+        dropped_references = [('scale_path_attempts', 'scale_path_runs')]
+        if VIRTUAL_DAILY_BANK:
+            dropped_references += [
+                ('challenge_attempts', 'daily_challenges'),
+                ('daily_hint_reveals', 'daily_challenges'),
+            ]
+        for table, referred_table in dropped_references:
+            for foreign_key in inspector.get_foreign_keys(table):
+                if foreign_key['referred_table'] == referred_table and foreign_key.get('name'):
+                    db.session.execute(sa.text(f'ALTER TABLE {table} DROP CONSTRAINT {foreign_key["name"]}'))
+                    db.session.commit()
+                    print(f"✅ Dropped {foreign_key['name']} from {table}")
+
+    for index, table, columns in (
+        ('ix_daily_challenges_difficulty_id', 'daily_challenges', 'difficulty, id'),
+        ('ix_challenge_attempts_user_challenge_completed', 'challenge_attempts', 'user_id, challenge_id, completed'),
+        ('ix_daily_challenges_skill_id_id', 'daily_challenges', 'skill_id, id'),
+    ):
+        db.session.execute(sa.text(f'CREATE INDEX IF NOT EXISTS {index} ON {table} ({columns})'))
+    db.session.commit()
+
 
 import json  # noqa: E402 — must be after DailyChallenge to_dict
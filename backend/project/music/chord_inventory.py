@@ -6,6 +6,8 @@ import json
 import random
 from pathlib import Path
 
+from backend.project.music import pitchset
+
 _INVENTORY_PATH = Path(__file__).with_name('chord_inventory.json')
 with _INVENTORY_PATH.open(encoding='utf-8') as inventory_file:
     _INVENTORY = json.load(inventory_file)
@@ -50,8 +52,12 @@ def build_chord_definition(root, quality, *, inversion=0):
     }
 
 
+def _above(root, semitones):
+    return PITCH_CLASSES[(pitchset.PITCH_CLASS_OF[root] + semitones) % 12]
+
+
 def _relative_minor(root):
-    return PITCH_CLASSES[(PITCH_CLASSES.index(root) + 9) % 12]
+    return _above(root, 9)
 
 
 def build_chord_pair_challenge(seed, difficulty=1):
@@ -85,13 +91,13 @@ def build_chord_pair_challenge(seed, difficulty=1):
     elif relationship == 'different-root-same-quality':
         distance = 2 if difficulty >= 4 else 5
         first = build_chord_definition(root, 'major')
-        second = build_chord_definition(PITCH_CLASSES[(PITCH_CLASSES.index(root) + distance) % 12], 'major')
+        second = build_chord_definition(_above(root, distance), 'major')
     elif relationship == 'relative-major-minor':
         first = build_chord_definition(root, 'major')
         second = build_chord_definition(_relative_minor(root), 'minor')
     elif relationship == 'diatonic-function':
         first = build_chord_definition(root, 'major')
-        second_root = PITCH_CLASSES[(PITCH_CLASSES.index(root) + 5) % 12]
+        second_root = _above(root, 5)
         second = build_chord_definition(second_root, 'major')
     elif relationship == 'inversion':
         quality = 'major7' if difficulty >= 6 else 'major'
@@ -102,7 +108,7 @@ def build_chord_pair_challenge(seed, difficulty=1):
         if difficulty >= 5:
             qualities += ['sus2', 'sus4', 'dominant7', 'major7', 'minor7']
         first = build_chord_definition(root, rng.choice(qualities))
-        second_root = PITCH_CLASSES[(PITCH_CLASSES.index(root) + rng.choice([2, 3, 5, 7, 9])) % 12]
+        second_root = _above(root, rng.choice([2, 3, 5, 7, 9]))
         second = build_chord_definition(second_root, rng.choice(qualities))
 
     return {
@@ -120,7 +126,7 @@ def _tone_name(root_index, semitone_offset, octave):
 
 
 def build_scheduled_note_events(chord, octave=3, timing_scale=1):
-    root_index = PITCH_CLASSES.index(chord['root'])
+    root_index = pitchset.PITCH_CLASS_OF[chord['root']]
     return [
         {
             'note': _tone_name(root_index, interval, octave),
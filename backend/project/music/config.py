@@ -7,3 +7,7 @@ Central configuration file for music-related constants used across the applicati
 MAX_FRETS = 24  # Maximum number of frets on the guitar fretboard
 DEFAULT_FRET_COUNT = 13  # Default number of frets to display initially
 MIN_FRET_COUNT = 5  # Minimum number of frets that can be displayed
+
+# Key spellings offered by /api/keys and precomputed by the scale catalog
+SCALE_KEYS = ('C', 'C#', 'Db', 'D', 'D#', 'Eb', 'E', 'F', 'F#', 'Gb', 'G', 'G#', 'Ab', 'A', 'A#', 'Bb', 'B')
+SCALE_OCTAVES = (1, 2, 3, 4)  # octave values accepted by /api/scale/<key>
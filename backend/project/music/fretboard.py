@@ -0,0 +1,178 @@
+"""Fretboard position index.
+
+The pitch class under every ``(string, fret)`` depends only on the tuning,
+so it is tabulated once per tuning up to ``MAX_FRETS``. Scale routes are
+filters over that table keyed by ``(tuning, scale mask, fret count)`` and
+are cached, so a Scale Path run looks its route up instead of walking the
+neck. Like the ``pitchset`` tables, everything returned here is shared
+between request threads and must be treated as read-only.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+
+from backend.project.music import pitchset
+from backend.project.music.config import MAX_FRETS
+
+# Low E -> high E, the string order of the shared frontend instrument.
+STANDARD_TUNING = ('E', 'A', 'D', 'G', 'B', 'E')
+# 12 diatonic masks x a handful of fret counts per tuning is the whole
+# working set; the bound only matters for callers passing arbitrary masks.
+ROUTE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=None)
+def pitch_class_grid(tuning: tuple[str, ...]) -> tuple[tuple[int, ...], ...]:
+    """Pitch class at ``[string_index][fret]`` for frets 0..MAX_FRETS."""
+    return tuple(
+        tuple((pitchset.PITCH_CLASS_OF[string_note] + fret) % 12 for fret in range(MAX_FRETS + 1))
+        for string_note in tuning
+    )
+
+
+@lru_cache(maxsize=None)
+def positions_by_pitch(tuning: tuple[str, ...]) -> tuple[tuple[tuple[int, int], ...], ...]:
+    """``(string_index, fret)`` pairs for each pitch class, in string then fret order."""
+    found = [[] for _ in range(12)]
+    for string_index, row in enumerate(pitch_class_grid(tuning)):
+        for fret, pc in enumerate(row):
+            found[pc].append((string_index, fret))
+    return tuple(tuple(positions) for positions in found)
+
+
+@lru_cache(maxsize=None)
+def _position_table(tuning: tuple[str, ...]) -> tuple[tuple[dict, ...], ...]:
+    return tuple(
+        tuple(
+            {
+                'string': string_note,
+                'fret': fret,
+                'note': pitchset.SHARP_NAMES[pc],
+                'stringIndex': string_index,
+                'pitch': pc,
+            }
+            for fret, pc in enumerate(row)
+        )
+        for string_index, (string_note, row) in enumerate(zip(tuning, pitch_class_grid(tuning)))
+    )
+
+
+@lru_cache(maxsize=ROUTE_CACHE_SIZE)
+def scale_route(tuning: tuple[str, ...], scale_mask: int, fret_count: int) -> tuple[dict, ...]:
+    """Every in-scale position up to ``fret_count``, in string then fret order.
+
+    Frets stop at ``MAX_FRETS``.
+    """
+    return tuple(
+        position
+        for row in _position_table(tuning)
+        for position in row[:fret_count + 1]
+        if scale_mask >> position['pitch'] & 1
+    )
+
+
+# MIDI numbers of the open strings in STANDARD_TUNING order.
+STANDARD_OPEN_MIDI = (40, 45, 50, 55, 59, 64)
+
+
+class RouteNeighbours:
+    """Nearest-position queries over one route, bucketed by string and fret.
+
+    Routes are ``STANDARD_TUNING`` routes with one position per
+    ``(stringIndex, fret)``, as ``scale_route`` builds them.
+
+    Distance is ``|fret - anchor fret| + 2 * |string - anchor string|``, with
+    ties broken by string then fret. ``nearest`` walks outwards from the
+    anchor one distance ring at a time, so it visits positions in exactly
+    that order and stops after ``k`` hits instead of filtering and sorting
+    the whole route. Visited positions are dropped with ``visit`` as a run
+    moves along; unlike the shared route tables, an instance belongs to one
+    run.
+    """
+
+    def __init__(self, positions, visited=()):
+        self.positions = [position for position in positions if 0 <= position['fret'] <= MAX_FRETS]
+        self._order = {}
+        self._at = [[None] * (MAX_FRETS + 1) for _ in STANDARD_TUNING]
+        for order, position in enumerate(self.positions):
+            self._order[position['stringIndex'], position['fret']] = order
+            self._at[position['stringIndex']][position['fret']] = position
+        self._visited = set()
+        self._open = list(self.positions)
+        for position in visited:
+            self.visit(position)
+
+    def visit(self, position):
+        key = (position['stringIndex'], position['fret'])
+        if key in self._visited:
+            return
+        self._visited.add(key)
+        if key in self._order:
+            self._open.remove(self._at[key[0]][key[1]])
+
+    def playable(self, anchor=None):
+        """Unvisited positions in route order, plus ``anchor`` if it is a visited route position."""
+        if anchor is None:
+            return self._open
+        key = (anchor['stringIndex'], anchor['fret'])
+        if key not in self._visited or key not in self._order or self._at[key[0]][key[1]] != anchor:
+            return self._open
+        order = self._order[key]
+        at = next(
+            (index for index, position in enumerate(self._open)
+             if self._order[position['stringIndex'], position['fret']] > order),
+            len(self._open),
+        )
+        return self._open[:at] + [self._at[key[0]][key[1]]] + self._open[at:]
+
+    def nearest(self, anchor, k, route_modifier=None):
+        """Up to ``k`` unvisited positions other than ``anchor``, closest first.
+
+        ``route_modifier`` narrows the candidates the way a Scale Path move
+        does (same string, other strings, higher, lower, same pitch); any
+        other value, or ``None``, keeps them all.
+        """
+        anchor_string, anchor_fret = anchor['stringIndex'], anchor['fret']
+        offsets = _SAME_STRING_OFFSETS if route_modifier == 'same-string' else (
+            _OTHER_STRING_OFFSETS if route_modifier == 'alternate-strings' else _NEIGHBOUR_OFFSETS)
+        if route_modifier == 'ascending':
+            lowest, highest = STANDARD_OPEN_MIDI[anchor_string] + anchor_fret + 1, None
+        elif route_modifier == 'descending':
+            lowest, highest = None, STANDARD_OPEN_MIDI[anchor_string] + anchor_fret - 1
+        else:
+            lowest = highest = None
+        pitch = anchor['pitch'] if route_modifier == 'octave-target' else None
+
+        found = []
+        at, open_midi, visited = self._at, STANDARD_OPEN_MIDI, self._visited
+        string_count = len(at)
+        for string_step, fret_step in offsets:
+            string, fret = anchor_string + string_step, anchor_fret + fret_step
+            if not (0 <= string < string_count and 0 <= fret <= MAX_FRETS):
+                continue
+            position = at[string][fret]
+            if position is None or position == anchor or (string, fret) in visited:
+                continue
+            if pitch is not None and position['pitch'] != pitch:
+                continue
+            if lowest is not None and open_midi[string] + fret < lowest:
+                continue
+            if highest is not None and open_midi[string] + fret > highest:
+                continue
+            found.append(position)
+            if len(found) == k:
+                break
+        return found
+
+
+# Every (string step, fret step) in nearest-first order. Ties go to the
+# lower string, then the lower fret, which for a fixed anchor is the
+# lower step, so one table serves every anchor.
+_NEIGHBOUR_OFFSETS = tuple(sorted(
+    ((string_step, fret_step)
+     for string_step in range(1 - len(STANDARD_TUNING), len(STANDARD_TUNING))
+     for fret_step in range(-MAX_FRETS, MAX_FRETS + 1)),
+    key=lambda step: (abs(step[1]) + 2 * abs(step[0]), step[0], step[1]),
+))
+_SAME_STRING_OFFSETS = tuple(step for step in _NEIGHBOUR_OFFSETS if step[0] == 0)
+_OTHER_STRING_OFFSETS = tuple(step for step in _NEIGHBOUR_OFFSETS if step[0] != 0)
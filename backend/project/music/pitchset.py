@@ -0,0 +1,121 @@
+"""Pitch-class sets as 12-bit masks.
+
+Bit ``n`` of a mask is set when pitch class ``n`` (C=0 … B=11) is present, so
+scales, chords and Scale Lab selections share one representation.
+Transposition is a table-driven bit rotation, membership is a shift and a
+mask, and set comparisons are ``&``/``|`` plus a popcount lookup. Every table
+is built once at import and is read-only afterwards, so request threads can
+share them freely.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+SHARP_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+FLAT_NAMES = ('C', 'Db', 'D', 'Eb', 'E', 'F', 'Gb', 'G', 'Ab', 'A', 'Bb', 'B')
+# Spelling tables indexed by ``flats``: SPELLINGS[False] is the sharp circle.
+SPELLINGS = (SHARP_NAMES, FLAT_NAMES)
+
+# Exact sharp and flat spellings; callers that accept user input normalise first.
+PITCH_CLASS_OF = {name: pc for names in SPELLINGS for pc, name in enumerate(names)}
+
+FULL = 0xFFF
+_MASKS = tuple(range(FULL + 1))
+POPCOUNT = tuple(mask.bit_count() for mask in _MASKS)
+MEMBERS = tuple(tuple(pc for pc in range(12) if mask >> pc & 1) for mask in _MASKS)
+# _ROTATE[n][mask] transposes ``mask`` up by ``n`` semitones.
+_ROTATE = tuple(
+    tuple(_MASKS[((mask << n) | (mask >> (12 - n))) & FULL] for mask in _MASKS)
+    for n in range(12)
+)
+# _ADD[root][offset] is the pitch class ``offset`` semitones above ``root``.
+_ADD = tuple(tuple((root + offset) % 12 for offset in range(12)) for root in range(12))
+
+SCALE_INTERVALS = {
+    'major': (0, 2, 4, 5, 7, 9, 11),
+    'minor': (0, 2, 3, 5, 7, 8, 10),
+    'harmonic_minor': (0, 2, 3, 5, 7, 8, 11),
+    'melodic_minor': (0, 2, 3, 5, 7, 9, 11),
+    'pentatonic_major': (0, 2, 4, 7, 9),
+    'pentatonic_minor': (0, 3, 5, 7, 10),
+    'chromatic': tuple(range(12)),
+    'whole_tone': (0, 2, 4, 6, 8, 10),
+    'ionian': (0, 2, 4, 5, 7, 9, 11),
+    'dorian': (0, 2, 3, 5, 7, 9, 10),
+    'phrygian': (0, 1, 3, 5, 7, 8, 10),
+    'lydian': (0, 2, 4, 6, 7, 9, 11),
+    'mixolydian': (0, 2, 4, 5, 7, 9, 10),
+    'aeolian': (0, 2, 3, 5, 7, 8, 10),
+    'locrian': (0, 1, 3, 5, 6, 8, 10),
+}
+MODES = ('ionian', 'dorian', 'phrygian', 'lydian', 'mixolydian', 'aeolian', 'locrian')
+
+
+def mask_of(pitch_classes: Iterable[int]) -> int:
+    """Mask with a bit set for every pitch class (taken modulo 12)."""
+    mask = 0
+    for pc in pitch_classes:
+        mask |= 1 << (pc % 12)
+    return mask
+
+
+SCALE_MASKS = {name: mask_of(steps) for name, steps in SCALE_INTERVALS.items()}
+# SCALE_ROTATIONS[name][root] is the scale built on ``root``.
+SCALE_ROTATIONS = {
+    name: tuple(_ROTATE[root][mask] for root in range(12))
+    for name, mask in SCALE_MASKS.items()
+}
+
+
+def pitch_class(name: str, default: int | None = None) -> int | None:
+    """Pitch class for a sharp or flat spelling, or ``default`` when unknown."""
+    return PITCH_CLASS_OF.get(name, default)
+
+
+def transpose(mask: int, semitones: int) -> int:
+    return _ROTATE[semitones % 12][mask]
+
+
+def contains(mask: int, pc: int) -> bool:
+    return bool(mask >> pc & 1)
+
+
+def members(mask: int) -> tuple[int, ...]:
+    """Pitch classes in ``mask`` in ascending order."""
+    return MEMBERS[mask]
+
+
+def scale_pitch_classes(root: int, intervals: Iterable[int]) -> list[int]:
+    """Pitch classes of ``intervals`` above ``root``, in interval order."""
+    row = _ADD[root]
+    return [row[offset % 12] for offset in intervals]
+
+
+def spell(root: int, intervals: Iterable[int], flats: bool = False) -> list[str]:
+    """Note names of ``intervals`` above ``root`` from the sharp or flat table."""
+    names = SPELLINGS[flats]
+    row = _ADD[root]
+    return [names[row[offset % 12]] for offset in intervals]
+
+
+def compare(selected: int, target: int) -> tuple[int, int, int]:
+    """``(matches, missing, extra)`` masks of ``selected`` against ``target``."""
+    return selected & target, target & ~selected, selected & ~target
+
+
+def interval_vector(mask: int) -> tuple[int, ...]:
+    """Interval-class vector: how many pairs lie 1 … 6 semitones apart."""
+    vector = [POPCOUNT[mask & _ROTATE[n][mask]] for n in range(1, 7)]
+    # A tritone rotation meets every pair from both ends.
+    vector[5] //= 2
+    return tuple(vector)
+
+
+def find_scales(selected: int, families: Iterable[str] = MODES) -> list[tuple[int, str]]:
+    """Every ``(root, family)`` whose scale contains all of ``selected``."""
+    return [
+        (root, family)
+        for family in families
+        for root, scale in enumerate(SCALE_ROTATIONS[family])
+        if not selected & ~scale
+    ]
@@ -0,0 +1,96 @@
+"""Precomputed, immutable responses for ``/api/scale/<key>``.
+
+A scale analysis is fully determined by ``(key, interval_type, octaves)`` and
+that space is small: 17 key spellings x 7 modes x 4 octave values. Each
+response is therefore computed once, frozen, serialized once and served as a
+dictionary lookup with a strong ETag instead of being rebuilt per request.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping
+
+from backend.project.music.config import SCALE_KEYS, SCALE_OCTAVES
+
+ScaleAnalysisBuilder = Callable[[str, str, int], dict]
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def serialize_payload(payload: dict) -> bytes:
+    """Serialize exactly like Flask's default ``jsonify`` outside debug mode."""
+    return json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    payload: Mapping[str, Any]
+    body: bytes
+    etag: str
+
+
+class ScaleAnalysisCatalog:
+    """Thread-safe, lazily filled table of frozen scale-analysis responses.
+
+    Only the known key spellings, the given interval types and the accepted
+    octave values are stored, so arbitrary path input cannot grow the table.
+    Anything outside that space is still answered, just not retained.
+    """
+
+    def __init__(self, build: ScaleAnalysisBuilder, interval_types: Iterable[str],
+                 keys: Iterable[str] = SCALE_KEYS, octaves: Iterable[int] = SCALE_OCTAVES):
+        self._build = build
+        self._keys = tuple(dict.fromkeys(key.upper() for key in keys))
+        self._interval_types = tuple(interval_types)
+        self._octaves = tuple(octaves)
+        self._entries: dict[tuple[str, str, int], CatalogEntry] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def covers(self, key: str, interval_type: str, octaves: int) -> bool:
+        return (key.upper() in self._keys
+                and interval_type in self._interval_types
+                and octaves in self._octaves)
+
+    def get(self, key: str, interval_type: str, octaves: int) -> CatalogEntry:
+        cache_key = (key.upper(), interval_type, octaves)
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            return entry
+        if not self.covers(*cache_key):
+            return self._make_entry(*cache_key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                entry = self._make_entry(*cache_key)
+                self._entries[cache_key] = entry
+        return entry
+
+    def warm(self) -> int:
+        """Build every entry up front; returns the number of stored entries."""
+        for key in self._keys:
+            for interval_type in self._interval_types:
+                for octaves in self._octaves:
+                    self.get(key, interval_type, octaves)
+        return len(self._entries)
+
+    def _make_entry(self, key: str, interval_type: str, octaves: int) -> CatalogEntry:
+        payload = self._build(key, interval_type, octaves)
+        body = serialize_payload(payload)
+        return CatalogEntry(
+            payload=_freeze(payload),
+            body=body,
+            etag=hashlib.sha256(body).hexdigest()[:32],
+        )
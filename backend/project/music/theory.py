@@ -0,0 +1,264 @@
+"""Stateless music theory core.
+
+Every function here is pure: it takes a key and a mode and returns new
+values, so request threads can share it without locks or per-request
+objects. ``Music`` is a thin stateful wrapper over these functions for the
+CLI and the LLM-backed teachers.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from backend.project.music import fretboard, pitchset
+from backend.project.music.chords.intervals.Aeolian import AeolianInterval
+from backend.project.music.chords.intervals.Dorian import DorianInterval
+from backend.project.music.chords.intervals.Interval import Interval
+from backend.project.music.chords.intervals.Ionian import IonianInterval
+from backend.project.music.chords.intervals.Locrian import LocrianInterval
+from backend.project.music.chords.intervals.Lydian import LydianInterval
+from backend.project.music.chords.intervals.Major import MajorInterval
+from backend.project.music.chords.intervals.Minor import MinorInterval
+from backend.project.music.chords.intervals.Mixolydian import MixolydianInterval
+from backend.project.music.chords.intervals.Phrygian import PhrygianInterval
+
+CHROMATIC_SHARP = pitchset.SHARP_NAMES
+CHROMATIC_FLAT = pitchset.FLAT_NAMES
+# Roots spelled from the flat circle (E, B and A included for the legacy spelling)
+FLAT_KEYS = frozenset({'F', 'Bb', 'Eb', 'Ab', 'Db', 'Gb', 'E', 'B', 'A'})
+_FLAT_TO_SHARP = {'Bb': 'A#', 'Db': 'C#', 'Eb': 'D#', 'Gb': 'F#', 'Ab': 'G#'}
+
+# Interval objects are never mutated after construction, so one shared
+# instance per interval type is safe across threads.
+INTERVAL_TYPES: dict[str, Interval] = {
+    'major': MajorInterval(),
+    'minor': MinorInterval(),
+    'ionian': IonianInterval(),
+    'dorian': DorianInterval(),
+    'phrygian': PhrygianInterval(),
+    'lydian': LydianInterval(),
+    'mixolydian': MixolydianInterval(),
+    'aeolian': AeolianInterval(),
+    'locrian': LocrianInterval(),
+}
+DEFAULT_SEMITONES = (0, 2, 4, 5, 7, 9, 11)
+DEFAULT_CHORD_SUFFIXES = ('', 'm', 'm', '', '', 'm', 'dim')
+
+
+def get_roman_numeral(degree, interval_type):
+    """Get Roman numeral based on degree and interval type"""
+    if interval_type == 'major':
+        roman_numerals = ["I", "ii", "iii", "IV", "V", "vi", "vii°"]
+    else:  # minor
+        roman_numerals = ["i", "ii°", "III", "iv", "v", "VI", "VII"]
+
+    return roman_numerals[degree] if degree < len(roman_numerals) else str(degree + 1)
+
+
+def get_function_name(degree):
+    """Get function name for scale degree"""
+    functions = ["Tonic", "Supertonic", "Mediant", "Subdominant",
+                 "Dominant", "Submediant", "Leading Tone"]
+    return functions[degree] if degree < len(functions) else "Extended"
+
+
+# Guitar strings from 1st (high E) to 6th (low E) - CORRECT visual order for display
+_FRETBOARD_STRINGS = fretboard.STANDARD_TUNING[::-1]
+_FRETBOARD_PITCH_CLASSES = fretboard.pitch_class_grid(fretboard.STANDARD_TUNING)[::-1]
+
+
+def generate_fretboard_data(notes, root_note):
+    """Generate fretboard data for React component"""
+    # Frets are labelled from the sharp circle, so only sharp-spelled scale
+    # notes light up, exactly as the name comparison always behaved.
+    scale_mask = pitchset.mask_of(
+        pitchset.PITCH_CLASS_OF[note] for note in notes if note in CHROMATIC_SHARP
+    )
+    root_pc = pitchset.PITCH_CLASS_OF[root_note] if root_note in CHROMATIC_SHARP else -1
+
+    return [
+        {
+            "string": string_note,
+            "frets": [
+                {
+                    "fret": fret,
+                    "note": CHROMATIC_SHARP[pc],
+                    "is_scale_note": bool(scale_mask >> pc & 1),
+                    "is_root": pc == root_pc
+                }
+                for fret, pc in enumerate(pitch_classes)
+            ]
+        }
+        for string_note, pitch_classes in zip(_FRETBOARD_STRINGS, _FRETBOARD_PITCH_CLASSES)
+    ]
+
+
+def resolve_interval(interval_type: str | None) -> Interval:
+    """Interval object for a type name; unknown names fall back to major."""
+    return INTERVAL_TYPES.get(interval_type or 'major', INTERVAL_TYPES['major'])
+
+
+def scale_notes(tune: str | None, interval: Interval) -> list[str]:
+    """Compute scale notes from the interval's semitone pattern, starting from tune."""
+    root = (tune or '').strip()
+    root_pc = pitchset.pitch_class(root)
+    # Unknown roots fall back to C, spelled from the flat circle as before.
+    flats = root_pc is None or root in FLAT_KEYS
+    semitones = getattr(interval, 'interval_semitones', DEFAULT_SEMITONES)
+    return pitchset.spell(root_pc or 0, semitones, flats)
+
+
+def diatonic_chords(notes: list[str], interval: Interval) -> list[str]:
+    """Build chords from the interval object's chord-quality array."""
+    suffixes = getattr(interval, 'interval', DEFAULT_CHORD_SUFFIXES)
+    return [notes[i] + suffixes[i] for i in range(min(len(notes), len(suffixes)))]
+
+
+def borrowed_chords(notes: list[str]) -> list[str]:
+    """Simple borrowed chords: minor on I, IV and V, major elsewhere."""
+    return [note + "m" if i in [0, 3, 4] else note + "" for i, note in enumerate(notes)]
+
+
+def dominant_seventh_of(target: str) -> str:
+    """The dominant 7th chord that resolves to the root of ``target``."""
+    # Clean the note (remove chord suffixes like 'm', 'dim')
+    clean_note = target
+    if len(target) > 1:
+        clean_note = target[:2] if target[1] in ['#', 'b'] else target[0]
+    clean_note = _FLAT_TO_SHARP.get(clean_note, clean_note)
+
+    if clean_note in CHROMATIC_SHARP:
+        # Go back 7 semitones (perfect fifth down) to find the dominant
+        return f"{pitchset.spell(pitchset.PITCH_CLASS_OF[clean_note], (-7,))[0]}7"
+    return f"{clean_note}7"
+
+
+def secondary_dominants(notes: list[str], chords: list[str]) -> list[dict]:
+    """Secondary dominants (V7/x) for every scale degree, using the scale's own notes."""
+    if not chords or not notes:
+        raise ValueError("Please generate chords first using getChords()")
+
+    sevenths_and_targets = []
+    for i, chord in enumerate(chords):
+        # vii° resolves to V; every other degree counts 3 steps back in the scale
+        dominant_index = 4 if i == 6 else (i - 3 + 7) % 7
+        sevenths_and_targets.append({
+            "seventh": f"{notes[dominant_index]}7",
+            "resolves_to": chord,
+        })
+    return sevenths_and_targets
+
+
+def chord_progressions(chords: list[str]) -> dict[str, list[str]]:
+    """Common chord progressions over a diatonic chord list."""
+    if not chords:
+        raise ValueError("Please generate chords first using getChords()")
+
+    return {
+        "I-V-vi-IV": [chords[0], chords[4], chords[5], chords[3]],
+        "vi-IV-I-V": [chords[5], chords[3], chords[0], chords[4]],
+        "I-vi-ii-V": [chords[0], chords[5], chords[1], chords[4]],
+        "I-IV-vi-V": [chords[0], chords[3], chords[5], chords[4]],
+        "ii-V-I": [chords[1], chords[4], chords[0]],
+    }
+
+
+def piano_keyboard_data(root: str, notes: list[str], octaves: int = 1) -> dict:
+    """Compute stable C-to-C piano keyboard data for any key/scale.
+
+    Returns:
+        natural_keys: C-based natural keys with inclusive octave endpoint,
+                       length = 7 * octaves + 1.
+        black_keys:   list of black-key descriptors with `note` (chromatic name
+                       at that position) and `after_natural` (index of the natural
+                       it sits after). No black keys between E-F or B-C.
+        scale_notes:  all notes in the scale (kept for consumer use)
+        root_note:    the root note (verbatim, including sharps)
+    """
+    naturals = ['C', 'D', 'E', 'F', 'G', 'A', 'B']
+    naturals_with_black_after = {'C', 'D', 'F', 'G', 'A'}
+
+    # The physical piano surface is always C-based. One octave is C→C,
+    # not C→B. Extra octaves reuse the boundary C and continue onward:
+    # 1 octave = 8 naturals, 2 = 15, 3 = 22.
+    natural_count = max(1, octaves) * 7 + 1
+    natural_keys = [naturals[i % 7] for i in range(natural_count)]
+
+    black_keys = []
+    for nat_index_abs, natural in enumerate(natural_keys[:-1]):
+        if natural not in naturals_with_black_after:
+            continue
+        black_keys.append({
+            'note': pitchset.spell(pitchset.PITCH_CLASS_OF[natural], (1,))[0],
+            'after_natural': nat_index_abs
+        })
+
+    return {
+        "natural_keys": natural_keys,
+        "black_keys": black_keys,
+        "scale_notes": notes,
+        "root_note": root
+    }
+
+
+@dataclass(frozen=True)
+class ScaleAnalysis:
+    """Immutable result of :func:`analyze`; ``to_dict`` is the API payload."""
+    key: str
+    interval_type: str
+    octaves: int
+    notes: tuple[str, ...]
+    chords: tuple[str, ...]
+
+    @property
+    def borrowed_chords(self) -> list[str]:
+        return borrowed_chords(list(self.notes))
+
+    @property
+    def secondary_dominants(self) -> list[dict]:
+        return secondary_dominants(list(self.notes), list(self.chords))
+
+    @property
+    def progressions(self) -> dict[str, list[str]]:
+        return chord_progressions(list(self.chords))
+
+    def to_dict(self) -> dict:
+        notes = list(self.notes)
+        chords = list(self.chords)
+        sevenths_data = self.secondary_dominants
+        return {
+            "key": self.key,
+            "interval_type": self.interval_type,
+            "scale_name": f"{self.key} {self.interval_type.title()} Scale",
+            "notes": notes,
+            "chords": chords,
+            "borrowed_chords": self.borrowed_chords,
+            "secondary_dominants": sevenths_data,
+            "chord_sevenths": sevenths_data,
+            "progressions": self.progressions,
+            "scale_degrees": [
+                {
+                    "degree": i + 1,
+                    "roman": get_roman_numeral(i, self.interval_type),
+                    "note": notes[i] if i < len(notes) else "",
+                    "chord": chords[i] if i < len(chords) else "",
+                    "function": get_function_name(i)
+                }
+                for i in range(len(notes))
+            ],
+            "keyboard_data": piano_keyboard_data(self.key, notes, octaves=self.octaves),
+            "fretboard_data": generate_fretboard_data(notes, self.key),
+        }
+
+
+def analyze(key: str, interval_type: str = 'major', octaves: int = 1) -> ScaleAnalysis:
+    """Analyze the scale built on ``key`` in the given mode."""
+    tune = key.upper()
+    interval = resolve_interval(interval_type)
+    notes = scale_notes(tune, interval)
+    return ScaleAnalysis(
+        key=tune,
+        interval_type=interval_type,
+        octaves=octaves,
+        notes=tuple(notes),
+        chords=tuple(diatonic_chords(notes, interval)),
+    )
@@ -3,20 +3,40 @@
 The browser sends pitch classes only. This module owns scale spelling, mode
 classification, interval formulas, and candidate ranking so the result is not
 client-authored or duplicated in UI code.
+
+music21 derives the spellings and interval names once, offline, into
+``scale_match_index.json`` (regenerate it with
+``python -m backend.project.scripts.build_scale_match_index``). A verify then
+scores the selection against the 84 indexed candidates with bitmasks; music21
+is only imported for tonic spellings the index does not cover. Tonic lookups
+and music21 spellings sit behind LRU caches bounded by
+``PYMUSIC_SCALE_ANALYSIS_CACHE_SIZE``; ``cache_metrics`` reports their hit
+rates.
 """
 from __future__ import annotations
 
-from music21 import interval, note, scale
+import heapq
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from backend.project.lazy import lazy_module
+from backend.project.music import pitchset
+
+_interval = lazy_module('music21.interval')
+_note = lazy_module('music21.note')
+_scale = lazy_module('music21.scale')
 
 NOTE_NAMES = ['C', 'C#', 'D', 'E-', 'E', 'F', 'F#', 'G', 'A-', 'A', 'B-', 'B']
 MODE_CLASSES = {
-    'ionian': scale.MajorScale,
-    'dorian': scale.DorianScale,
-    'phrygian': scale.PhrygianScale,
-    'lydian': scale.LydianScale,
-    'mixolydian': scale.MixolydianScale,
-    'aeolian': scale.MinorScale,
-    'locrian': scale.LocrianScale,
+    'ionian': 'MajorScale',
+    'dorian': 'DorianScale',
+    'phrygian': 'PhrygianScale',
+    'lydian': 'LydianScale',
+    'mixolydian': 'MixolydianScale',
+    'aeolian': 'MinorScale',
+    'locrian': 'LocrianScale',
 }
 MODE_LABELS = {
     'ionian': 'Ionian (Major)', 'dorian': 'Dorian', 'phrygian': 'Phrygian',
@@ -36,6 +56,17 @@ CHARACTERISTIC_DEGREES = {
     'ionian': '7', 'dorian': '6', 'phrygian': 'b2', 'lydian': '#4',
     'mixolydian': 'b7', 'aeolian': 'b6', 'locrian': 'b5',
 }
+# Tonic spellings indexed offline: every step with up to two sharps or flats,
+# written the way ``_music21_name`` hands them to music21.
+INDEXED_TONICS = tuple(
+    step + accidental
+    for step in 'CDEFGAB'
+    for accidental in ('', '#', '##', '-', '--', 'B')
+)
+
+_INDEX_PATH = Path(__file__).with_name('scale_match_index.json')
+# Roots arrive from request bodies, so the caches must stay bounded.
+SCALE_ANALYSIS_CACHE_SIZE = int(os.getenv('PYMUSIC_SCALE_ANALYSIS_CACHE_SIZE', '256'))
 
 
 def _music21_name(name: str) -> str:
@@ -44,62 +75,231 @@ def _music21_name(name: str) -> str:
     return aliases.get(normalized, normalized)
 
 
-def _pitch_classes(root_name: str, mode_key: str) -> tuple[list[int], list[str]]:
-    tonic = note.Note(_music21_name(root_name))
+@lru_cache(maxsize=SCALE_ANALYSIS_CACHE_SIZE)
+def _pitch_classes(root_name: str, mode_key: str) -> tuple[tuple[int, ...], tuple[str, ...]]:
+    tonic = _note.Note(_music21_name(root_name))
     tonic.octave = 3
-    scale_object = MODE_CLASSES[mode_key](tonic)
+    scale_object = getattr(_scale, MODE_CLASSES[mode_key])(tonic)
     pitches = scale_object.getPitches(f'{tonic.name}3', f'{tonic.name}4')[:-1]
-    return [pitch.pitchClass for pitch in pitches], [pitch.name.replace('-', 'b') for pitch in pitches]
+    return tuple(pitch.pitchClass for pitch in pitches), tuple(pitch.name.replace('-', 'b') for pitch in pitches)
+
+
+def _tonic_analysis(tonic_name: str) -> tuple[int, list[str]]:
+    """Pitch class of a music21 tonic name and its interval to every pitch class."""
+    tonic = _note.Note(tonic_name)
+    return tonic.pitch.pitchClass, [
+        _interval.Interval(tonic, _note.Note(NOTE_NAMES[pitch_class])).simpleName
+        for pitch_class in range(12)
+    ]
+
+
+def build_match_index() -> dict:
+    """Derive the candidate and tonic tables with music21 (the offline step)."""
+    tonics = {}
+    for name in INDEXED_TONICS:
+        try:
+            pitch_class, intervals = _tonic_analysis(name)
+        except Exception:
+            continue  # not a spelling music21 accepts; verify keeps rejecting it
+        tonics[name] = {'pitchClass': pitch_class, 'intervals': intervals}
+    candidates = []
+    for root_pc in range(12):
+        for mode_key in MODE_CLASSES:
+            pitch_classes, spellings = _pitch_classes(NOTE_NAMES[root_pc], mode_key)
+            candidates.append({
+                'root': root_pc, 'mode': mode_key,
+                'pitchClasses': list(pitch_classes), 'spellings': list(spellings),
+            })
+    return {'schemaVersion': 1, 'tonics': tonics, 'candidates': candidates}
+
+
+class _Candidate:
+    """One indexed ``(root, mode)`` target; ``payload`` renders its API dict."""
+
+    __slots__ = ('root_pc', 'mode', 'mask', 'pitch_classes', 'spellings', 'root_name', 'formula_text')
+
+    def __init__(self, root_pc: int, mode: str, pitch_classes: list[int], spellings: list[str]):
+        self.root_pc = root_pc
+        self.mode = mode
+        self.mask = pitchset.mask_of(pitch_classes)
+        self.pitch_classes = tuple(pitch_classes)
+        self.spellings = tuple(spellings)
+        self.root_name = NOTE_NAMES[root_pc].replace('-', 'b')
+        self.formula_text = ' – '.join(FORMULAS[mode])
+
+    def payload(self, selected: int) -> dict:
+        matches, missing, extra = pitchset.compare(selected, self.mask)
+        return {
+            'root': self.root_name,
+            'rootPitchClass': self.root_pc,
+            'mode': self.mode,
+            'name': MODE_LABELS[self.mode],
+            'formula': FORMULAS[self.mode],
+            'formulaText': self.formula_text,
+            'pitchClasses': list(self.pitch_classes),
+            'spellings': list(self.spellings),
+            'matchingPitchClasses': list(pitchset.members(matches)),
+            'missingPitchClasses': list(pitchset.members(missing)),
+            'extraPitchClasses': list(pitchset.members(extra)),
+            'matchCount': pitchset.POPCOUNT[matches],
+            'score': _score(matches, missing, extra),
+            'confirmed': selected == self.mask,
+        }
+
+
+def _score(matches: int, missing: int, extra: int) -> float:
+    popcount = pitchset.POPCOUNT
+    return round((popcount[matches] * 2 - popcount[extra] * 1.5 - popcount[missing] * 0.25) / 14, 3)
+
+
+def _load_index(path: Path = _INDEX_PATH) -> tuple[dict[str, tuple[int, tuple[str, ...]]], dict[tuple[int, str], _Candidate]]:
+    with path.open(encoding='utf-8') as index_file:
+        index = json.load(index_file)
+    tonics = {
+        name: (entry['pitchClass'], tuple(entry['intervals']))
+        for name, entry in index['tonics'].items()
+    }
+    candidates = {
+        (entry['root'], entry['mode']): _Candidate(entry['root'], entry['mode'], entry['pitchClasses'], entry['spellings'])
+        for entry in index['candidates']
+    }
+    return tonics, candidates
+
+
+_TONICS, _CANDIDATES = _load_index()
+# Candidates in the ranking tie-break order (root, then mode name).
+_RANKING_ORDER = tuple(sorted(_CANDIDATES.values(), key=lambda item: (item.root_pc, item.mode)))
+_RANKING_MASKS = tuple(
+    (order, candidate.mask, pitchset.POPCOUNT[candidate.mask])
+    for order, candidate in enumerate(_RANKING_ORDER)
+)
+
+
+def _tonic(root_name: str) -> tuple[int, tuple[str, ...]]:
+    return _tonic_lookup(_music21_name(root_name))
 
 
-def _candidate(root_pc: int, mode_key: str, selected: set[int]) -> dict:
-    root_name = NOTE_NAMES[root_pc]
-    expected, spellings = _pitch_classes(root_name, mode_key)
-    expected_set = set(expected)
-    matches = selected & expected_set
-    missing = expected_set - selected
-    extra = selected - expected_set
-    score = round((len(matches) * 2 - len(extra) * 1.5 - len(missing) * 0.25) / 14, 3)
+@lru_cache(maxsize=SCALE_ANALYSIS_CACHE_SIZE)
+def _tonic_lookup(name: str) -> tuple[int, tuple[str, ...]]:
+    indexed = _TONICS.get(name)
+    if indexed is not None:
+        return indexed
+    pitch_class, intervals = _tonic_analysis(name)
+    return pitch_class, tuple(intervals)
+
+
+def warm_cache() -> int:
+    """Load the index and every indexed tonic spelling; never imports music21."""
+    for name in INDEXED_TONICS:
+        _tonic_lookup(name)
+    return _tonic_lookup.cache_info().currsize
+
+
+def _cache_stats(cached) -> dict:
+    info = cached.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'max_size': info.maxsize,
+        'hit_rate': round(info.hits / lookups, 4) if lookups else None,
+    }
+
+
+def cache_metrics() -> dict:
+    """Hit/miss counters for the tonic lookup and music21 spelling caches."""
     return {
-        'root': root_name.replace('-', 'b'),
-        'rootPitchClass': root_pc,
-        'mode': mode_key,
-        'name': MODE_LABELS[mode_key],
-        'formula': FORMULAS[mode_key],
-        'formulaText': ' – '.join(FORMULAS[mode_key]),
-        'pitchClasses': expected,
-        'spellings': spellings,
-        'matchingPitchClasses': sorted(matches),
-        'missingPitchClasses': sorted(missing),
-        'extraPitchClasses': sorted(extra),
-        'matchCount': len(matches),
-        'score': score,
-        'confirmed': selected == expected_set,
+        'tonics': _cache_stats(_tonic_lookup),
+        'music21_pitch_classes': _cache_stats(_pitch_classes),
+        'music21_loaded': _note.loaded,
     }
 
 
+TOP_CANDIDATES = 5
+# Ranking keys pack, most significant first: not-confirmed (bit 24), the
+# negated score scaled by 56 and offset by 128 (bits 15-23), extra count
+# (bits 11-14), missing count (bits 7-10) and tie-break order (bits 0-6).
+# With ``n`` selected notes and ``m`` matches on a candidate of ``size``
+# notes those fields are ``6(n - m) + (size - m) - 8m + 128``, ``n - m``
+# and ``size - m``. Every term that depends only on ``n`` is the same for all
+# candidates, so it is left out, and each match subtracts ``_MATCH_WEIGHT``.
+_MATCH_WEIGHT = (15 << 15) + (1 << 11) + (1 << 7)
+_RANKING_KEYS = tuple(
+    (mask, ((size + 128) << 15) + (size << 7) + order)
+    for order, mask, size in _RANKING_MASKS
+)
+
+
+def _top_candidates(selected: int, k: int = TOP_CANDIDATES) -> list[_Candidate]:
+    """The ``k`` best candidates for one selection mask, best first.
+
+    Distinct scores stay at least 0.017 apart before rounding, so the packed
+    integer key orders exactly like the rounded float. ``heapq.nsmallest``
+    then keeps ``k`` keys instead of sorting all 84.
+    """
+    popcount = pitchset.POPCOUNT
+    keys = heapq.nsmallest(k, (
+        base - _MATCH_WEIGHT * popcount[selected & mask] + ((selected != mask) << 24)
+        for mask, base in _RANKING_KEYS
+    ))
+    return [_RANKING_ORDER[key & 0x7F] for key in keys]
+
+
+def _ranked_payloads(selected: int) -> list[dict]:
+    return [candidate.payload(selected) for candidate in _top_candidates(selected)]
+
+
 def analyze_scale_build(root_name: str, mode_key: str, selected_notes: list[int]) -> dict:
+    return _analyze(root_name, mode_key, selected_notes, _ranked_payloads)
+
+
+def analyze_scale_builds(items: list) -> list[dict]:
+    """Analyze many ``{root, mode, selectedNotes}`` items in one pass.
+
+    Ranking depends only on the selection, so items sharing a selection share
+    one ranked candidate list. An invalid item gets ``{'error': ...}`` in its
+    slot instead of failing the whole batch.
+    """
+    ranked_by_selection: dict[int, list[dict]] = {}
+
+    def ranked_for(selected: int) -> list[dict]:
+        ranked = ranked_by_selection.get(selected)
+        if ranked is None:
+            ranked = ranked_by_selection[selected] = _ranked_payloads(selected)
+        return ranked
+
+    results = []
+    for item in items:
+        if not isinstance(item, dict):
+            results.append({'error': 'Each item must be an object'})
+            continue
+        try:
+            results.append(_analyze(
+                str(item.get('root', 'C')).upper(),
+                item.get('mode', 'ionian'),
+                item.get('selectedNotes', []),
+                ranked_for,
+            ))
+        except Exception as e:
+            results.append({'error': str(e)})
+    return results
+
+
+def _analyze(root_name: str, mode_key: str, selected_notes: list[int], ranked_for) -> dict:
     if mode_key not in MODE_CLASSES:
         raise ValueError('Unsupported scale family')
     if not isinstance(selected_notes, list) or any(not isinstance(value, int) or value < 0 or value > 11 for value in selected_notes):
         raise ValueError('selectedNotes must contain pitch classes from 0 through 11')
 
-    selected = set(selected_notes)
-    tonic = note.Note(_music21_name(root_name))
-    root_pc = tonic.pitch.pitchClass
-    target = _candidate(root_pc, mode_key, selected)
-    ranked = [
-        _candidate(candidate_root, candidate_mode, selected)
-        for candidate_root in range(12)
-        for candidate_mode in MODE_CLASSES
-    ]
-    ranked.sort(key=lambda item: (-item['confirmed'], -item['score'], len(item['extraPitchClasses']), len(item['missingPitchClasses']), item['rootPitchClass'], item['mode']))
+    selected = pitchset.mask_of(selected_notes)
+    root_pc, tonic_intervals = _tonic(root_name)
+    target = _CANDIDATES[(root_pc, mode_key)].payload(selected)
+    ranked = ranked_for(selected)
 
-    selected_spellings = [NOTE_NAMES[pitch_class].replace('-', 'b') for pitch_class in sorted(selected)]
-    interval_names = []
-    for pitch_class in sorted(selected):
-        candidate_note = note.Note(NOTE_NAMES[pitch_class])
-        interval_names.append(interval.Interval(tonic, candidate_note).simpleName)
+    selected_pcs = pitchset.members(selected)
+    selected_spellings = [NOTE_NAMES[pitch_class].replace('-', 'b') for pitch_class in selected_pcs]
+    interval_names = [tonic_intervals[pitch_class] for pitch_class in selected_pcs]
 
     if target['confirmed']:
         message = f"Formula confirmed: {target['root']} {target['name']}."
@@ -119,5 +319,5 @@ def analyze_scale_build(root_name: str, mode_key: str, selected_notes: list[int]
         'formulaText': target['formulaText'],
         'characteristicDegree': CHARACTERISTIC_DEGREES[mode_key],
         'message': message,
-        'candidates': ranked[:5],
+        'candidates': ranked,
     }
@@ -0,0 +1,115 @@
+"""Versioned binary codec for Scale Path runs.
+
+A position on the standard-tuned neck is one byte,
+``stringIndex * (MAX_FRETS + 1) + fret``. Its string name, note and pitch
+come back from the shared fretboard table on decode. A fragment is its
+anchor, one clue byte and its candidates. With answers it also carries
+the gap. Everything else in a fragment is implied: the run's root and
+mode, the suffix (the anchor), ``isCorrect`` (the candidate at the gap)
+and ``fragmentIndex`` (its place in the run).
+
+Layout, version 1::
+
+    header     version, flags, root index, mode index, fragment difficulty,
+               position count, fragment count             (7 bytes)
+    positions  one byte each
+    fragments  anchor, clue, candidate bytes, [gap]
+
+The clue byte holds the degree clue (1-7) in bits 0-2, ``direction == 'up'``
+in bit 3, and the candidate count in bits 4-5. Flag bit 0 marks a blob
+that carries gaps; public blobs, as sent to players, do not.
+"""
+from __future__ import annotations
+
+from backend.project.music import fretboard
+from backend.project.music.config import MAX_FRETS
+from backend.project.scale_path_tokens import MODES, ROOTS
+
+CODEC_VERSION = 1
+HEADER_BYTES = 7
+_WITH_ANSWERS = 0x01
+_UP = 0x08
+# Every position on the neck (all twelve pitch classes), so the byte for
+# ``(stringIndex, fret)`` is also its index here.
+_POSITIONS = fretboard.scale_route(fretboard.STANDARD_TUNING, 0xFFF, MAX_FRETS)
+
+
+def _position_byte(position: dict) -> int:
+    return position['stringIndex'] * (MAX_FRETS + 1) + position['fret']
+
+
+def encode_run(root: str, mode: str, positions, fragments, with_answers: bool = True) -> bytes:
+    """Pack a run's positions and fragments; drop the gaps unless ``with_answers``."""
+    out = bytearray((
+        CODEC_VERSION, _WITH_ANSWERS if with_answers else 0, ROOTS.index(root), MODES.index(mode),
+        fragments[0]['difficulty'] if fragments else 1, len(positions), len(fragments),
+    ))
+    out.extend(_position_byte(position) for position in positions)
+    for fragment in fragments:
+        candidates = fragment['candidates']
+        out.append(_position_byte(fragment['anchor']))
+        out.append(int(fragment['degreeClue']) | (_UP if fragment['direction'] == 'up' else 0) | len(candidates) << 4)
+        out.extend(_position_byte(candidate) for candidate in candidates)
+        if with_answers:
+            out.append(_position_byte(fragment['gap']))
+    return bytes(out)
+
+
+def _header(blob: bytes) -> tuple:
+    if len(blob) < HEADER_BYTES or blob[0] != CODEC_VERSION:
+        raise ValueError(f'Not a version {CODEC_VERSION} Scale Path run')
+    return blob[1] & _WITH_ANSWERS, ROOTS[blob[2]], MODES[blob[3]], blob[4], blob[5], blob[6]
+
+
+def _decode_fragment(blob, offset, index, root, mode, difficulty, with_answers):
+    anchor = _POSITIONS[blob[offset]]
+    clue = blob[offset + 1]
+    count = clue >> 4 & 0x03
+    candidate_bytes = blob[offset + 2:offset + 2 + count]
+    fragment = {
+        'root': root,
+        'mode': mode,
+        'difficulty': difficulty,
+        'anchor': anchor,
+        'suffix': [anchor],
+        'candidates': [],
+        'direction': 'up' if clue & _UP else 'left',
+        'degreeClue': str(clue & 0x07),
+        'fragmentIndex': index,
+    }
+    offset += 2 + count
+    if with_answers:
+        gap_byte = blob[offset]
+        fragment['gap'] = _POSITIONS[gap_byte]
+        fragment['candidates'] = [{**_POSITIONS[byte], 'isCorrect': byte == gap_byte} for byte in candidate_bytes]
+        offset += 1
+    else:
+        fragment['candidates'] = [_POSITIONS[byte] for byte in candidate_bytes]
+    return fragment, offset
+
+
+def decode_run(blob: bytes) -> tuple[list[dict], list[dict]]:
+    """Return ``(positions, fragments)``. Position dicts are shared and read-only."""
+    with_answers, root, mode, difficulty, position_count, fragment_count = _header(blob)
+    offset = HEADER_BYTES + position_count
+    positions = [_POSITIONS[byte] for byte in blob[HEADER_BYTES:offset]]
+    fragments = []
+    for index in range(fragment_count):
+        fragment, offset = _decode_fragment(blob, offset, index, root, mode, difficulty, with_answers)
+        fragments.append(fragment)
+    return positions, fragments
+
+
+def fragment_count(blob: bytes) -> int:
+    return _header(blob)[5]
+
+
+def decode_fragment(blob: bytes, index: int) -> dict:
+    """Decode one fragment, stepping over the ones before it without building them."""
+    with_answers, root, mode, difficulty, position_count, count = _header(blob)
+    if not 0 <= index < count:
+        raise IndexError(index)
+    offset = HEADER_BYTES + position_count
+    for _ in range(index):
+        offset += 2 + (blob[offset + 1] >> 4 & 0x03) + (1 if with_answers else 0)
+    return _decode_fragment(blob, offset, index, root, mode, difficulty, with_answers)[0]
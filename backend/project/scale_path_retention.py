@@ -0,0 +1,155 @@
+"""Retention sweep for Scale Path runs and attempts.
+
+Legacy ``scale_path_runs`` rows are dead once ``expires_at`` passes.
+``scale_path_attempts`` rows only back completion idempotency, and every
+attempt is written before its run expires. So an attempt older than
+``RUN_TTL_SECONDS`` can never be replayed: its run is gone, or its signed
+token now gets a 410. Both tables are swept in primary-key order, one short
+transaction per batch. Attempts are folded into per-day
+``scale_path_daily_totals`` rows in the same transaction that deletes them.
+Only the rows that the DELETE actually returns are folded in. So when two
+sweeps overlap (the background thread, the script, another worker), a
+batch that both of them selected is archived once.
+
+Each batch holds the database write lock from its first write to its
+commit. The sweep sizes the next batch from the last batch's per-row cost,
+so that hold time stays near half of ``SWEEP_MAX_LOCK_MS``.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+
+from backend.project.models import db
+from backend.project.models.user import ScalePathAttempt, ScalePathDailyTotal, ScalePathRun
+from backend.project.scale_path_tokens import RUN_TTL_SECONDS
+
+SWEEP_BATCH_SIZE = 2000
+SWEEP_FIRST_BATCH_SIZE = 100
+SWEEP_MAX_LOCK_MS = float(os.getenv('PYMUSIC_SWEEP_MAX_LOCK_MS', '50'))
+SWEEP_INTERVAL_SECONDS = int(os.getenv('PYMUSIC_SCALE_PATH_SWEEP_INTERVAL', '3600'))
+
+_metrics_lock = threading.Lock()
+_metrics = {
+    'sweeps': 0,
+    'runs_deleted': 0,
+    'attempts_deleted': 0,
+    'days_archived': 0,
+    'seconds': 0.0,
+    'max_lock_ms': 0.0,
+    'last_sweep_at': None,
+}
+
+
+def retention_metrics():
+    """Totals across every sweep this process has run."""
+    with _metrics_lock:
+        return {**_metrics, 'seconds': round(_metrics['seconds'], 3), 'max_lock_ms': round(_metrics['max_lock_ms'], 3)}
+
+
+def _next_batch_size(rows, lock_ms, max_lock_ms, batch_size):
+    if not rows or lock_ms <= 0:
+        return batch_size
+    return max(1, min(batch_size, int(rows * max_lock_ms / 2 / lock_ms)))
+
+
+def _archive(rows):
+    from backend.project.api.daily_challenges import _dialect_insert
+
+    totals = defaultdict(lambda: [0, 0, 0])
+    for user_id, created_at, correct, xp_awarded in rows:
+        total = totals[user_id, created_at.strftime('%Y-%m-%d')]
+        total[0] += 1
+        total[1] += bool(correct)
+        total[2] += xp_awarded or 0
+    table = ScalePathDailyTotal.__table__
+    insert = _dialect_insert(table)
+    db.session.execute(
+        insert.values([
+            {'user_id': user_id, 'day': day, 'attempts': attempts, 'correct': correct, 'xp_awarded': xp_awarded}
+            for (user_id, day), (attempts, correct, xp_awarded) in totals.items()
+        ]).on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.day],
+            set_={
+                'attempts': table.c.attempts + insert.excluded.attempts,
+                'correct': table.c.correct + insert.excluded.correct,
+                'xp_awarded': table.c.xp_awarded + insert.excluded.xp_awarded,
+            },
+        )
+    )
+    return len(totals)
+
+
+def _sweep_table(table, expired, stats, max_lock_ms, batch_size, columns=(), on_batch=None, progress=None):
+    deleted = 0
+    last_id = 0
+    size = min(SWEEP_FIRST_BATCH_SIZE, batch_size)
+    while True:
+        ids = db.session.execute(
+            sa.select(table.c.id)
+            .where(expired, table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(size)
+        ).scalars().all()
+        db.session.commit()
+        if not ids:
+            return deleted
+        started = time.perf_counter()
+        delete = table.delete().where(table.c.id.between(ids[0], ids[-1]), expired)
+        if on_batch is None:
+            deleted += db.session.execute(delete).rowcount
+        else:
+            rows = db.session.execute(delete.returning(*columns)).all()
+            if rows:
+                stats['days_archived'] += on_batch(rows)
+            deleted += len(rows)
+        db.session.commit()
+        lock_ms = (time.perf_counter() - started) * 1000
+        stats['lock_ms'].append(lock_ms)
+        last_id = ids[-1]
+        size = _next_batch_size(len(ids), lock_ms, max_lock_ms, batch_size)
+        if progress is not None:
+            progress(table.name, deleted, last_id)
+
+
+def sweep_scale_path_retention(now=None, batch_size=SWEEP_BATCH_SIZE, max_lock_ms=None,
+                               archive=True, progress=None):
+    """Delete expired runs and dead attempts, archiving the attempts it deletes.
+
+    Returns this sweep's counts and its per-batch write-lock hold times
+    (``lock_ms``, in batch order). ``progress(table_name, deleted, last_id)``
+    is called after every batch. It is safe to interrupt and rerun: each
+    batch commits on its own.
+    """
+    now = now or datetime.utcnow()
+    max_lock_ms = SWEEP_MAX_LOCK_MS if max_lock_ms is None else max_lock_ms
+    cutoff = now - timedelta(seconds=RUN_TTL_SECONDS)
+    stats = {'runs_deleted': 0, 'attempts_deleted': 0, 'days_archived': 0, 'lock_ms': []}
+    started = time.perf_counter()
+
+    runs = ScalePathRun.__table__
+    stats['runs_deleted'] = _sweep_table(
+        runs,
+        sa.or_(runs.c.expires_at < now, sa.and_(runs.c.expires_at.is_(None), runs.c.created_at < cutoff)),
+        stats, max_lock_ms, batch_size, progress=progress,
+    )
+    attempts = ScalePathAttempt.__table__
+    stats['attempts_deleted'] = _sweep_table(
+        attempts, attempts.c.created_at < cutoff, stats, max_lock_ms, batch_size,
+        columns=(attempts.c.user_id, attempts.c.created_at, attempts.c.correct, attempts.c.xp_awarded),
+        on_batch=_archive if archive else None, progress=progress,
+    )
+
+    stats['seconds'] = time.perf_counter() - started
+    with _metrics_lock:
+        _metrics['sweeps'] += 1
+        for key in ('runs_deleted', 'attempts_deleted', 'days_archived', 'seconds'):
+            _metrics[key] += stats[key]
+        _metrics['max_lock_ms'] = max([_metrics['max_lock_ms'], *stats['lock_ms']])
+        _metrics['last_sweep_at'] = now.isoformat()
+    return stats
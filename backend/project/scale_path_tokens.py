@@ -0,0 +1,91 @@
+"""Signed, stateless Scale Path run ids.
+
+A Scale Path run is fully determined by its seed, root, mode, octave
+setting and route modifier, so the server does not store it. The run id is
+those inputs plus the owner, difficulty and issue time, packed into a few
+bytes and HMAC-signed with the app secret. The completion endpoint checks
+the signature and regenerates the run.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import struct
+from dataclasses import dataclass
+
+from backend.project.music import pitchset
+from backend.project.music.config import SCALE_KEYS
+
+TOKEN_VERSION = 1
+RUN_TTL_SECONDS = 24 * 3600
+
+# Accepted spellings, upper-cased as the run response echoes them.
+ROOTS = tuple(dict.fromkeys(key.upper() for key in SCALE_KEYS))
+MODES = pitchset.MODES
+ROUTE_MODIFIERS = (
+    'ascending', 'descending', 'same-string', 'nearest-position',
+    'alternate-strings', 'octave-target', 'listen-first',
+)
+
+# version, user id, issued at (epoch seconds), seed, then one byte each for
+# the root, mode and route modifier indexes, octaves and difficulty.
+_PAYLOAD = struct.Struct('>BIIQBBBBB')
+_SIGNATURE_BYTES = 16
+
+
+@dataclass(frozen=True)
+class RunToken:
+    user_id: int
+    issued_at: int
+    seed: int
+    root: str
+    mode: str
+    route_modifier: str
+    octaves: int
+    difficulty: int
+
+    @property
+    def expires_at(self) -> int:
+        return self.issued_at + RUN_TTL_SECONDS
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def _signature(payload: bytes, secret: str) -> bytes:
+    return hmac.new(secret.encode('utf-8'), b'scale-path-run:' + payload, hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+
+
+def encode_run_token(token: RunToken, secret: str) -> str:
+    """The run id for ``token``: ``<payload>.<signature>``, both base64url."""
+    payload = _PAYLOAD.pack(
+        TOKEN_VERSION, token.user_id, token.issued_at, token.seed,
+        ROOTS.index(token.root), MODES.index(token.mode), ROUTE_MODIFIERS.index(token.route_modifier),
+        token.octaves, token.difficulty,
+    )
+    return f'{_b64encode(payload)}.{_b64encode(_signature(payload, secret))}'
+
+
+def decode_run_token(text: str, secret: str) -> RunToken | None:
+    """The run a signed id names, or ``None`` for anything this server did not sign."""
+    encoded_payload, _, encoded_signature = text.partition('.')
+    try:
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except ValueError:
+        return None
+    if len(payload) != _PAYLOAD.size or not hmac.compare_digest(signature, _signature(payload, secret)):
+        return None
+    version, user_id, issued_at, seed, root, mode, route_modifier, octaves, difficulty = _PAYLOAD.unpack(payload)
+    if version != TOKEN_VERSION or root >= len(ROOTS) or mode >= len(MODES) or route_modifier >= len(ROUTE_MODIFIERS):
+        return None
+    return RunToken(
+        user_id=user_id, issued_at=issued_at, seed=seed, root=ROOTS[root], mode=MODES[mode],
+        route_modifier=ROUTE_MODIFIERS[route_modifier], octaves=octaves, difficulty=difficulty,
+    )
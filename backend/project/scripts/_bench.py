@@ -0,0 +1,112 @@
+"""Small shared helpers for the backend benchmark scripts.
+
+Benchmarks are plain scripts run from the repository root, for example::
+
+    python -m backend.project.scripts.bench_scale_catalog
+
+They print one row per scenario and never touch the configured database.
+"""
+from __future__ import annotations
+
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def run_load(call: Callable[[int], object], total: int, concurrency: int) -> dict:
+    """Fire ``total`` calls from ``concurrency`` threads and report latency."""
+    def timed(index: int) -> float:
+        started = time.perf_counter()
+        call(index)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(timed, range(total)))
+    elapsed = time.perf_counter() - started
+    return {
+        'calls': total,
+        'concurrency': concurrency,
+        'per_sec': round(total / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def time_per_call(call: Callable[[int], object], total: int) -> float:
+    """Single-threaded mean wall time per call in microseconds."""
+    started = time.perf_counter()
+    for index in range(total):
+        call(index)
+    return round((time.perf_counter() - started) / total * 1_000_000, 2)
+
+
+def allocations_per_call(call: Callable[[int], object], total: int) -> dict:
+    """Mean peak traced memory (KiB) allocated while one call runs."""
+    call(0)  # warm caches and imports outside the measurement
+    peak = 0
+    tracemalloc.start()
+    try:
+        for index in range(total):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            call(index)
+            _, call_peak = tracemalloc.get_traced_memory()
+            peak += call_peak - baseline
+    finally:
+        tracemalloc.stop()
+    return {'peak_kib_per_call': round(peak / total / 1024, 1)}
+
+
+def print_rows(title: str, rows: list[dict]) -> None:
+    print(f'\n{title}')
+    if not rows:
+        return
+    columns = list(rows[0])
+    widths = {column: max(len(column), *(len(str(row.get(column, ''))) for row in rows)) for column in columns}
+    print('  '.join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print('  '.join(str(row.get(column, '')).ljust(widths[column]) for column in columns))
+
+
+def daily_app(database_uri: str):
+    """A bare Flask app with the auth and Daily blueprints on ``database_uri``.
+
+    Rate limiting is off. Log a client in with :func:`login_as`.
+    """
+    from flask import Flask
+
+    from backend.project.api.daily_challenges import daily_bp
+    from backend.project.auth import auth_bp, login_manager
+    from backend.project.extensions import limiter
+    from backend.project.models import bcrypt, db
+
+    app = Flask('bench')
+    app.config.update(
+        SECRET_KEY='bench-secret',
+        SQLALCHEMY_DATABASE_URI=database_uri,
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        RATELIMIT_ENABLED=False,
+        TESTING=True,
+    )
+    db.init_app(app)
+    bcrypt.init_app(app)
+    limiter.init_app(app)
+    login_manager.init_app(app)
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(daily_bp)
+    return app
+
+
+def login_as(client, user_id: int) -> None:
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
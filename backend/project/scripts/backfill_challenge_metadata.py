@@ -0,0 +1,36 @@
+"""Persist typed metadata on legacy Daily challenge rows.
+
+    python -m backend.project.scripts.backfill_challenge_metadata [--batch-size 2000]
+
+Runs against the configured database (``DATABASE_URL`` or the default SQLite
+file). The app also runs this on boot after migrations; the script is for
+large banks or for finishing a run that was interrupted. It is safe to rerun:
+each batch commits, and finished rows are skipped.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+
+from backend.project.api.app import app
+from backend.project.api.daily_challenges import BACKFILL_BATCH_SIZE, backfill_challenge_metadata
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--batch-size', type=int, default=BACKFILL_BATCH_SIZE)
+    args = parser.parse_args()
+
+    def report(updated: int, last_id: int) -> None:
+        print(f'{updated} rows updated, through id {last_id}', flush=True)
+
+    with app.app_context():
+        updated = backfill_challenge_metadata(args.batch_size, progress=report)
+    print(f'done: {updated} rows updated')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+"""Challenge bank generation: serial vs a process pool.
+
+    python -m backend.project.scripts.bench_bank_generation [--rows 1000000] [--workers 2,4]
+
+Times producing every ``daily_challenges`` row dict, without a database.
+``serial`` is the single-process ``_challenge_rows`` pass that
+``seed_challenges`` uses by default; ``pool`` is ``_parallel_challenge_rows``
+with N worker processes. Every pass is checked against the serial one, so
+the table also shows the banks are identical. Speed-ups need that many
+free cores (``os.cpu_count()`` is printed with the table).
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+
+from backend.project.api.daily_challenges import _challenge_rows, _parallel_challenge_rows
+from backend.project.scripts._bench import print_rows
+
+
+def _digest(rows) -> tuple[int, str]:
+    digest = hashlib.sha256()
+    count = 0
+    for row in rows:
+        digest.update(json.dumps(row, sort_keys=True).encode())
+        count += 1
+    return count, digest.hexdigest()[:12]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--workers', default='2,4')
+    args = parser.parse_args()
+
+    results = []
+    passes = [('serial', 1)] + [(f'pool x{workers}', int(workers)) for workers in args.workers.split(',')]
+    for label, workers in passes:
+        started = time.perf_counter()
+        rows = _challenge_rows(args.rows) if workers == 1 else _parallel_challenge_rows(args.rows, workers)
+        count, digest = _digest(rows)
+        elapsed = time.perf_counter() - started
+        assert count == args.rows, count
+        results.append({'generator': label, 'rows': count, 'seconds': round(elapsed, 2),
+                        'rows_per_sec': round(count / elapsed), 'bank_sha256': digest})
+    assert len({row['bank_sha256'] for row in results}) == 1, results
+
+    print_rows(f'Generate {args.rows} challenge rows (cpu_count={os.cpu_count()})', results)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+"""Legacy challenge metadata backfill: ORM row-at-a-time vs batched UPDATEs.
+
+    python -m backend.project.scripts.bench_challenge_backfill [--rows 1000000] [--orm-rows 100000]
+
+Each row seeds a throwaway SQLite bank in a fresh subprocess, clears the
+typed metadata columns to make every row legacy, then backfills them.
+``ORM per row`` loads rows in pages and sets attributes the way the old
+read-path backfill did; ``batched UPDATE`` is ``backfill_challenge_metadata``.
+``peak_rss_mib`` is the subprocess high-water mark (``ru_maxrss``).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from backend.project.scripts._bench import print_rows
+
+LEGACY_COLUMNS = ('skill_id', 'modality', 'rank_band_min', 'rank_band_max', 'difficulty_axis', 'stimulus_version')
+
+
+def _orm_backfill(batch_size: int) -> int:
+    from backend.project.api.daily_challenges import _legacy_metadata
+    from backend.project.models import db
+    from backend.project.models.user import DailyChallenge
+
+    updated = 0
+    last_id = 0
+    while True:
+        rows = DailyChallenge.query.filter(DailyChallenge.skill_id.is_(None), DailyChallenge.id > last_id) \
+            .order_by(DailyChallenge.id).limit(batch_size).all()
+        if not rows:
+            return updated
+        for challenge in rows:
+            for column, value in _legacy_metadata(challenge).items():
+                setattr(challenge, column, value)
+            updated += 1
+        last_id = rows[-1].id
+        db.session.commit()
+        db.session.expunge_all()
+
+
+def _child(mode: str, rows: int, batch_size: int) -> dict:
+    os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+    from flask import Flask
+
+    from backend.project.api.daily_challenges import backfill_challenge_metadata, seed_challenges
+    from backend.project.models import db
+    from backend.project.models.user import DailyChallenge
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        app = Flask(__name__)
+        app.config.update(SQLALCHEMY_DATABASE_URI=f'sqlite:///{data_dir}/backfill.db',
+                          SQLALCHEMY_TRACK_MODIFICATIONS=False)
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+            seed_challenges(rows, chunk_size=5000)
+            db.session.execute(DailyChallenge.__table__.update().values({column: None for column in LEGACY_COLUMNS}))
+            db.session.commit()
+            started = time.perf_counter()
+            if mode == 'ORM per row':
+                updated = _orm_backfill(batch_size)
+            else:
+                updated = backfill_challenge_metadata(batch_size)
+            elapsed = time.perf_counter() - started
+            assert updated == rows, (updated, rows)
+            assert DailyChallenge.query.filter(DailyChallenge.skill_id.is_(None)).count() == 0
+            db.session.remove()
+            db.engine.dispose()
+    return {
+        'seconds': round(elapsed, 2),
+        'rows_per_sec': round(rows / elapsed),
+        'peak_rss_mib': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--orm-rows', type=int, default=100_000)
+    parser.add_argument('--batch-size', type=int, default=2000)
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'ROWS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, rows = args.child
+        print(json.dumps(_child(mode, int(rows), args.batch_size)))
+        return 0
+
+    results = []
+    for mode, rows in (('ORM per row', args.orm_rows), ('batched UPDATE', args.orm_rows), ('batched UPDATE', args.rows)):
+        output = subprocess.run(
+            [sys.executable, '-m', 'backend.project.scripts.bench_challenge_backfill',
+             '--batch-size', str(args.batch_size), '--child', mode, str(rows)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append({'rows': rows, 'backfill': mode, **json.loads(output.splitlines()[-1])})
+
+    print_rows(f'Legacy challenge metadata backfill (batch size {args.batch_size})', results)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
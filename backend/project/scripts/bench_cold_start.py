@@ -0,0 +1,78 @@
+"""Cold-start time from process spawn to the first healthy ``/api/health``.
+
+    python -m backend.project.scripts.bench_cold_start [--trials 5] [--root PATH]
+
+Starts gunicorn with the production worker settings against a throwaway
+data directory, polls the health endpoint and reports the median time per
+mode. ``--root`` points at another checkout to measure an older tree.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from backend.project.scripts._bench import print_rows
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def _time_to_healthy(root: Path, extra_env: dict[str, str], timeout: float = 60.0) -> float:
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(os.environ, PYMUSIC_DATA_DIR=data_dir, **extra_env)
+        started = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}',
+             '--workers', '1', '--threads', '4', 'backend.project.api.app:app'],
+            cwd=root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            while time.perf_counter() - started < timeout:
+                try:
+                    with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1) as response:
+                        if response.status == 200:
+                            return time.perf_counter() - started
+                except OSError:
+                    time.sleep(0.02)
+            raise TimeoutError('server never became healthy')
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--trials', type=int, default=5)
+    parser.add_argument('--root', type=Path, default=REPO_ROOT)
+    args = parser.parse_args()
+
+    rows = []
+    for label, extra_env in (('default', {}), ('lazy imports', {'PYMUSIC_LAZY_IMPORTS': '1'})):
+        samples = [_time_to_healthy(args.root, extra_env) for _ in range(args.trials)]
+        rows.append({
+            'mode': label,
+            'trials': args.trials,
+            'median_ms': round(statistics.median(samples) * 1000),
+            'max_ms': round(max(samples) * 1000),
+        })
+
+    print_rows(f'Spawn to first healthy /api/health ({args.root})', rows)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,160 @@
+"""Answers per second through ``POST /api/daily-challenge/<id>/complete``.
+
+    python -m backend.project.scripts.bench_daily_completion [--answers 2000] [--players 16]
+        [--concurrency 1,4] [--postgres-url postgresql://.../scratch]
+
+Every answer is a correct first completion of a distinct (player, challenge)
+pair, so each one writes an attempt, the user row, the streak and four quest
+counters. ``select + ORM`` replays the previous handler (attempt lookup, then
+``SELECT ... FOR UPDATE`` and an ORM insert/update per quest counter) behind
+the same route plumbing; ``upsert`` is the real route. SQLite runs on a
+throwaway file. ``--postgres-url`` repeats the run against that database:
+it must be a scratch database, because the tables are created and dropped.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+
+from flask import jsonify, request
+from flask_login import current_user
+
+from backend.project.api.daily_challenges import (
+    SCORED_CATEGORIES, _apply_rank_xp, _completed_dates, _streak_from_dates, seed_challenges,
+)
+from backend.project.game_system import get_mode_base_xp
+from backend.project.models import db
+from backend.project.models.user import ChallengeAttempt, DailyChallenge, QuestProgress, User, UserStreak
+from backend.project.scripts._bench import daily_app, login_as, print_rows, run_load
+
+
+def _previous_quest_progress(user_id, metric, period_key):
+    row = QuestProgress.query.filter_by(
+        user_id=user_id, metric=metric, period_key=period_key,
+    ).with_for_update().first()
+    if row is None:
+        row = QuestProgress(user_id=user_id, metric=metric, period_key=period_key, count=0)
+        db.session.add(row)
+    row.count += 1
+
+
+def _previous_streak(user_id, today):
+    row = db.session.query(UserStreak).filter_by(user_id=user_id).with_for_update().first()
+    if row is None:
+        current, longest, last_active = _streak_from_dates(_completed_dates(user_id))
+        row = UserStreak(user_id=user_id, current_streak=current, longest_streak=longest,
+                         last_active_date=last_active)
+        db.session.add(row)
+    if row.last_active_date == today:
+        return
+    yesterday = (date.fromisoformat(today) - timedelta(days=1)).isoformat()
+    row.current_streak = row.current_streak + 1 if row.last_active_date == yesterday else 1
+    row.longest_streak = max(row.longest_streak or 0, row.current_streak)
+    row.last_active_date = today
+
+
+def _previous_complete(challenge_id):
+    challenge = DailyChallenge.query.get(challenge_id)
+    options = json.loads(challenge.options_json)
+    is_correct = options[request.get_json()['submitted_answer']] == options[challenge.correct_index]
+    today = datetime.utcnow().strftime('%Y-%m-%d')
+    xp_award = get_mode_base_xp('challenge', challenge.difficulty) if is_correct else 0
+    existing = ChallengeAttempt.query.filter_by(user_id=current_user.id, challenge_id=challenge_id).first()
+    if existing and existing.completed:
+        return jsonify({'xp_awarded': 0, 'already_completed': True})
+    db.session.add(ChallengeAttempt(user_id=current_user.id, challenge_id=challenge_id, challenge_date=today,
+                                    score=xp_award, completed=True, is_correct=is_correct))
+    if is_correct:
+        current_user.xp = (current_user.xp or 0) + xp_award
+        current_user.lifetime_points = (current_user.lifetime_points or 0) + xp_award
+        _apply_rank_xp(current_user, xp_award)
+    _previous_streak(current_user.id, today)
+    if is_correct:
+        for metric, period_key in (('play', today), ('correct', today), ('play', 'lifetime'), ('correct', 'lifetime')):
+            _previous_quest_progress(current_user.id, metric, period_key)
+    db.session.commit()
+    return jsonify({'xp_awarded': xp_award, 'already_completed': False})
+
+
+def _run(database: str, database_uri: str, args, concurrencies: list[int]) -> list[dict]:
+    app = daily_app(database_uri)
+    app.add_url_rule('/bench/complete/<int:challenge_id>', view_func=_previous_complete, methods=['POST'])
+    rows = []
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        seed_challenges(2 * (args.answers // args.players + 1) + 100)
+        # Ear-training rows grade against a rendered exercise; keep to stored options.
+        bank = [row.id for row in db.session.query(DailyChallenge.id).filter(
+            DailyChallenge.category.in_([category for category in SCORED_CATEGORIES if category != 'ear_training']),
+        ).order_by(DailyChallenge.id)]
+        assert len(bank) * args.players >= args.answers, len(bank)
+        correct = dict(db.session.query(DailyChallenge.id, DailyChallenge.correct_index))
+        players = []
+        for index in range(args.players):
+            user = User(username=f'player{index}', email=f'player{index}@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.flush()
+            players.append(user.id)
+        db.session.commit()
+    clients = []
+    for user_id in players:
+        client = app.test_client()
+        login_as(client, user_id)
+        clients.append(client)
+
+    try:
+        for concurrency in concurrencies:
+            for label, prefix in (('select + ORM', '/bench/complete'), ('upsert', '/api/daily-challenge')):
+                with app.app_context():
+                    for table in (ChallengeAttempt, QuestProgress, UserStreak):
+                        db.session.query(table).delete()
+                    db.session.query(User).update({'xp': 0, 'lifetime_points': 0})
+                    db.session.commit()
+
+                def answer(index: int, prefix=prefix) -> None:
+                    challenge_id = bank[index // args.players]
+                    response = clients[index % args.players].post(
+                        f'{prefix}/{challenge_id}' + ('/complete' if prefix.startswith('/api') else ''),
+                        json={'submitted_answer': correct[challenge_id]},
+                    )
+                    assert response.status_code == 200 and not response.get_json()['already_completed'], response.data
+
+                stats = run_load(answer, args.answers, concurrency)
+                rows.append({'database': database, 'handler': label, **stats})
+                with app.app_context():
+                    counted = db.session.query(db.func.sum(QuestProgress.count)).scalar()
+                    assert counted == 4 * args.answers, (label, counted)
+    finally:
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--answers', type=int, default=2000)
+    parser.add_argument('--players', type=int, default=16)
+    parser.add_argument('--concurrency', default='1,4')
+    parser.add_argument('--postgres-url')
+    args = parser.parse_args()
+    concurrencies = [int(value) for value in args.concurrency.split(',')]
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        rows = _run('sqlite', f'sqlite:///{data_dir}/bench.db', args, concurrencies)
+    if args.postgres_url:
+        rows += _run('postgresql', args.postgres_url, args, concurrencies)
+
+    print_rows(f'Correct first completions ({args.players} players, four quest counters each)', rows)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+"""Hint reveal and Daily list latency with upsert counters and the allowance cache.
+
+    python -m backend.project.scripts.bench_daily_hints [--reveals 500] [--lists 500]
+
+Seeds a 1000-row bank into a throwaway SQLite file. ``select + lock``
+replays the previous reveal handler (reveal lookup, ``SELECT ... FOR
+UPDATE`` on the usage row, ORM insert, commit) behind the same route
+plumbing; ``upsert`` is the real route. ``first`` reveals a new challenge
+each call, ``reopen`` reveals the same ones again.
+The daily limit is raised for the run so every first reveal spends a hint.
+The list rows time ``GET /api/daily-challenges?limit=20`` with the
+allowance cache off (TTL 0) and on.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+
+from flask import jsonify
+from flask_login import current_user
+from sqlalchemy.exc import IntegrityError
+
+from backend.project.api import daily_challenges
+from backend.project.models import db
+from backend.project.models.user import DailyChallenge, DailyHintReveal, DailyHintUsage, User
+from backend.project.scripts._bench import daily_app, login_as, print_rows, run_load, time_per_call
+
+
+def _previous_reveal(challenge_id):
+    challenge = DailyChallenge.query.get(challenge_id)
+    usage_date, limit, _, reset_at = daily_challenges._utc_hint_state(current_user)
+    reveal = DailyHintReveal.query.filter_by(
+        user_id=current_user.id, challenge_id=challenge_id, usage_date=usage_date,
+    ).first()
+    usage = DailyHintUsage.query.filter_by(user_id=current_user.id, usage_date=usage_date).with_for_update().first()
+    if reveal:
+        used = usage.used_count if usage else 0
+        return jsonify({'remaining': max(limit - used, 0), 'explanation': challenge.to_dict()['explanation'],
+                        'already_revealed': True})
+    if usage is None:
+        usage = DailyHintUsage(user_id=current_user.id, usage_date=usage_date, used_count=0)
+        db.session.add(usage)
+    if usage.used_count >= limit:
+        return jsonify({'remaining': 0, 'error': 'No daily hints remaining'}), 429
+    usage.used_count += 1
+    db.session.add(DailyHintReveal(user_id=current_user.id, challenge_id=challenge_id, usage_date=usage_date))
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        raise
+    return jsonify({'remaining': limit - usage.used_count, 'explanation': challenge.to_dict()['explanation'],
+                    'already_revealed': False})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--reveals', type=int, default=500)
+    parser.add_argument('--lists', type=int, default=500)
+    args = parser.parse_args()
+    daily_challenges.HINT_LIMITS['unranked'] = args.reveals + 1
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        app = daily_app(f'sqlite:///{data_dir}/bench.db')
+        app.add_url_rule('/bench/hint/<int:challenge_id>', view_func=_previous_reveal, methods=['POST'])
+        with app.app_context():
+            db.create_all()
+            daily_challenges.seed_challenges(1000)
+            bank = [row.id for row in db.session.query(DailyChallenge.id).order_by(DailyChallenge.id)]
+            user = User(username='player', email='player@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+        client = app.test_client()
+        login_as(client, user_id)
+
+        rows = []
+        for label, url in (('select + lock', '/bench/hint/{}'), ('upsert', '/api/daily-challenge/{}/hint')):
+            with app.app_context():
+                db.session.query(DailyHintReveal).delete()
+                db.session.query(DailyHintUsage).delete()
+                db.session.commit()
+            for phase, expect_reopen in (('first', False), ('reopen', True)):
+                def reveal(index: int, url=url, expect_reopen=expect_reopen) -> None:
+                    response = client.post(url.format(bank[index]))
+                    assert response.status_code == 200, response.data
+                    assert response.get_json()['already_revealed'] is expect_reopen, response.data
+
+                stats = run_load(reveal, args.reveals, 1)
+                rows.append({'reveal': label, 'phase': phase, 'calls': stats['calls'], 'per_sec': stats['per_sec'],
+                             'p50_ms': stats['p50_ms'], 'p99_ms': stats['p99_ms']})
+
+        list_rows = []
+        for label, ttl in (('uncached', 0.0), ('cached', daily_challenges.HINT_ALLOWANCE_TTL_SECONDS)):
+            daily_challenges.HINT_ALLOWANCE_TTL_SECONDS = ttl
+
+            def get_list(_: int) -> None:
+                response = client.get('/api/daily-challenges?limit=20')
+                assert response.get_json()['hint_allowance']['remaining'] == 1, response.data
+
+            get_list(0)
+            list_rows.append({'hint_allowance': label, 'calls': args.lists,
+                              'us_per_request': time_per_call(get_list, args.lists)})
+
+    print_rows('POST /api/daily-challenge/<id>/hint', rows)
+    print_rows('GET /api/daily-challenges?limit=20 (signed in)', list_rows)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
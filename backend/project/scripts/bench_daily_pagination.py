@@ -0,0 +1,115 @@
+"""``GET /api/daily-challenges`` for a player with a long completion history.
+
+    python -m backend.project.scripts.bench_daily_pagination [--bank 60000] [--completed 50000] [--requests 200]
+
+Seeds a throwaway SQLite bank and marks ``--completed`` random challenges as
+completed by one player. ``NOT IN + OFFSET`` replays the previous handler
+(completed ids loaded into Python and bound back into the query, an
+``OFFSET`` page and an unfiltered total ``count()``) behind the same
+serializer; the other rows call the real route. ``deep`` pages start
+``--deep`` rows into the player's available challenges.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+
+from flask import jsonify, request
+from flask_login import current_user
+
+from backend.project.api.daily_challenges import SCORED_CATEGORIES, seed_challenges, serialize_challenge
+from backend.project.models import db
+from backend.project.models.user import ChallengeAttempt, DailyChallenge, User
+from backend.project.scripts._bench import daily_app, login_as, print_rows, time_per_call
+
+
+def _not_in_offset():
+    limit = int(request.args.get('limit', 10))
+    offset = int(request.args.get('offset', 0))
+    completed_ids = {row[0] for row in db.session.query(ChallengeAttempt.challenge_id).filter(
+        ChallengeAttempt.user_id == current_user.id,
+        ChallengeAttempt.completed == True,
+        ChallengeAttempt.challenge_id.isnot(None),
+    ).all()}
+    query = DailyChallenge.query.filter(DailyChallenge.category.in_(SCORED_CATEGORIES))
+    if completed_ids:
+        query = query.filter(~DailyChallenge.id.in_(completed_ids))
+    available_total = query.count()
+    challenges = query.order_by(DailyChallenge.difficulty.asc(), DailyChallenge.id.asc()) \
+        .offset(offset).limit(limit).all()
+    return jsonify({
+        'challenges': [serialize_challenge(challenge) for challenge in challenges],
+        'total': DailyChallenge.query.count(),
+        'completed': len(completed_ids),
+        'remaining': max(available_total - offset - len(challenges), 0),
+    })
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--bank', type=int, default=60_000)
+    parser.add_argument('--completed', type=int, default=50_000)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--deep', type=int, default=5_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        app = daily_app(f'sqlite:///{data_dir}/bench.db')
+        app.add_url_rule('/bench/not-in-offset', view_func=_not_in_offset)
+        with app.app_context():
+            db.create_all()
+            seed_challenges(args.bank, chunk_size=5000)
+            user = User(username='grinder', email='grinder@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+            completed = random.Random(7).sample(range(1, args.bank + 1), args.completed)
+            db.session.execute(ChallengeAttempt.__table__.insert(), [
+                {'user_id': user_id, 'challenge_id': challenge_id, 'challenge_date': '2026-01-01',
+                 'score': 1, 'completed': True, 'is_correct': True}
+                for challenge_id in completed
+            ])
+            db.session.commit()
+
+        client = app.test_client()
+        login_as(client, user_id)
+
+        def get(url: str) -> dict:
+            response = client.get(url)
+            assert response.status_code == 200, response.data
+            return response.get_json()
+
+        legacy_deep = get(f'/bench/not-in-offset?limit=10&offset={args.deep}')
+        # Walk to the same deep page with cursors once, then replay that cursor.
+        cursor = ''
+        for _ in range(args.deep // 50):
+            cursor = get(f'/api/daily-challenges?limit=50&after={cursor}')['next_cursor']
+        keyset_deep = get(f'/api/daily-challenges?limit=10&after={cursor}')
+        offset_deep = get(f'/api/daily-challenges?limit=10&offset={args.deep}')
+        assert [c['id'] for c in keyset_deep['challenges']] == [c['id'] for c in legacy_deep['challenges']]
+        assert keyset_deep['remaining'] == offset_deep['remaining'] == legacy_deep['remaining']
+        assert keyset_deep['completed'] == legacy_deep['completed'] == args.completed
+
+        targets = (
+            ('NOT IN + OFFSET', 'first', '/bench/not-in-offset?limit=10'),
+            ('NOT IN + OFFSET', 'deep', f'/bench/not-in-offset?limit=10&offset={args.deep}'),
+            ('anti-join + OFFSET', 'first', '/api/daily-challenges?limit=10'),
+            ('anti-join + OFFSET', 'deep', f'/api/daily-challenges?limit=10&offset={args.deep}'),
+            ('anti-join + keyset', 'deep', f'/api/daily-challenges?limit=10&after={cursor}'),
+        )
+        rows = [
+            {'query': query, 'page': page, 'calls': args.requests,
+             'ms_per_request': round(time_per_call(lambda _, url=url: get(url), args.requests) / 1000, 2)}
+            for query, page, url in targets
+        ]
+
+    print_rows(f'GET /api/daily-challenges ({args.bank} bank rows, {args.completed} completed)', rows)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+"""Serializing a 50-item Daily page with and without the payload cache.
+
+    python -m backend.project.scripts.bench_daily_payloads [--pages 400]
+
+Seeds a 1000-row bank into a throwaway SQLite file and cycles through its
+twenty 50-row pages. ``uncached`` sets the cache size to 0, which is the
+previous behaviour: every row re-parses its JSON, rebuilds the hint text
+and, for ear-training rows, rebuilds the exercise.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+
+from backend.project.api import daily_challenges
+from backend.project.models import db
+from backend.project.models.user import DailyChallenge
+from backend.project.scripts._bench import daily_app, print_rows, time_per_call
+
+PAGE = 50
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=400)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        app = daily_app(f'sqlite:///{data_dir}/bench.db')
+        client = app.test_client()
+        rows = []
+        with app.app_context():
+            db.create_all()
+            daily_challenges.seed_challenges(1000)
+            bank = DailyChallenge.query.order_by(DailyChallenge.difficulty, DailyChallenge.id).all()
+            pages = [bank[start:start + PAGE] for start in range(0, len(bank), PAGE)]
+
+            for label, size in (('uncached', 0), ('cached', daily_challenges.CHALLENGE_PAYLOAD_CACHE_SIZE)):
+                daily_challenges.CHALLENGE_PAYLOAD_CACHE_SIZE = size
+                daily_challenges.clear_payload_cache()
+
+                def serialize_page(index: int) -> None:
+                    for challenge in pages[index % len(pages)]:
+                        daily_challenges.serialize_challenge(challenge)
+
+                def get_page(index: int) -> None:
+                    response = client.get(f'/api/daily-challenges?limit={PAGE}&offset={index % len(pages) * PAGE}')
+                    assert response.status_code == 200, response.data
+
+                serialize_page(0)
+                rows.append({'payloads': label, 'target': f'serialize_challenge x{PAGE}',
+                             'us_per_page': time_per_call(serialize_page, args.pages)})
+                rows.append({'payloads': label, 'target': f'GET limit={PAGE}',
+                             'us_per_page': time_per_call(get_page, args.pages)})
+            metrics = daily_challenges.payload_cache_metrics()
+
+    print_rows(f'{PAGE}-item Daily page (1000-row bank)', rows)
+    print_rows('Payload cache', [metrics])
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+"""``GET /api/daily-challenges?random=1``: hydrate-all vs id probing.
+
+    python -m backend.project.scripts.bench_daily_random [--sizes 1000,100000,1000000] [--requests 50]
+
+Each bank size is seeded into a throwaway SQLite file. ``load all`` replays
+the previous random mode (every available row hydrated, then
+``random.sample``) behind the same serializer; ``id probing`` is the real
+route. Requests are anonymous with ``limit=50``, the route maximum. Peak
+memory is traced with tracemalloc, so its calls run slower than the timed
+ones. ``--skip-load-all-over`` leaves the old path out for banks too large to
+hydrate on this machine.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+
+from flask import jsonify, request
+
+from backend.project.api.daily_challenges import SCORED_CATEGORIES, seed_challenges, serialize_challenge
+from backend.project.models import db
+from backend.project.models.user import DailyChallenge
+from backend.project.scripts._bench import allocations_per_call, daily_app, print_rows, time_per_call
+
+
+def _load_all():
+    limit = int(request.args.get('limit', 10))
+    candidates = DailyChallenge.query.filter(DailyChallenge.category.in_(SCORED_CATEGORIES)).all()
+    challenges = random.sample(candidates, k=min(limit, len(candidates))) if candidates else []
+    return jsonify({
+        'challenges': [serialize_challenge(challenge) for challenge in challenges],
+        'remaining': max(len(candidates) - len(challenges), 0),
+    })
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='1000,100000,1000000')
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--skip-load-all-over', type=int, default=100_000)
+    args = parser.parse_args()
+
+    rows = []
+    for size in (int(value) for value in args.sizes.split(',')):
+        with tempfile.TemporaryDirectory() as data_dir:
+            app = daily_app(f'sqlite:///{data_dir}/bench.db')
+            app.add_url_rule('/bench/load-all', view_func=_load_all)
+            with app.app_context():
+                db.create_all()
+                seed_challenges(size, chunk_size=5000)
+            client = app.test_client()
+
+            targets = [('id probing', '/api/daily-challenges?random=1&limit=50')]
+            if size <= args.skip_load_all_over:
+                targets.insert(0, ('load all', '/bench/load-all?limit=50'))
+            for label, url in targets:
+                def get(_: int, url=url) -> None:
+                    response = client.get(url)
+                    assert response.status_code == 200, response.data
+                    assert len(response.get_json()['challenges']) == 50
+
+                calls = args.requests if label == 'id probing' or size <= 1000 else max(3, args.requests // 10)
+                rows.append({
+                    'bank_rows': size,
+                    'sampling': label,
+                    'calls': calls,
+                    'ms_per_request': round(time_per_call(get, calls) / 1000, 2),
+                    **allocations_per_call(get, max(3, calls // 5)),
+                })
+                print_rows('GET /api/daily-challenges?random=1&limit=50', rows[-1:])
+
+    print_rows('GET /api/daily-challenges?random=1&limit=50', rows)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
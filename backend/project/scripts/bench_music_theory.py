@@ -0,0 +1,50 @@
+"""Throughput of the stateless theory core and the routes built on it.
+
+    python -m backend.project.scripts.bench_music_theory [--requests 4000] [--concurrency 8]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+os.environ.setdefault('RATELIMIT_ENABLED', 'false')
+
+from backend.project.api.app import INTERVALS, app
+from backend.project.music.config import SCALE_KEYS
+from backend.project.music.theory import analyze
+from backend.project.scripts._bench import print_rows, run_load, time_per_call
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=4000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    app.config['TESTING'] = True
+    client = app.test_client()
+    combos = [(key, mode) for key in SCALE_KEYS for mode in INTERVALS]
+
+    rows = [{
+        'target': 'analyze() + progressions',
+        'calls': args.requests,
+        'concurrency': 1,
+        'per_sec': round(1_000_000 / time_per_call(
+            lambda index: analyze(*combos[index % len(combos)]).progressions, args.requests), 1),
+        'p50_ms': '',
+        'p99_ms': '',
+    }]
+    for route in ('chord-progressions', 'secondary-dominants'):
+        def call(index, route=route):
+            key, mode = combos[index % len(combos)]
+            response = client.get(f'/api/{route}/{key.replace("#", "%23")}?interval={mode}')
+            assert response.status_code == 200, response.data
+        rows.append({'target': f'/api/{route}', **run_load(call, args.requests, args.concurrency)})
+
+    print_rows('Stateless theory core', rows)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
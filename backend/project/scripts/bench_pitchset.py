@@ -0,0 +1,90 @@
+"""Per-call cost of the list scans that ``pitchset`` replaced versus the masks.
+
+    python -m backend.project.scripts.bench_pitchset [--calls 200000]
+
+Each row pairs the legacy idiom (``NOTES.index`` plus a list rebuild, ``in``
+over note names, set arithmetic over 84 candidates) with its mask form.
+"""
+from __future__ import annotations
+
+import argparse
+
+from backend.project.music import pitchset
+from backend.project.scripts._bench import print_rows, time_per_call
+
+NOTES = list(pitchset.SHARP_NAMES)
+MAJOR = list(pitchset.SCALE_INTERVALS['major'])
+MODE_INTERVALS = {mode: list(pitchset.SCALE_INTERVALS[mode]) for mode in pitchset.MODES}
+SELECTIONS = [pitchset.members(mask) for mask in range(0, pitchset.FULL + 1, 7)]
+
+
+def _legacy_transpose(index: int) -> list[str]:
+    root = NOTES[index % 12]
+    root_index = NOTES.index(root)
+    return [NOTES[(root_index + interval) % 12] for interval in MAJOR]
+
+
+def _mask_transpose(index: int) -> int:
+    return pitchset.transpose(pitchset.SCALE_MASKS['major'], pitchset.PITCH_CLASS_OF[NOTES[index % 12]])
+
+
+def _legacy_membership(index: int) -> list[bool]:
+    scale = LEGACY_SCALES[index % 12]
+    return [note in scale for note in FRETBOARD_STRING]
+
+
+def _mask_membership(index: int) -> list[bool]:
+    scale = MASK_SCALES[index % 12]
+    return [bool(scale >> pc & 1) for pc in FRETBOARD_PCS]
+
+
+def _legacy_match(index: int) -> int:
+    selected = set(SELECTIONS[index % len(SELECTIONS)])
+    best = 0
+    for root in range(12):
+        for intervals in MODE_INTERVALS.values():
+            expected = {(root + interval) % 12 for interval in intervals}
+            best = max(best, len(selected & expected) * 2 - len(selected - expected))
+    return best
+
+
+def _mask_match(index: int) -> int:
+    selected = pitchset.mask_of(SELECTIONS[index % len(SELECTIONS)])
+    popcount = pitchset.POPCOUNT
+    best = 0
+    for mode in pitchset.MODES:
+        for expected in pitchset.SCALE_ROTATIONS[mode]:
+            best = max(best, popcount[selected & expected] * 2 - popcount[selected & ~expected])
+    return best
+
+
+LEGACY_SCALES = [_legacy_transpose(index) for index in range(12)]
+MASK_SCALES = [_mask_transpose(index) for index in range(12)]
+# One 25-fret string, the inner loop of the fretboard payload.
+FRETBOARD_STRING = [NOTES[(4 + fret) % 12] for fret in range(25)]
+FRETBOARD_PCS = [(4 + fret) % 12 for fret in range(25)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=200_000)
+    args = parser.parse_args()
+
+    rows = []
+    for label, legacy, masked, calls in (
+        ('transpose major scale', _legacy_transpose, _mask_transpose, args.calls),
+        ('membership along a string', _legacy_membership, _mask_membership, args.calls),
+        ('best of 84 scale matches', _legacy_match, _mask_match, args.calls // 20),
+    ):
+        for idiom, call in (('lists', legacy), ('masks', masked)):
+            rows.append({'operation': label, 'idiom': idiom, 'calls': calls,
+                         'us_per_call': time_per_call(call, calls)})
+        rows[-1]['speedup'] = f"{rows[-2]['us_per_call'] / rows[-1]['us_per_call']:.1f}x"
+        rows[-2]['speedup'] = ''
+
+    print_rows('Pitch-class sets: lists vs 12-bit masks', rows)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,148 @@
+"""Spaced-repetition queue: replay synthetic histories, then time selection.
+
+    python -m backend.project.scripts.bench_review_queue [--users 10000] [--reviews 10000]
+        [--per-day 20] [--queries 2000]
+
+Every synthetic player answers ``--reviews`` Daily questions, ``--per-day``
+a day, ending now. Each answer picks one of the seeded bank's skills at
+random and is correct with a per-player, per-skill probability. It is fed
+through ``sm2_step`` exactly as ``complete_challenge`` feeds
+``_schedule_review``. Only the final queue state is written, one
+``skill_reviews`` row per player and skill. Then, for randomly chosen
+players:
+
+* ``_review_picks`` is the one-query pick: the ``(user_id, due_at)`` range
+  scan joined to the bank's open challenges per skill;
+* ``GET ?review=1`` is the whole review page over a 2000-row bank.
+
+The replay is single-threaded Python. At the default 10k x 10k it is
+about 100M scheduler steps, so expect minutes.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+
+import sqlalchemy as sa
+
+from backend.project.api import daily_challenges
+from backend.project.models import db
+from backend.project.models.user import DailyChallenge, SkillReview, User
+from backend.project.scripts._bench import daily_app, login_as, percentile, print_rows
+from backend.project.spaced_repetition import START_EASE, review_quality, sm2_step
+
+
+def _replay(user_id: int, skills: list[str], reviews: int, per_day: int, now: datetime) -> list[dict]:
+    rng = random.Random(user_id)
+    accuracy = {skill: rng.uniform(0.5, 0.95) for skill in skills}
+    state = {}
+    start = now - timedelta(days=reviews / per_day)
+    for step in range(reviews):
+        skill = rng.choice(skills)
+        ease, interval, repetitions, lapses, _, _ = state.get(skill, (START_EASE, 0, 0, 0, 0.0, 0.0))
+        correct = rng.random() < accuracy[skill]
+        ease, interval, repetitions = sm2_step(ease, interval, repetitions, review_quality(correct))
+        day = step / per_day
+        state[skill] = (ease, interval, repetitions, lapses + (not correct), day + interval, day)
+    return [
+        {'user_id': user_id, 'skill_id': skill, 'ease': ease, 'interval_days': interval,
+         'repetitions': repetitions, 'lapses': lapses,
+         'due_at': start + timedelta(days=due), 'last_reviewed_at': start + timedelta(days=last)}
+        for skill, (ease, interval, repetitions, lapses, due, last) in state.items()
+    ]
+
+
+def _latency_row(label: str, samples: list[float]) -> dict:
+    samples.sort()
+    return {'selection': label, 'calls': len(samples),
+            'p50_ms': round(percentile(samples, 50) * 1000, 3),
+            'p99_ms': round(percentile(samples, 99) * 1000, 3),
+            'mean_ms': round(sum(samples) / len(samples) * 1000, 3)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--reviews', type=int, default=10_000)
+    parser.add_argument('--per-day', type=int, default=20)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        app = daily_app(f'sqlite:///{data_dir}/bench.db')
+        with app.app_context():
+            db.create_all()
+            daily_challenges.seed_challenges(2000)
+            skills = sorted({row[0] for row in db.session.query(DailyChallenge.skill_id).distinct()})
+            db.session.execute(User.__table__.insert(), [
+                {'username': f'player{index}', 'email': f'player{index}@example.com', 'password_hash': 'x'}
+                for index in range(args.users)
+            ])
+            db.session.commit()
+            user_ids = [row[0] for row in db.session.query(User.id).order_by(User.id)]
+
+            now = datetime.utcnow()
+            started = time.perf_counter()
+            buffered = []
+            written = 0
+            for user_id in user_ids:
+                buffered.extend(_replay(user_id, skills, args.reviews, args.per_day, now))
+                if len(buffered) >= 50_000:
+                    db.session.execute(SkillReview.__table__.insert(), buffered)
+                    written += len(buffered)
+                    buffered = []
+            if buffered:
+                db.session.execute(SkillReview.__table__.insert(), buffered)
+                written += len(buffered)
+            db.session.commit()
+            replay_seconds = time.perf_counter() - started
+
+            captured = []
+
+            def capture(conn, cursor, statement, parameters, context, executemany):
+                captured.append((statement, parameters))
+
+            sa.event.listen(db.engine, 'before_cursor_execute', capture)
+            daily_challenges._review_picks(DailyChallenge.query, user_ids[0], args.limit, now)
+            sa.event.remove(db.engine, 'before_cursor_execute', capture)
+            statement, parameters = captured[-1]
+            plan = db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+
+            rng = random.Random(0)
+            samples = []
+            due_counts = 0
+            for _ in range(args.queries):
+                user_id = rng.choice(user_ids)
+                started = time.perf_counter()
+                due_counts += len(daily_challenges._review_picks(DailyChallenge.query, user_id, args.limit))
+                samples.append(time.perf_counter() - started)
+            rows = [_latency_row(f'_review_picks limit={args.limit}', samples)]
+
+        samples = []
+        for _ in range(max(1, args.queries // 4)):
+            client = app.test_client()
+            login_as(client, rng.choice(user_ids))
+            started = time.perf_counter()
+            response = client.get(f'/api/daily-challenges?review=1&limit={args.limit}')
+            samples.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.data
+        rows.append(_latency_row(f'GET ?review=1&limit={args.limit}', samples))
+
+    print_rows('Replay', [{'users': args.users, 'reviews_per_user': args.reviews, 'skills': len(skills),
+                           'scheduler_steps': args.users * args.reviews, 'queue_rows': written,
+                           'seconds': round(replay_seconds, 1),
+                           'mean_due_per_query': round(due_counts / args.queries, 2)}])
+    print_rows('Selection latency', rows)
+    print('\nquery plan:', '; '.join(str(row[-1]) for row in plan))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,63 @@
+"""Benchmark ``/api/scale/<key>``: per-request analysis vs the scale catalog.
+
+    python -m backend.project.scripts.bench_scale_catalog [--requests 4000] [--concurrency 8]
+
+"rebuild" serves each request the way the route used to, building a Music
+instance and running the full analysis before ``jsonify``. "catalog" is the
+live route. Both go through the full Flask stack via the test client.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+os.environ.setdefault('RATELIMIT_ENABLED', 'false')
+
+from flask import jsonify
+
+from backend.project.api.app import INTERVALS, _compute_scale_analysis, app, scale_catalog
+from backend.project.music.config import SCALE_KEYS, SCALE_OCTAVES
+from backend.project.scripts._bench import allocations_per_call, print_rows, run_load
+
+
+def _rebuild_scale_analysis(key):
+    from flask import request
+    interval_type = request.args.get('interval', 'ionian')
+    octaves = int(request.args.get('octaves', 1))
+    return jsonify(_compute_scale_analysis(key.upper(), interval_type, octaves))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=4000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    app.config['TESTING'] = True
+    app.add_url_rule('/bench/scale-rebuild/<key>', 'bench_scale_rebuild', _rebuild_scale_analysis)
+    client = app.test_client()
+
+    combos = [
+        f'{key.replace("#", "%23")}?interval={mode}&octaves={octaves}'
+        for key in SCALE_KEYS for mode in INTERVALS for octaves in SCALE_OCTAVES
+    ]
+    scale_catalog.warm()
+
+    rows = []
+    for label, prefix in (('rebuild', '/bench/scale-rebuild/'), ('catalog', '/api/scale/')):
+        def call(index, prefix=prefix):
+            response = client.get(prefix + combos[index % len(combos)])
+            assert response.status_code == 200, response.data
+        rows.append({
+            'path': label,
+            **run_load(call, args.requests, args.concurrency),
+            **allocations_per_call(call, 300),
+        })
+
+    print_rows(f'/api/scale/<key> ({len(combos)} distinct responses)', rows)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,203 @@
+"""Scale Path fragment selection: filter-and-sort vs the neighbour index.
+
+    python -m backend.project.scripts.bench_scale_fragments [--runs 2000]
+
+Each run is a 7-move journey, as ``GET /api/scale-path/run`` builds it, over
+a 22-fret route with one of the seven route modifiers. ``filter + sort`` is
+the previous ``_select_tier1_fragment`` body: it rescans the route for every
+move and sorts all eligible positions. ``index, per call`` passes
+``visited`` and rebuilds the index each move. ``index, per run`` shares one
+``RouteNeighbours`` and marks landings with ``visit``, like the route does.
+The first table times the full fragment. The second times only picking the
+six nearest eligible positions. Every journey is checked against the
+previous body first.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+
+from backend.project.api.app import _build_scale_route, _select_tier1_fragment
+from backend.project.music import fretboard
+from backend.project.scripts._bench import print_rows, time_per_call
+
+MODIFIERS = (
+    'ascending', 'descending', 'same-string', 'nearest-position',
+    'alternate-strings', 'octave-target', 'listen-first',
+)
+MOVES = 7
+
+
+def _previous_fragment(
+        positions, root_key, mode, fragment_index=0, seed=0,
+        route_modifier='nearest-position', anchor=None, visited=None):
+    """Select one deterministic movement with several physically playable choices."""
+    if len(positions) < 5:
+        return None
+    rng = random.Random(seed + fragment_index * 7919)
+    visited_keys = {
+        (position['stringIndex'], position['fret']) for position in (visited or [])
+    }
+    playable = [
+        position for position in positions
+        if 0 <= position['fret'] <= 24
+        and ((position['stringIndex'], position['fret']) not in visited_keys or position == anchor)
+    ]
+    anchor_index = (seed + fragment_index * 5) % max(1, len(playable) - 1)
+    anchor = anchor or playable[anchor_index]
+    open_midi = [40, 45, 50, 55, 59, 64]
+    anchor_midi = open_midi[anchor['stringIndex']] + anchor['fret']
+    eligible = [position for position in playable if position != anchor]
+    if route_modifier == 'same-string':
+        eligible = [position for position in eligible if position['stringIndex'] == anchor['stringIndex']]
+    elif route_modifier == 'alternate-strings':
+        eligible = [position for position in eligible if position['stringIndex'] != anchor['stringIndex']]
+    elif route_modifier == 'ascending':
+        eligible = [position for position in eligible if open_midi[position['stringIndex']] + position['fret'] > anchor_midi]
+    elif route_modifier == 'descending':
+        eligible = [position for position in eligible if open_midi[position['stringIndex']] + position['fret'] < anchor_midi]
+    elif route_modifier == 'octave-target':
+        eligible = [position for position in eligible if position['pitch'] == anchor['pitch']]
+    if not eligible:
+        eligible = [position for position in playable if position != anchor]
+    eligible.sort(key=lambda position: (
+        abs(position['fret'] - anchor['fret']) + abs(position['stringIndex'] - anchor['stringIndex']) * 2,
+        position['stringIndex'], position['fret'],
+    ))
+    choice_window = eligible[:max(1, min(6, len(eligible)))]
+    correct_gap = choice_window[(seed + fragment_index) % len(choice_window)]
+    suffix_positions = [anchor]
+
+    wrong_options = [
+        position for position in playable
+        if position != correct_gap and position['pitch'] != correct_gap['pitch']
+    ]
+    rng.shuffle(wrong_options)
+    candidates = [{**correct_gap, 'isCorrect': True}]
+    used_pitches = {correct_gap['pitch']}
+    for option in wrong_options:
+        if option['pitch'] in used_pitches:
+            continue
+        candidates.append({**option, 'isCorrect': False})
+        used_pitches.add(option['pitch'])
+        if len(candidates) == 3:
+            break
+    rng.shuffle(candidates)
+
+    direction = 'left' if correct_gap['string'] == anchor['string'] else 'up'
+    root_pitch = {'C': 0, 'C#': 1, 'DB': 1, 'D': 2, 'D#': 3, 'EB': 3, 'E': 4, 'F': 5, 'F#': 6, 'GB': 6, 'G': 7, 'G#': 8, 'AB': 8, 'A': 9, 'A#': 10, 'BB': 10, 'B': 11}.get(root_key.upper(), 0)
+    intervals = {
+        'ionian': [0, 2, 4, 5, 7, 9, 11], 'dorian': [0, 2, 3, 5, 7, 9, 10],
+        'phrygian': [0, 1, 3, 5, 7, 8, 10], 'lydian': [0, 2, 4, 6, 7, 9, 11],
+        'mixolydian': [0, 2, 4, 5, 7, 9, 10], 'aeolian': [0, 2, 3, 5, 7, 8, 10],
+        'locrian': [0, 1, 3, 5, 6, 8, 10],
+    }.get(mode, [0, 2, 4, 5, 7, 9, 11])
+    degree = intervals.index((correct_gap['pitch'] - root_pitch) % 12) + 1
+
+    return {
+        'root': root_key.upper(),
+        'mode': mode,
+        'difficulty': 1,
+        'anchor': {**anchor},
+        'suffix': [{**p} for p in suffix_positions],
+        'gap': {**correct_gap} if correct_gap else None,
+        'candidates': candidates,
+        'direction': direction,
+        'degreeClue': str(degree),
+    }
+
+
+def _previous_window(positions, anchor, visited, route_modifier):
+    playable = [position for position in positions if (position['stringIndex'], position['fret']) not in visited]
+    open_midi = [40, 45, 50, 55, 59, 64]
+    anchor_midi = open_midi[anchor['stringIndex']] + anchor['fret']
+    eligible = [position for position in playable if position != anchor]
+    if route_modifier == 'same-string':
+        eligible = [position for position in eligible if position['stringIndex'] == anchor['stringIndex']]
+    elif route_modifier == 'alternate-strings':
+        eligible = [position for position in eligible if position['stringIndex'] != anchor['stringIndex']]
+    elif route_modifier == 'ascending':
+        eligible = [position for position in eligible if open_midi[position['stringIndex']] + position['fret'] > anchor_midi]
+    elif route_modifier == 'descending':
+        eligible = [position for position in eligible if open_midi[position['stringIndex']] + position['fret'] < anchor_midi]
+    elif route_modifier == 'octave-target':
+        eligible = [position for position in eligible if position['pitch'] == anchor['pitch']]
+    if not eligible:
+        eligible = [position for position in playable if position != anchor]
+    eligible.sort(key=lambda position: (
+        abs(position['fret'] - anchor['fret']) + abs(position['stringIndex'] - anchor['stringIndex']) * 2,
+        position['stringIndex'], position['fret'],
+    ))
+    return eligible[:6]
+
+
+def _journey(select, positions, seed, modifier, shared):
+    anchor, visited = None, []
+    neighbours = fretboard.RouteNeighbours(positions) if shared else None
+    fragments = []
+    for index in range(MOVES):
+        extra = {'neighbours': neighbours} if shared else {}
+        fragment = select(positions, 'C', 'ionian', index, seed, modifier, anchor=anchor, visited=visited, **extra)
+        fragments.append(fragment)
+        anchor = fragment['gap']
+        if shared:
+            neighbours.visit(anchor)
+        else:
+            visited.append(anchor)
+    return fragments
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=2000)
+    args = parser.parse_args()
+    positions = _build_scale_route('C', 'ionian', 3, 22)
+    rng = random.Random(11)
+    journeys = [(rng.getrandbits(48), MODIFIERS[index % len(MODIFIERS)]) for index in range(args.runs)]
+
+    for seed, modifier in journeys:
+        previous = _journey(_previous_fragment, positions, seed, modifier, False)
+        assert _journey(_select_tier1_fragment, positions, seed, modifier, False) == previous, (seed, modifier)
+        assert _journey(_select_tier1_fragment, positions, seed, modifier, True) == previous, (seed, modifier)
+
+    rows = []
+    for label, select, shared in (('filter + sort', _previous_fragment, False),
+                                  ('index, per call', _select_tier1_fragment, False),
+                                  ('index, per run', _select_tier1_fragment, True)):
+        us = time_per_call(lambda index: _journey(select, positions, *journeys[index], shared), args.runs)
+        rows.append({'selection': label, 'runs': args.runs, 'us_per_run': us,
+                     'us_per_fragment': round(us / MOVES, 2)})
+
+    # Window-only: the anchors and visited sets from real journeys.
+    queries = []
+    for seed, modifier in journeys:
+        visited = []
+        for fragment in _journey(_select_tier1_fragment, positions, seed, modifier, False):
+            queries.append((fragment['anchor'], {(p['stringIndex'], p['fret']) for p in visited}, modifier))
+            visited.append(fragment['gap'])
+    indexes = [fretboard.RouteNeighbours(positions, [{'stringIndex': s, 'fret': f} for s, f in visited])
+               for _, visited, _ in queries]
+
+    def previous_window(index: int) -> None:
+        anchor, visited, modifier = queries[index]
+        _previous_window(positions, anchor, visited, modifier)
+
+    def nearest_window(index: int) -> None:
+        anchor, _, modifier = queries[index]
+        indexes[index].nearest(anchor, 6, modifier) or indexes[index].nearest(anchor, 6)
+
+    window_rows = [
+        {'window': label, 'queries': len(queries), 'us_per_query': time_per_call(call, len(queries))}
+        for label, call in (('filter + sort', previous_window), ('nearest', nearest_window))
+    ]
+
+    print_rows(f'Select a {MOVES}-move journey ({len(positions)}-position route)', rows)
+    print_rows('Six nearest eligible positions', window_rows)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
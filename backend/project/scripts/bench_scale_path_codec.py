@@ -0,0 +1,116 @@
+"""Scale Path runs as JSON vs the packed scale_path_codec blob.
+
+    python -m backend.project.scripts.bench_scale_path_codec [--runs 2000]
+
+Generates ``--runs`` runs across every root, mode and octave setting.
+``stored`` is a whole run with answers: ``json`` is what a
+``scale_path_runs`` row held (``fragments_json`` plus ``positions_json``),
+and ``packed`` is what the regenerated-run cache now holds. ``wire`` is the
+player-facing part of ``GET /api/scale-path/run``: the JSON ``positions``
+and ``fragments``, against ``packed`` as it is sent with
+``encoding=packed`` (base64). The ``gzip`` columns show how much of the
+difference a compressing proxy would already claw back. Timings are
+single-threaded means per run; ``one fragment`` is the completion lookup.
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import tracemalloc
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+
+from backend.project import scale_path_codec, scale_path_tokens
+from backend.project.api import app as scale_path
+from backend.project.scripts._bench import print_rows, time_per_call
+
+
+def _retained_bytes(build) -> int:
+    tracemalloc.start()
+    try:
+        kept = build()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return retained
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=2000)
+    args = parser.parse_args()
+
+    runs = []
+    for seed in range(args.runs):
+        root = scale_path_tokens.ROOTS[seed % len(scale_path_tokens.ROOTS)]
+        mode = scale_path_tokens.MODES[seed % len(scale_path_tokens.MODES)]
+        octaves = seed % 3 + 1
+        positions, fragments = scale_path._generate_scale_path_run(
+            seed, root, mode, octaves, scale_path_tokens.ROUTE_MODIFIERS[seed % 7],
+        )
+        public = [scale_path._public_scale_path_fragment(fragment) for fragment in fragments]
+        runs.append((root, mode, positions, fragments, positions[:60], public))
+
+    count = len(runs)
+    columns = [(json.dumps(fragments), json.dumps(positions)) for _, _, positions, fragments, _, _ in runs]
+    stored_packed = [scale_path_codec.encode_run(root, mode, positions, fragments)
+                     for root, mode, positions, fragments, _, _ in runs]
+    wire_json = [json.dumps({'positions': positions, 'fragments': public}) for *_, positions, public in runs]
+    wire_packed = [base64.b64encode(scale_path_codec.encode_run(root, mode, positions, public, with_answers=False))
+                   for root, mode, _, _, positions, public in runs]
+
+    def mean(values) -> int:
+        return round(sum(values) / count)
+
+    size_rows = []
+    stored_json = [fragments + positions for fragments, positions in columns]
+    for label, as_json, packed in (('stored', stored_json, stored_packed), ('wire', wire_json, wire_packed)):
+        json_bytes = mean(len(text.encode('utf-8')) for text in as_json)
+        packed_bytes = mean(len(blob) for blob in packed)
+        size_rows.append({
+            'run': label, 'json_bytes': json_bytes, 'packed_bytes': packed_bytes,
+            'ratio': round(json_bytes / packed_bytes, 1),
+            'json_gzip': mean(len(gzip.compress(text.encode('utf-8'))) for text in as_json),
+            'packed_gzip': mean(len(gzip.compress(blob)) for blob in packed),
+        })
+    size_rows.append({
+        'run': 'cached, resident', 'json_bytes': round(_retained_bytes(
+            lambda: [scale_path._generate_scale_path_run(seed, 'C', 'ionian', 2, 'ascending') for seed in range(1000)]
+        ) / 1000),
+        'packed_bytes': round(_retained_bytes(
+            lambda: [scale_path._scale_path_run.__wrapped__(seed, 'C', 'ionian', 2, 'ascending') for seed in range(1000)]
+        ) / 1000),
+    })
+    size_rows[-1]['ratio'] = round(size_rows[-1]['json_bytes'] / size_rows[-1]['packed_bytes'], 1)
+
+    def fragment_index(i: int) -> int:
+        return i % len(runs[i % count][3])
+
+    speed_rows = [
+        {'target': 'encode',
+         'json_us': time_per_call(lambda i: (json.dumps(runs[i % count][3]), json.dumps(runs[i % count][2])),
+                                  args.runs),
+         'packed_us': time_per_call(lambda i: scale_path_codec.encode_run(*runs[i % count][:4]), args.runs)},
+        {'target': 'decode',
+         'json_us': time_per_call(lambda i: [json.loads(column) for column in columns[i % count]], args.runs),
+         'packed_us': time_per_call(lambda i: scale_path_codec.decode_run(stored_packed[i % count]), args.runs)},
+        {'target': 'one fragment',
+         'json_us': time_per_call(lambda i: json.loads(columns[i % count][0])[fragment_index(i)], args.runs),
+         'packed_us': time_per_call(
+             lambda i: scale_path_codec.decode_fragment(stored_packed[i % count], fragment_index(i)), args.runs,
+         )},
+    ]
+    for row in speed_rows:
+        row['speedup'] = round(row['json_us'] / row['packed_us'], 1)
+
+    print_rows(f'Bytes per run ({args.runs} runs)', size_rows)
+    print_rows('Microseconds per run', speed_rows)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
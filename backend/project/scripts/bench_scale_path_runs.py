@@ -0,0 +1,126 @@
+"""Scale Path runs: stored rows vs signed, regenerated runs.
+
+    python -m backend.project.scripts.bench_scale_path_runs [--runs 2000]
+
+Starts ``--runs`` runs with random seeds against a throwaway SQLite file,
+then completes every fragment of each one. ``stored`` replays the previous
+run start: generate the run, insert a ``scale_path_runs`` row holding its
+fragments and positions as JSON, commit. Its completions go through the
+legacy-row path of ``/api/scale-path/complete``, which is the previous
+lookup and ``json.loads``. ``signed`` is the current route pair.
+``signed, cold`` clears the regenerated-run cache before each completion.
+The last table is file growth from run starts alone, scaled to 100k runs.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+
+from flask import jsonify
+from flask_login import current_user
+
+from backend.project import scale_path_codec, scale_path_tokens
+from backend.project.api import app as scale_path
+from backend.project.models import db
+from backend.project.models.user import ScalePathAttempt, ScalePathRun, User
+from backend.project.scripts._bench import daily_app, login_as, print_rows, run_load
+
+
+def _previous_run():
+    seed_text = os.urandom(8).hex()
+    seed = int.from_bytes(bytes.fromhex(seed_text)[:6], 'big')
+    root, mode, octaves, modifier = 'C', 'ionian', 2, scale_path_tokens.ROUTE_MODIFIERS[seed % 7]
+    positions, fragments = scale_path._generate_scale_path_run(seed, root, mode, octaves, modifier)
+    run_id = f'scale-path-{root}-{mode}-{int(time.time())}-{os.urandom(4).hex()}'
+    db.session.add(ScalePathRun(
+        run_id=run_id, user_id=current_user.id, root=root, mode=mode, difficulty=1, octaves=octaves,
+        fret_count=17, fragments_json=json.dumps(fragments), positions_json=json.dumps(positions),
+        expires_at=datetime.utcnow() + timedelta(hours=24),
+    ))
+    db.session.commit()
+    return jsonify({'runId': run_id, 'positions': positions[:60],
+                    'fragments': [scale_path._public_scale_path_fragment(fragment) for fragment in fragments]})
+
+
+def _answers(run_id: str) -> list[dict]:
+    token = scale_path_tokens.decode_run_token(run_id, 'bench-secret')
+    if token is not None:
+        packed = scale_path._scale_path_run(token.seed, token.root, token.mode, token.octaves, token.route_modifier)
+        _, fragments = scale_path_codec.decode_run(packed)
+    else:
+        fragments = json.loads(ScalePathRun.query.filter_by(run_id=run_id).one().fragments_json)
+    return [fragment['gap'] for fragment in fragments]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=2000)
+    args = parser.parse_args()
+
+    start_rows, complete_rows, growth_rows = [], [], []
+    for label, start_url in (('stored', '/bench/run'), ('signed', '/api/scale-path/run'),
+                             ('signed, cold', '/api/scale-path/run')):
+        with tempfile.TemporaryDirectory() as data_dir:
+            app = daily_app(f'sqlite:///{data_dir}/bench.db')
+            app.add_url_rule('/bench/run', view_func=_previous_run)
+            app.add_url_rule('/api/scale-path/run', view_func=scale_path.get_scale_path_run)
+            app.add_url_rule('/api/scale-path/complete', view_func=scale_path.complete_scale_path_fragment,
+                             methods=['POST'])
+            with app.app_context():
+                db.create_all()
+                user = User(username='player', email='player@example.com', password_hash='x')
+                db.session.add(user)
+                db.session.commit()
+                user_id = user.id
+            client = app.test_client()
+            login_as(client, user_id)
+            db_path = f'{data_dir}/bench.db'
+            empty_bytes = os.path.getsize(db_path)
+
+            run_ids = []
+
+            def start(index: int) -> None:
+                response = client.get(start_url, query_string={'root': 'C', 'mode': 'ionian', 'octaves': 2})
+                assert response.status_code == 200, response.data
+                run_ids.append(response.get_json()['runId'])
+
+            stats = run_load(start, args.runs, 1)
+            start_rows.append({'runs': label, **{key: stats[key] for key in ('calls', 'per_sec', 'p50_ms', 'p99_ms')}})
+            grown = os.path.getsize(db_path) - empty_bytes
+            growth_rows.append({'runs': label, 'run_starts': args.runs, 'bytes_per_run': round(grown / args.runs),
+                                'mib_per_100k_runs': round(grown / args.runs * 100_000 / 2**20, 1)})
+
+            with app.app_context():
+                submissions = [(run_id, index, gap) for run_id in run_ids for index, gap in enumerate(_answers(run_id))]
+
+            def complete(index: int, cold=label.endswith('cold')) -> None:
+                run_id, fragment_index, gap = submissions[index]
+                if cold:
+                    scale_path._scale_path_run.cache_clear()
+                response = client.post('/api/scale-path/complete', json={
+                    'runId': run_id, 'fragmentIndex': fragment_index,
+                    'submittedPosition': {'string': gap['string'], 'fret': gap['fret']},
+                })
+                assert response.get_json()['correct'] is True, response.data
+
+            stats = run_load(complete, len(submissions), 1)
+            complete_rows.append({'runs': label, **{key: stats[key] for key in ('calls', 'per_sec', 'p50_ms', 'p99_ms')}})
+            with app.app_context():
+                assert db.session.query(ScalePathAttempt).count() == len(submissions)
+                db.session.remove()
+                db.engine.dispose()
+
+    print_rows('Run start (GET)', start_rows)
+    print_rows('Fragment completion (POST, every fragment of every run)', complete_rows)
+    print_rows('SQLite growth from run starts', growth_rows)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
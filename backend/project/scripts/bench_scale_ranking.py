@@ -0,0 +1,60 @@
+"""Scale Lab candidate ranking: full sort of 84 keys vs heap top-k.
+
+    python -m backend.project.scripts.bench_scale_ranking [--calls 20000]
+
+``full sort`` is the previous ranking (one key tuple per candidate, sorted,
+then sliced); ``heap top-k`` is ``music_analysis._top_candidates``. Both
+rows then build the five candidate payloads, as ``analyze_scale_build``
+does. Peak allocation is measured with tracemalloc.
+"""
+from __future__ import annotations
+
+import argparse
+
+from backend.project import music_analysis
+from backend.project.music import pitchset
+from backend.project.scripts._bench import allocations_per_call, print_rows, time_per_call
+
+
+def _full_sort(selected: int) -> list:
+    popcount = pitchset.POPCOUNT
+    selected_count = popcount[selected]
+    keyed = sorted(
+        (selected != mask, 6 * (selected_count - matches) + size - 9 * matches,
+         selected_count - matches, size - matches, order)
+        for order, mask, size in music_analysis._RANKING_MASKS
+        for matches in (popcount[selected & mask],)
+    )
+    return [music_analysis._RANKING_ORDER[key[-1]] for key in keyed][:music_analysis.TOP_CANDIDATES]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=20_000)
+    args = parser.parse_args()
+
+    for selected in range(pitchset.FULL + 1):
+        assert _full_sort(selected) == music_analysis._top_candidates(selected)
+
+    rows = []
+    for label, rank in (('full sort', _full_sort), ('heap top-k', music_analysis._top_candidates)):
+        def ranked_payloads(index: int, rank=rank) -> list[dict]:
+            selected = (index * 2654435761) & pitchset.FULL
+            return [candidate.payload(selected) for candidate in rank(selected)]
+
+        def rank_only(index: int, rank=rank) -> list:
+            return rank((index * 2654435761) & pitchset.FULL)
+
+        rows.append({
+            'ranking': label,
+            'rank_us': time_per_call(rank_only, args.calls),
+            'rank_and_payloads_us': time_per_call(ranked_payloads, args.calls),
+            **allocations_per_call(rank_only, 2000),
+        })
+
+    print_rows('Scale Lab candidate ranking (84 candidates, top 5)', rows)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
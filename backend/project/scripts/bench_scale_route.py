@@ -0,0 +1,86 @@
+"""Scale Path route building: walking the neck vs the fretboard index.
+
+    python -m backend.project.scripts.bench_scale_route [--rounds 200]
+
+Each round builds the route for every key spelling in ``SCALE_KEYS``, every
+mode and every octave setting (1, 2, 3 -> 12, 17, 22 frets). ``walk`` is the
+previous ``_build_scale_route`` body, a per-call loop over 6 strings x
+``fret_count + 1`` frets. ``index`` is the current function, a cached
+lookup in ``music.fretboard``; ``index, cold`` clears the route cache
+before every round, so it pays for each table once. Every route is checked
+against the walk first.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+
+from backend.project.api.app import SCALE_ROUTE_TUNING, _build_scale_route
+from backend.project.music import fretboard, pitchset
+from backend.project.music.config import SCALE_KEYS
+from backend.project.scripts._bench import print_rows, time_per_call
+
+FRET_COUNTS = {1: 12, 2: 17, 3: 22}
+COMBINATIONS = [
+    (root, mode, octaves, fret_count)
+    for root in SCALE_KEYS for mode in pitchset.MODES for octaves, fret_count in FRET_COUNTS.items()
+]
+
+
+def _walk_route(root_key, mode, octaves, fret_count):
+    root_tone = pitchset.pitch_class(root_key[:1].upper() + root_key[1:].lower(), 0)
+    scale_mask = pitchset.transpose(
+        pitchset.SCALE_MASKS[mode if mode in pitchset.MODES else 'ionian'], root_tone,
+    )
+    positions = []
+    for string_index, string_note in enumerate(SCALE_ROUTE_TUNING):
+        base_tone = pitchset.PITCH_CLASS_OF[string_note]
+        for fret in range(fret_count + 1):
+            pos_tone = (base_tone + fret) % 12
+            if scale_mask >> pos_tone & 1:
+                positions.append({
+                    'string': string_note,
+                    'fret': fret,
+                    'note': pitchset.SHARP_NAMES[pos_tone],
+                    'stringIndex': string_index,
+                    'pitch': pos_tone,
+                })
+    return positions
+
+
+def _round(build):
+    def call(_: int) -> None:
+        for combination in COMBINATIONS:
+            build(*combination)
+    return call
+
+
+def _cold_round(_: int) -> None:
+    fretboard.scale_route.cache_clear()
+    for combination in COMBINATIONS:
+        _build_scale_route(*combination)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    for combination in COMBINATIONS:
+        assert _build_scale_route(*combination) == _walk_route(*combination), combination
+
+    rows = []
+    for label, call in (('walk', _round(_walk_route)), ('index, cold', _cold_round),
+                        ('index', _round(_build_scale_route))):
+        us = time_per_call(call, args.rounds) / len(COMBINATIONS)
+        rows.append({'route': label, 'routes': args.rounds * len(COMBINATIONS),
+                     'us_per_route': round(us, 2), 'routes_per_sec': round(1_000_000 / us)})
+
+    print_rows(f'Build one Scale Path route ({len(COMBINATIONS)} root/mode/octave combinations)', rows)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+"""Latency of Scale Lab verification: music21 per request vs the match index.
+
+    python -m backend.project.scripts.bench_scale_verify [--requests 2000] [--concurrency 8]
+
+The ``music21 per request`` row replays the work every verify used to do
+(85 scale constructions plus one ``Interval`` per selected note) so the two
+can be compared in one process. The ``C#4`` rows use a tonic spelling outside
+the index, which falls back to music21 unless the tonic LRU already holds it.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+os.environ.setdefault('RATELIMIT_ENABLED', 'false')
+
+from backend.project import music_analysis
+from backend.project.api.app import app
+from backend.project.scripts._bench import print_rows, run_load, time_per_call
+
+MODES = tuple(music_analysis.MODE_CLASSES)
+ROOTS = ('C', 'G', 'D', 'BB', 'F#', 'EB')
+_uncached_pitch_classes = music_analysis._pitch_classes.__wrapped__
+
+
+def _selection(index: int) -> list[int]:
+    mask = (index * 2654435761) & 0xFFF
+    return [pitch_class for pitch_class in range(12) if mask >> pitch_class & 1]
+
+
+def _music21_per_request(index: int) -> None:
+    root = ROOTS[index % len(ROOTS)]
+    _uncached_pitch_classes(root, MODES[index % len(MODES)])
+    for root_pc in range(12):
+        for mode_key in MODES:
+            _uncached_pitch_classes(music_analysis.NOTE_NAMES[root_pc], mode_key)
+    tonic = music_analysis._note.Note(music_analysis._music21_name(root))
+    for pitch_class in _selection(index):
+        music_analysis._interval.Interval(tonic, music_analysis._note.Note(music_analysis.NOTE_NAMES[pitch_class])).simpleName
+
+
+def _indexed(index: int) -> dict:
+    return music_analysis.analyze_scale_build(ROOTS[index % len(ROOTS)], MODES[index % len(MODES)], _selection(index))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    app.config['TESTING'] = True
+    client = app.test_client()
+
+    def verify(index: int, roots=ROOTS) -> None:
+        response = client.post('/api/scale-path/verify', json={
+            'root': roots[index % len(roots)],
+            'mode': MODES[index % len(MODES)],
+            'selectedNotes': _selection(index),
+        })
+        assert response.status_code == 200, response.data
+
+    def verify_unindexed_root(index: int) -> None:
+        verify(index, roots=('C#4',))
+
+    def verify_unindexed_root_uncached(index: int) -> None:
+        music_analysis._tonic_lookup.cache_clear()
+        verify_unindexed_root(index)
+
+    music21_calls = max(10, args.requests // 100)
+    rows = [
+        {'target': 'music21 per request', 'calls': music21_calls,
+         'us_per_call': time_per_call(_music21_per_request, music21_calls)},
+        {'target': 'analyze_scale_build (index)', 'calls': args.requests,
+         'us_per_call': time_per_call(_indexed, args.requests)},
+    ]
+    print_rows('Scale Lab analysis per call', rows)
+    music_analysis.warm_cache()
+    uncached_calls = max(10, args.requests // 100)
+    print_rows('POST /api/scale-path/verify', [
+        {'target': 'indexed roots', **run_load(verify, args.requests, args.concurrency)},
+        {'target': 'root C#4, no tonic cache', **run_load(verify_unindexed_root_uncached, uncached_calls, args.concurrency)},
+        {'target': 'root C#4, tonic cache', **run_load(verify_unindexed_root, args.requests, args.concurrency)},
+    ])
+    print_rows('Scale analysis caches', [
+        {'cache': name, **stats}
+        for name, stats in music_analysis.cache_metrics().items()
+        if isinstance(stats, dict)
+    ])
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
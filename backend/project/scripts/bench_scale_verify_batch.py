@@ -0,0 +1,73 @@
+"""Scale Lab verification: one POST per item vs ``/api/scale-path/verify-batch``.
+
+    python -m backend.project.scripts.bench_scale_verify_batch [--items 2000] [--concurrency 8]
+
+Every row verifies the same ``--items`` selections; only the number of
+items per request changes. Requests go through the full Flask stack
+(routing, CSRF check, JSON parsing) with rate limiting disabled.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+os.environ.setdefault('RATELIMIT_ENABLED', 'false')
+
+from backend.project import music_analysis
+from backend.project.api.app import app
+from backend.project.scripts._bench import print_rows, run_load
+
+MODES = tuple(music_analysis.MODE_CLASSES)
+ROOTS = ('C', 'G', 'D', 'BB', 'F#', 'EB')
+
+
+def _item(index: int) -> dict:
+    # Players converge on a handful of shapes, so selections repeat.
+    mask = (index % 97 * 2654435761) & 0xFFF
+    return {
+        'root': ROOTS[index % len(ROOTS)],
+        'mode': MODES[index % len(MODES)],
+        'selectedNotes': [pitch_class for pitch_class in range(12) if mask >> pitch_class & 1],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    app.config['TESTING'] = True
+    client = app.test_client()
+    music_analysis.warm_cache()
+
+    def single(index: int) -> None:
+        response = client.post('/api/scale-path/verify', json=_item(index))
+        assert response.status_code == 200, response.data
+
+    rows = []
+    stats = run_load(single, args.items, args.concurrency)
+    rows.append({'endpoint': 'verify', 'batch': 1, **stats,
+                 'items_per_sec': stats['per_sec'],
+                 'us_per_item': round(1_000_000 / stats['per_sec'], 1)})
+
+    for batch in (1, 10, 100):
+        def batched(index: int, batch=batch) -> None:
+            items = [_item(index * batch + offset) for offset in range(batch)]
+            response = client.post('/api/scale-path/verify-batch', json={'items': items})
+            assert response.status_code == 200, response.data
+
+        requests = max(1, args.items // batch)
+        stats = run_load(batched, requests, args.concurrency)
+        items_per_sec = stats['per_sec'] * batch
+        rows.append({'endpoint': 'verify-batch', 'batch': batch, **stats,
+                     'items_per_sec': round(items_per_sec, 1),
+                     'us_per_item': round(1_000_000 / items_per_sec, 1)})
+
+    print_rows('Scale Lab verification throughput', rows)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
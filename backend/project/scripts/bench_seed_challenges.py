@@ -0,0 +1,108 @@
+"""Daily challenge seeding: ORM ``add_all`` vs streamed chunked inserts.
+
+    python -m backend.project.scripts.bench_seed_challenges [--sizes 1000,100000,1000000] [--chunk-size 500]
+
+Each row seeds a throwaway SQLite file in a fresh subprocess, so ``peak_rss_mib``
+(``ru_maxrss``) belongs to that one run; ``setup_rss_mib`` is the same process
+after imports and ``create_all``. ``add_all`` replays the previous
+``seed_challenges`` (every ``DailyChallenge`` built in memory, one commit);
+at 1M rows it needs several GiB, so pass ``--modes`` to leave it out.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from backend.project.scripts._bench import print_rows
+
+MODES = ('add_all', 'streamed', 'streamed shadow')
+
+
+def _rss_mib() -> float:
+    # ru_maxrss is KiB on Linux.
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def _legacy_seed(target: int) -> int:
+    from backend.project.api import daily_challenges
+    from backend.project.models import db
+    from backend.project.models.user import DailyChallenge
+
+    DailyChallenge.query.delete()
+    db.session.commit()
+    challenges = [DailyChallenge(**row) for row in list(daily_challenges._challenge_rows(target))]
+    db.session.add_all(challenges)
+    db.session.commit()
+    return len(challenges)
+
+
+def _child(mode: str, target: int, chunk_size: int) -> dict:
+    os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+    from flask import Flask
+
+    from backend.project.api.daily_challenges import seed_challenges
+    from backend.project.models import db
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        app = Flask(__name__)
+        app.config.update(
+            SQLALCHEMY_DATABASE_URI=f'sqlite:///{data_dir}/seed.db',
+            SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        )
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+            setup_rss = _rss_mib()
+            started = time.perf_counter()
+            if mode == 'add_all':
+                count = _legacy_seed(target)
+            else:
+                count = seed_challenges(target, chunk_size=chunk_size, shadow=mode == 'streamed shadow')
+            elapsed = time.perf_counter() - started
+            db.session.remove()
+            db.engine.dispose()
+    assert count == target, (count, target)
+    return {
+        'seconds': round(elapsed, 2),
+        'rows_per_sec': round(target / elapsed),
+        'setup_rss_mib': setup_rss,
+        'peak_rss_mib': _rss_mib(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='1000,100000,1000000')
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--modes', default=','.join(MODES))
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'ROWS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, rows = args.child
+        print(json.dumps(_child(mode, int(rows), args.chunk_size)))
+        return 0
+
+    rows = []
+    for size in (int(value) for value in args.sizes.split(',')):
+        for mode in args.modes.split(','):
+            output = subprocess.run(
+                [sys.executable, '-m', 'backend.project.scripts.bench_seed_challenges',
+                 '--chunk-size', str(args.chunk_size), '--child', mode, str(size)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            rows.append({'rows': size, 'mode': mode, **json.loads(output.splitlines()[-1])})
+            print_rows('Daily challenge seeding', rows[-1:])
+
+    print_rows(f'Daily challenge seeding (chunk size {args.chunk_size})', rows)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,101 @@
+"""``GET /api/user/streak`` for players with years of daily history.
+
+    python -m backend.project.scripts.bench_streaks [--years 1,3,5] [--requests 200]
+
+Each player completed three challenges a day, every day, up to yesterday,
+so the whole history is one live streak (the worst case for the old walk).
+``recompute`` replays the previous handler (every distinct completion date
+loaded, then a backwards walk with ``in`` on a list, plus a
+``completed_today`` query) behind the same route plumbing; ``materialized``
+is the real route reading ``user_streaks``. The last table times
+``rebuild_streaks`` over all the players.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+
+from flask import jsonify
+from flask_login import current_user
+
+from backend.project.api.daily_challenges import rebuild_streaks
+from backend.project.models import db
+from backend.project.models.user import ChallengeAttempt, User
+from backend.project.scripts._bench import daily_app, login_as, print_rows, time_per_call
+
+
+def _recompute():
+    today = datetime.utcnow().strftime('%Y-%m-%d')
+    yesterday = (datetime.utcnow() - timedelta(days=1)).strftime('%Y-%m-%d')
+    dates = [row[0] for row in db.session.query(db.distinct(ChallengeAttempt.challenge_date)).filter(
+        ChallengeAttempt.user_id == current_user.id, ChallengeAttempt.completed == True,
+    ).order_by(ChallengeAttempt.challenge_date.desc()).all()]
+    streak = 0
+    if dates and dates[0] in (today, yesterday):
+        check = dates[0]
+        while check in dates:
+            streak += 1
+            check = (datetime.strptime(check, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+    completed_today = ChallengeAttempt.query.filter_by(
+        user_id=current_user.id, challenge_date=today, completed=True,
+    ).first() is not None
+    return jsonify({'streak': streak, 'completed_today': completed_today})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--years', default='1,3,5')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--per-day', type=int, default=3)
+    args = parser.parse_args()
+    years = [int(value) for value in args.years.split(',')]
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        app = daily_app(f'sqlite:///{data_dir}/bench.db')
+        app.add_url_rule('/bench/recompute', view_func=_recompute)
+        today = datetime.utcnow().date()
+        players = {}
+        with app.app_context():
+            db.create_all()
+            for span in years:
+                user = User(username=f'player{span}', email=f'player{span}@example.com', password_hash='x')
+                db.session.add(user)
+                db.session.flush()
+                players[span] = user.id
+                db.session.execute(ChallengeAttempt.__table__.insert(), [
+                    {'user_id': user.id, 'challenge_date': (today - timedelta(days=day)).isoformat(),
+                     'score': 10, 'completed': True, 'is_correct': True}
+                    for day in range(1, span * 365 + 1)
+                    for _ in range(args.per_day)
+                ])
+            db.session.commit()
+            started = time.perf_counter()
+            rebuilt = rebuild_streaks()
+            rebuild_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        rows = []
+        for span, user_id in players.items():
+            client = app.test_client()
+            login_as(client, user_id)
+            expected = span * 365
+            for label, url in (('recompute', '/bench/recompute'), ('materialized', '/api/user/streak')):
+                def get(_: int, url=url) -> None:
+                    response = client.get(url)
+                    assert response.get_json()['streak'] == expected, response.data
+
+                calls = args.requests if label == 'materialized' else max(5, args.requests // 20)
+                rows.append({'history_years': span, 'attempts': expected * args.per_day, 'lookup': label,
+                             'calls': calls, 'us_per_request': time_per_call(get, calls)})
+
+    print_rows('GET /api/user/streak (one live streak over the whole history)', rows)
+    print_rows('rebuild_streaks', [{'players': rebuilt, 'attempts': sum(years) * 365 * args.per_day, 'ms': rebuild_ms}])
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+"""Virtual Daily bank: rendering throughput against stored rows.
+
+    python -m backend.project.scripts.bench_virtual_bank [--rows 100000] [--calls 20000]
+
+Seeds ``--rows`` stored challenges into a throwaway SQLite file, then
+loads challenges by id three ways: ``stored`` is ``db.session.get`` on the
+seeded table, ``virtual`` renders the same bank positions from their
+virtual ids, and ``+ serialize`` adds the public payload with the payload
+cache off. The second table is what the virtual bank does not pay: seed
+time and database file size.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+
+from flask import Flask
+
+from backend.project.api import daily_challenges
+from backend.project.models import db
+from backend.project.models.user import DailyChallenge
+from backend.project.scripts._bench import print_rows, time_per_call
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--calls', type=int, default=20_000)
+    args = parser.parse_args()
+    daily_challenges.DAILY_BANK_MODE = 'virtual'
+    daily_challenges.VIRTUAL_BANK_SIZE = args.rows
+    daily_challenges.CHALLENGE_PAYLOAD_CACHE_SIZE = 0
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        app = Flask(__name__)
+        app.config.update(SQLALCHEMY_DATABASE_URI=f'sqlite:///{data_dir}/bench.db',
+                          SQLALCHEMY_TRACK_MODIFICATIONS=False)
+        db.init_app(app)
+        with app.app_context(), app.test_request_context():
+            db.create_all()
+            started = time.perf_counter()
+            daily_challenges.seed_challenges(args.rows, chunk_size=5000)
+            seed_seconds = time.perf_counter() - started
+            db_mib = os.path.getsize(f'{data_dir}/bench.db') / 2**20
+
+            rng = random.Random(7)
+            positions = [rng.randrange(args.rows) for _ in range(args.calls)]
+            stored_ids = [position + 1 for position in positions]
+            virtual_ids = [daily_challenges.virtual_challenge_id(*daily_challenges.bank_position(args.rows, position))
+                           for position in positions]
+
+            def stored(index: int) -> None:
+                db.session.get(DailyChallenge, stored_ids[index])
+                db.session.expunge_all()
+
+            def stored_serialized(index: int) -> None:
+                daily_challenges.serialize_challenge(db.session.get(DailyChallenge, stored_ids[index]))
+                db.session.expunge_all()
+
+            def virtual(index: int) -> None:
+                daily_challenges.load_challenge(virtual_ids[index])
+
+            def virtual_serialized(index: int) -> None:
+                daily_challenges.serialize_challenge(daily_challenges.load_challenge(virtual_ids[index]))
+
+            rows = []
+            for label, call in (('stored', stored), ('virtual', virtual),
+                                ('stored + serialize', stored_serialized),
+                                ('virtual + serialize', virtual_serialized)):
+                us = time_per_call(call, args.calls)
+                rows.append({'load': label, 'calls': args.calls, 'us_per_challenge': us,
+                             'challenges_per_sec': round(1_000_000 / us)})
+            db.session.remove()
+            db.engine.dispose()
+
+    print_rows(f'Load one challenge by id ({args.rows}-row bank, payload cache off)', rows)
+    print_rows('Stored bank cost the virtual bank skips', [{
+        'rows': args.rows, 'seed_seconds': round(seed_seconds, 2), 'sqlite_file_mib': round(db_mib, 1),
+        'bytes_per_row': round(db_mib * 2**20 / args.rows),
+    }])
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,41 @@
+"""Regenerate ``scale_match_index.json`` for the Scale Lab verify endpoint.
+
+    python -m backend.project.scripts.build_scale_match_index [--check]
+
+This is the only place music21 runs for verify: it spells the 84 candidate
+scales (12 roots x 7 modes) and the interval from every indexed tonic
+spelling to each pitch class. ``--check`` exits non-zero when the bundled
+file is stale, for CI or after a music21 upgrade.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from backend.project import music_analysis
+
+
+def render(index: dict) -> str:
+    return json.dumps(index, indent=1, ensure_ascii=False) + '\n'
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--check', action='store_true', help='fail instead of writing when the file is stale')
+    args = parser.parse_args()
+
+    rendered = render(music_analysis.build_match_index())
+    path = music_analysis._INDEX_PATH
+    if args.check:
+        if path.read_text(encoding='utf-8') != rendered:
+            print(f'{path} is stale; rerun without --check', file=sys.stderr)
+            return 1
+        return 0
+    path.write_text(rendered, encoding='utf-8')
+    print(f'wrote {path}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,37 @@
+"""Materialize ``user_streaks`` rows from Daily challenge history.
+
+    python -m backend.project.scripts.rebuild_streaks [--all] [--batch-size 500]
+
+Runs against the configured database (``DATABASE_URL`` or the default SQLite
+file). The app fills in missing rows on boot; ``--all`` recomputes every
+player, for example after repairing ``challenge_attempts`` by hand. Each
+batch commits, so the command is safe to interrupt and rerun.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+
+from backend.project.api.app import app
+from backend.project.api.daily_challenges import STREAK_REBUILD_BATCH_SIZE, rebuild_streaks
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--all', action='store_true', help='recompute players that already have a row')
+    parser.add_argument('--batch-size', type=int, default=STREAK_REBUILD_BATCH_SIZE)
+    args = parser.parse_args()
+
+    def report(rebuilt: int, last_user_id: int) -> None:
+        print(f'{rebuilt} streaks written, through user {last_user_id}', flush=True)
+
+    with app.app_context():
+        rebuilt = rebuild_streaks(args.batch_size, only_missing=not args.all, progress=report)
+    print(f'done: {rebuilt} streaks written')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,43 @@
+"""Delete expired Scale Path runs and dead attempts, archiving attempt totals.
+
+    python -m backend.project.scripts.sweep_scale_path_runs [--max-lock-ms 50] [--no-archive]
+
+Runs against the configured database (``DATABASE_URL`` or the default SQLite
+file). The app sweeps on boot and then every
+``PYMUSIC_SCALE_PATH_SWEEP_INTERVAL`` seconds. This script is for a first
+pass over a large backlog. It is safe to rerun: each batch commits on its
+own, and swept rows are gone.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+
+os.environ.setdefault('PYMUSIC_DISABLE_BACKGROUND_INIT', '1')
+
+from backend.project.api.app import app
+from backend.project.scale_path_retention import SWEEP_BATCH_SIZE, SWEEP_MAX_LOCK_MS, sweep_scale_path_retention
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--batch-size', type=int, default=SWEEP_BATCH_SIZE)
+    parser.add_argument('--max-lock-ms', type=float, default=SWEEP_MAX_LOCK_MS)
+    parser.add_argument('--no-archive', action='store_true')
+    args = parser.parse_args()
+
+    def report(table: str, deleted: int, last_id: int) -> None:
+        print(f'{table}: {deleted} rows deleted, through id {last_id}', flush=True)
+
+    with app.app_context():
+        stats = sweep_scale_path_retention(batch_size=args.batch_size, max_lock_ms=args.max_lock_ms,
+                                           archive=not args.no_archive, progress=report)
+    lock_ms = sorted(stats['lock_ms']) or [0.0]
+    print(f"done: {stats['runs_deleted']} runs and {stats['attempts_deleted']} attempts deleted, "
+          f"{stats['days_archived']} daily totals archived in {stats['seconds']:.1f}s; "
+          f"{len(stats['lock_ms'])} batches, longest write lock {lock_ms[-1]:.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
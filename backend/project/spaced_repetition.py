@@ -0,0 +1,40 @@
+"""SM-2 review scheduling for Daily challenge skills.
+
+Pure arithmetic; `api/daily_challenges.py` keeps the per-user state in
+`SkillReview` rows and feeds them from challenge completions.
+"""
+
+START_EASE = 2.5
+MIN_EASE = 1.3
+MAX_INTERVAL_DAYS = 365
+
+# A Daily answer is only right or wrong, so it maps onto two SM-2 grades:
+# a correct answer keeps the ease as it is, a miss lowers it and restarts.
+QUALITY_CORRECT = 4
+QUALITY_INCORRECT = 1
+
+
+def review_quality(correct):
+    return QUALITY_CORRECT if correct else QUALITY_INCORRECT
+
+
+def sm2_step(ease, interval_days, repetitions, quality):
+    """Return ``(ease, interval_days, repetitions)`` after one review.
+
+    `quality` is the SM-2 grade from 0 to 5; 3 and above is a pass.
+    Intervals are whole days, capped at `MAX_INTERVAL_DAYS`.
+    """
+    if quality >= 3:
+        if repetitions == 0:
+            interval_days = 1
+        elif repetitions == 1:
+            interval_days = 6
+        else:
+            interval_days = min(round(interval_days * ease), MAX_INTERVAL_DAYS)
+        repetitions += 1
+    else:
+        repetitions = 0
+        interval_days = 1
+    miss = 5 - quality
+    ease = max(MIN_EASE, ease + 0.1 - miss * (0.08 + miss * 0.02))
+    return ease, interval_days, repetitions
@@ -1,14 +1,20 @@
 import json
 import os
+import random
 import tempfile
+import threading
 import unittest
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from types import SimpleNamespace
+from unittest.mock import patch
 
+import sqlalchemy as sa
 from flask import Flask
 
 from backend.project.tests._test_env import get_test_password
 
+from backend.project.api import daily_challenges
 from backend.project.api.daily_challenges import (
     SCALE_FORMULAS, _utc_hint_state, build_ear_exercise, daily_bp, seed_challenges,
 )
@@ -17,9 +23,10 @@ from backend.project.api.living_city import living_city_bp
 from backend.project.auth import auth_bp, login_manager
 from backend.project.daily_challenge_explanations import build_daily_challenge_explanation
 from backend.project.extensions import limiter
+from backend.project.spaced_repetition import sm2_step
 from backend.project.models import bcrypt, db
 from backend.project.models.user import (
-    ChallengeAttempt, DailyChallenge, DailyHintUsage, User, run_migrations,
+    ChallengeAttempt, DailyChallenge, DailyHintReveal, DailyHintUsage, QuestProgress, SkillReview, User, UserStreak, run_migrations,
 )
 
 
@@ -137,6 +144,207 @@ class DailyChallengeFlowTest(unittest.TestCase):
             ).count()
         self.assertEqual(attempts, 2)
 
+    def test_keyset_pages_skip_completed_challenges(self):
+        self._register_user()
+        completion = self.client.post('/api/daily-challenge/1/complete', json={'submitted_answer': 0})
+        self.assertEqual(completion.status_code, 200, completion.get_data(as_text=True))
+
+        seen, remaining, cursor = [], [], ''
+        while True:
+            page = self.client.get(f'/api/daily-challenges?limit=1&after={cursor}').get_json()
+            seen.extend(challenge['id'] for challenge in page['challenges'])
+            remaining.append(page['remaining'])
+            self.assertEqual((page['total'], page['completed']), (4, 1))
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, [2, 3, 4])
+        self.assertEqual(remaining, [2, 1, 0])
+        self.assertEqual(self.client.get('/api/daily-challenges?after=oops').status_code, 400)
+
+    def test_random_mode_samples_only_available_rows_by_probing_or_id_list(self):
+        self._register_user()
+        self.client.post('/api/daily-challenge/2/complete', json={'submitted_answer': 0})
+
+        for density in (0.0, 1.0):  # probe ids in range / sample the id list
+            with self.subTest(min_density=density), \
+                    patch.object(daily_challenges, 'RANDOM_PROBE_MIN_DENSITY', density):
+                page = self.client.get('/api/daily-challenges?random=1&limit=50&exclude_ids=4').get_json()
+                self.assertEqual(sorted(c['id'] for c in page['challenges']), [1, 3])
+                self.assertEqual(page['remaining'], 0)
+                one = self.client.get('/api/daily-challenges?random=1&limit=1').get_json()
+                self.assertIn(one['challenges'][0]['id'], (1, 3, 4))
+                self.assertEqual(one['remaining'], 2)
+
+    def test_serialized_payloads_are_cached_until_the_bank_is_reseeded(self):
+        daily_challenges.clear_payload_cache()
+        before = daily_challenges.payload_cache_metrics()
+        first = self.client.get('/api/daily-challenges?limit=4').get_json()['challenges']
+        second = self.client.get('/api/daily-challenges?limit=4').get_json()['challenges']
+        after = daily_challenges.payload_cache_metrics()
+
+        self.assertEqual(first, second)
+        self.assertEqual((after['misses'] - before['misses'], after['hits'] - before['hits']), (4, 4))
+        self.assertEqual(after['size'], 4)
+        self.assertTrue(all('correct_index' not in challenge for challenge in second))
+
+        # Answer exposure is per app, so it is applied to cached payloads too.
+        self.app.config['E2E_EXPOSE_ANSWERS'] = True
+        exposed = self.client.get('/api/daily-challenges?limit=4').get_json()['challenges']
+        self.assertEqual([challenge['correct_index'] for challenge in exposed], [0, 0, 0, 0])
+
+        with self.app.app_context():
+            seed_challenges(20)
+        self.assertEqual(daily_challenges.payload_cache_metrics()['size'], 0)
+
+    def test_listing_legacy_rows_never_writes_and_backfill_persists_their_metadata(self):
+        legacy_columns = ('skill_id', 'modality', 'rank_band_min', 'rank_band_max', 'difficulty_axis', 'stimulus_version')
+        with self.app.app_context():
+            for challenge in DailyChallenge.query.filter(DailyChallenge.id.in_([2, 3])):
+                for column in legacy_columns:
+                    setattr(challenge, column, None)
+            # Blank question types fall back to "generic" in SQL as they do in Python.
+            db.session.get(DailyChallenge, 3).question_type = ''
+            db.session.commit()
+            engine = db.engine
+        self._register_user()
+
+        writes = []
+
+        def record_writes(conn, cursor, statement, *args):
+            if statement.lstrip().split(None, 1)[0].upper() in {'INSERT', 'UPDATE', 'DELETE'}:
+                writes.append(statement)
+
+        sa.event.listen(engine, 'before_cursor_execute', record_writes)
+        try:
+            listed = self.client.get('/api/daily-challenges?limit=10').get_json()['challenges']
+            self.client.get('/api/daily-challenges?random=1&limit=10')
+        finally:
+            sa.event.remove(engine, 'before_cursor_execute', record_writes)
+
+        self.assertEqual(writes, [])
+        served = {challenge['id']: [challenge[column] for column in legacy_columns] for challenge in listed}
+        self.assertEqual(served[2], ['scales.generic', 'locate', 'unranked', 'legendary', 'root', 2])
+        self.assertTrue(served[3][0].endswith('.generic'))
+
+        with self.app.app_context():
+            self.assertEqual(daily_challenges.backfill_challenge_metadata(batch_size=1), 2)
+            self.assertEqual(daily_challenges.backfill_challenge_metadata(), 0)
+            stored = {
+                challenge.id: [getattr(challenge, column) for column in legacy_columns]
+                for challenge in DailyChallenge.query.all()
+            }
+        self.assertEqual(stored, served)
+
+    def test_streak_is_materialized_from_history_and_advanced_by_completion(self):
+        self._register_user()
+        today = datetime.utcnow().date()
+        # An older 5-day run, a gap, then a 3-day run ending yesterday.
+        history = [today - timedelta(days=offset) for offset in (1, 2, 3, 10, 11, 12, 13, 14)]
+        with self.app.app_context():
+            user_id = User.query.filter_by(username='player').one().id
+            for day in history + [today - timedelta(days=2)]:
+                db.session.add(ChallengeAttempt(
+                    user_id=user_id, challenge_date=day.isoformat(), score=10, completed=True, is_correct=True,
+                ))
+            db.session.commit()
+
+        legacy = self.client.get('/api/user/streak').get_json()
+        self.assertEqual((legacy['streak'], legacy['longest_streak'], legacy['completed_today']), (3, 5, False))
+
+        with self.app.app_context():
+            self.assertEqual(daily_challenges.rebuild_streaks(), 1)
+            self.assertEqual(daily_challenges.rebuild_streaks(), 0)
+            row = db.session.get(UserStreak, user_id)
+            self.assertEqual((row.current_streak, row.longest_streak), (3, 5))
+        self.assertEqual(self.client.get('/api/user/streak').get_json(), legacy)
+
+        self.client.post('/api/daily-challenge/1/complete', json={'submitted_answer': 0})
+        self.client.post('/api/daily-challenge/2/complete', json={'submitted_answer': 1})
+        streak = self.client.get('/api/user/streak').get_json()
+        self.assertEqual(streak, {'streak': 4, 'longest_streak': 5, 'completed_today': True})
+
+        with self.app.app_context():
+            self.assertEqual(daily_challenges.rebuild_streaks(only_missing=False), 1)
+        self.assertEqual(self.client.get('/api/user/streak').get_json(), streak)
+
+    def test_completion_upserts_attempt_and_quest_counters_once_per_challenge(self):
+        self._register_user()
+        with self.app.app_context():
+            user_id = User.query.filter_by(username='player').one().id
+            # A legacy unfinished attempt is completed in place by the upsert.
+            db.session.add(ChallengeAttempt(user_id=user_id, challenge_id=1, challenge_date='2020-01-01'))
+            db.session.commit()
+            statements = []
+
+            def record(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            sa.event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            first = self.client.post('/api/daily-challenge/1/complete', json={'submitted_answer': 0}).get_json()
+        finally:
+            with self.app.app_context():
+                sa.event.remove(db.engine, 'before_cursor_execute', record)
+        second = self.client.post('/api/daily-challenge/2/complete', json={'submitted_answer': 0}).get_json()
+        repeat = self.client.post('/api/daily-challenge/1/complete', json={'submitted_answer': 0}).get_json()
+
+        self.assertEqual((first['xp_awarded'], second['xp_awarded']), (100, 100))
+        self.assertEqual((repeat['xp_awarded'], repeat['already_completed'], repeat['xp']), (0, True, 200))
+        self.assertEqual(len([sql for sql in statements if 'quest_progress' in sql]), 1)
+        self.assertEqual(len([sql for sql in statements if 'INTO challenge_attempts' in sql]), 1)
+        today = datetime.utcnow().strftime('%Y-%m-%d')
+        with self.app.app_context():
+            attempts = ChallengeAttempt.query.filter_by(user_id=user_id).order_by(ChallengeAttempt.challenge_id).all()
+            self.assertEqual([(a.challenge_id, a.completed, a.challenge_date) for a in attempts],
+                             [(1, True, today), (2, True, today)])
+            counts = {(row.metric, row.period_key): row.count for row in QuestProgress.query.filter_by(user_id=user_id)}
+        self.assertEqual(counts, {('play', today): 2, ('correct', today): 2,
+                                  ('play', 'lifetime'): 2, ('correct', 'lifetime'): 2})
+
+    def test_completions_feed_the_review_queue_and_review_pages_lead_with_due_skills(self):
+        self.assertEqual([sm2_step(2.5, interval, reps, 4)[1:] for interval, reps in ((0, 0), (1, 1), (6, 2))],
+                         [(1, 1), (6, 2), (15, 3)])
+        self.assertEqual(sm2_step(2.5, 15, 3, 1), (1.96, 1, 0))
+        self._register_user()
+        with self.app.app_context():
+            user_id = User.query.filter_by(username='player').one().id
+            extra = DailyChallenge(
+                category='scales', title='Scale Question 5', question='Which scale is this? 5',
+                options_json='["Major", "Minor"]', correct_index=0, difficulty=3,
+                skill_id='scales.identify.2', stimulus_version=2,
+            )
+            db.session.add(extra)
+            db.session.commit()
+            extra_id = extra.id
+
+        self.client.post('/api/daily-challenge/1/complete', json={'submitted_answer': 0})
+        self.client.post('/api/daily-challenge/2/complete', json={'submitted_answer': 1})
+        with self.app.app_context():
+            reviews = {row.skill_id: row for row in SkillReview.query.filter_by(user_id=user_id)}
+            self.assertEqual(set(reviews), {'scales.identify.1', 'scales.identify.2'})
+            passed, missed = reviews['scales.identify.1'], reviews['scales.identify.2']
+            self.assertEqual((passed.repetitions, passed.interval_days, passed.lapses), (1, 1, 0))
+            self.assertEqual((missed.repetitions, missed.interval_days, missed.lapses), (0, 1, 1))
+            self.assertAlmostEqual(missed.ease, 1.96)
+            self.assertEqual(daily_challenges._review_picks(DailyChallenge.query, user_id, 10), [])
+            later = datetime.utcnow() + timedelta(days=2)
+            self.assertEqual([challenge.id for challenge in
+                              daily_challenges._review_picks(DailyChallenge.query, user_id, 10, later)], [1, 2])
+            # Skill 1 is the most overdue, but its only challenge is answered.
+            passed.due_at = datetime.utcnow() - timedelta(hours=2)
+            missed.due_at = datetime.utcnow() - timedelta(hours=1)
+            db.session.commit()
+
+        page = self.client.get('/api/daily-challenges?review=1&limit=2').get_json()
+        self.assertEqual([challenge['id'] for challenge in page['challenges']], [extra_id, 3])
+        self.assertIsNone(page['next_cursor'])
+        page = self.client.get('/api/daily-challenges?review=1&limit=1').get_json()
+        self.assertEqual([challenge['id'] for challenge in page['challenges']], [extra_id])
+        regular = self.client.get('/api/daily-challenges?limit=2').get_json()
+        self.assertEqual([challenge['id'] for challenge in regular['challenges']], [3, 4])
+
     def test_completion_rejects_incorrect_answer_with_zero_xp(self):
         self._register_user()
         first = self.client.get('/api/daily-challenges?random=1&limit=1').get_json()['challenges'][0]
@@ -252,6 +460,19 @@ class DailyChallengeFlowTest(unittest.TestCase):
         self.assertEqual(len(payload['challenges']), 1)
         self.assertGreaterEqual(payload['total'], 200)
 
+    def test_a_bank_seeded_by_another_worker_is_not_reseeded(self):
+        with self.app.app_context():
+            DailyChallenge.query.delete()
+            db.session.commit()
+            self.assertEqual(daily_challenges._bank_totals()[1], 0)
+            # Another worker seeds; this process's caches are not told.
+            self._seed_challenges()
+            seeded_ids = [row.id for row in DailyChallenge.query.order_by(DailyChallenge.id)]
+
+        payload = self.client.get('/api/daily-challenges?limit=10').get_json()
+        self.assertEqual(payload['total'], 4)
+        self.assertEqual([challenge['id'] for challenge in payload['challenges']], seeded_ids)
+
     def test_generated_hints_do_not_reveal_correct_answer(self):
         with self.app.app_context():
             DailyChallenge.query.delete()
@@ -277,6 +498,88 @@ class DailyChallengeFlowTest(unittest.TestCase):
 
         self.assertEqual(leaks, [])
 
+    def test_seed_streams_chunks_and_shadow_swap_matches_direct_seed(self):
+        def snapshot():
+            return [
+                (row.id, row.category, row.question, row.options_json, row.correct_index, row.visual_json)
+                for row in DailyChallenge.query.order_by(DailyChallenge.id)
+            ]
+
+        with self.app.app_context():
+            reports = []
+            self.assertEqual(seed_challenges(250, chunk_size=100, progress=lambda *args: reports.append(args)), 250)
+            self.assertEqual(reports, [(100, 250), (200, 250), (250, 250)])
+            direct = snapshot()
+
+            self.assertEqual(seed_challenges(250, chunk_size=64, shadow=True), 250)
+            self.assertEqual(snapshot(), direct)
+            self.assertNotIn('daily_challenges_shadow', db.inspect(db.engine).get_table_names())
+
+    def test_bank_generation_uses_independent_streams_per_question(self):
+        state = random.getstate()
+        full = list(daily_challenges._challenge_rows(400))
+        self.assertEqual(random.getstate(), state)
+        slices = [row for start in range(0, 400, 70) for row in daily_challenges._challenge_rows(400, start, start + 70)]
+        self.assertEqual(slices, full)
+        self.assertEqual(list(daily_challenges._parallel_challenge_rows(400, workers=2, slice_size=90)), full)
+
+        category, index = daily_challenges.bank_position(400, 250)
+        self.assertEqual((category, index), ('intervals', 10))
+        regenerated = daily_challenges._challenge_row(daily_challenges.generate_question(category, index))
+        self.assertEqual(regenerated, full[250])
+        self.assertNotEqual(list(daily_challenges._challenge_rows(400, seed=7)), full)
+        for generate in (daily_challenges.generate_theory_questions, daily_challenges.generate_general_questions):
+            self.assertEqual(list(generate(3, start=40)), list(generate(43))[40:])
+
+    def test_virtual_challenges_render_the_seeded_rows(self):
+        with self.app.app_context():
+            seed_challenges(300)
+            seeded = DailyChallenge.query.order_by(DailyChallenge.id).all()
+            with patch.object(daily_challenges, 'DAILY_BANK_MODE', 'virtual'):
+                for position, row in enumerate(seeded):
+                    category, index = daily_challenges.bank_position(300, position)
+                    virtual_id = daily_challenges.virtual_challenge_id(category, index)
+                    virtual = daily_challenges.load_challenge(virtual_id)
+                    self.assertEqual(virtual.id, virtual_id)
+                    stored, rendered = row.to_dict(), virtual.to_dict()
+                    stored.pop('id'), rendered.pop('id')
+                    self.assertEqual(rendered, stored)
+                    if category != 'ear_training':
+                        # Ear-training exercises derive from the id itself.
+                        payload = daily_challenges.serialize_challenge(virtual)
+                        self.assertEqual({**payload, 'id': row.id}, daily_challenges.serialize_challenge(row))
+            self.assertIsNone(daily_challenges.load_challenge(virtual_id))
+            self.assertIsNone(daily_challenges.virtual_challenge_key(daily_challenges.VIRTUAL_ID_BASE - 1))
+
+    def test_virtual_bank_serves_pages_and_persists_only_attempts(self):
+        self._register_user()
+        with patch.multiple(daily_challenges, DAILY_BANK_MODE='virtual', VIRTUAL_BANK_SIZE=1000):
+            first = self.client.get('/api/daily-challenges?limit=3').get_json()
+            ids = [challenge['id'] for challenge in first['challenges']]
+            base = daily_challenges.VIRTUAL_ID_BASE
+            self.assertEqual(ids, [base, base + 1, base + 2])
+            self.assertEqual((first['total'], first['next_cursor']), (1000, str(base + 2)))
+
+            complete = self.client.post(f'/api/daily-challenge/{base + 3}/complete', json={'submitted_answer': 0})
+            self.assertEqual(complete.status_code, 200, complete.get_data(as_text=True))
+            hint = self.client.post(f'/api/daily-challenge/{base + 4}/hint')
+            self.assertEqual(hint.status_code, 200, hint.get_data(as_text=True))
+            following = self.client.get(f'/api/daily-challenges?limit=2&after={first["next_cursor"]}').get_json()
+            self.assertEqual([challenge['id'] for challenge in following['challenges']], [base + 4, base + 5])
+            self.assertEqual((following['completed'], following['remaining']), (1, 1000 - 3 - 1 - 2))
+
+            random_page = self.client.get(f'/api/daily-challenges?random=1&limit=20&exclude_ids={base}').get_json()
+            random_ids = {challenge['id'] for challenge in random_page['challenges']}
+            self.assertEqual(len(random_ids), 20)
+            self.assertFalse(random_ids & {base, base + 3})
+            self.assertTrue(all(daily_challenges.virtual_challenge_key(challenge_id) for challenge_id in random_ids))
+
+            self.assertEqual(self.client.get('/api/daily-challenges?after=12').status_code, 400)
+            self.assertEqual(self.client.post(f'/api/daily-challenge/{base + 5000}/hint').status_code, 404)
+        with self.app.app_context():
+            self.assertEqual(DailyChallenge.query.count(), 4)
+            self.assertEqual(ChallengeAttempt.query.one().challenge_id, base + 3)
+
     def test_seeded_questions_persist_typed_visuals_and_correct_mode_formulas(self):
         self.assertEqual(SCALE_FORMULAS['lydian'], [0, 2, 4, 6, 7, 9, 11])
         self.assertEqual(SCALE_FORMULAS['mixolydian'], [0, 2, 4, 5, 7, 9, 10])
@@ -331,6 +634,35 @@ class DailyChallengeFlowTest(unittest.TestCase):
         with self.app.app_context():
             self.assertEqual(DailyHintUsage.query.one().used_count, 1)
 
+    def test_simultaneous_hint_reveals_never_overspend_the_daily_limit(self):
+        self._register_user()
+        with self.app.app_context():
+            user_id = User.query.filter_by(username='player').one().id
+        self.assertEqual(self.client.get('/api/daily-challenges').get_json()['hint_allowance']['remaining'], 2)
+        barrier = threading.Barrier(100)
+
+        def reveal(index):
+            client = self.app.test_client()
+            with client.session_transaction() as session:
+                session['_user_id'] = str(user_id)
+                session['_fresh'] = True
+            barrier.wait()
+            response = client.post(f'/api/daily-challenge/{index % 4 + 1}/hint')
+            return response.status_code, response.get_json()
+
+        with ThreadPoolExecutor(max_workers=100) as pool:
+            responses = list(pool.map(reveal, range(100)))
+
+        self.assertEqual({status for status, _ in responses} - {200, 429}, set(), responses)
+        spent = [body for status, body in responses if status == 200 and not body['already_revealed']]
+        self.assertEqual(len(spent), 2)
+        self.assertEqual(sorted(body['remaining'] for body in spent), [0, 1])
+        with self.app.app_context():
+            self.assertEqual(DailyHintUsage.query.one().used_count, 2)
+            self.assertEqual(DailyHintReveal.query.count(), 2)
+        # The list endpoint reads the spend from this process's allowance cache.
+        self.assertEqual(self.client.get('/api/daily-challenges').get_json()['hint_allowance']['remaining'], 0)
+
     def test_hint_allowance_uses_rank_boundaries_and_utc_dates(self):
         with self.app.app_context():
             user = User()
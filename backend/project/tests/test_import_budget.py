@@ -0,0 +1,82 @@
+"""Cold-import regression guard for the Flask app.
+
+Fly machines stop when idle and cold-start on the first request, so the
+import of ``backend.project.api.app`` is on the critical path to the first
+healthy ``/api/health``. The budget can be tuned per machine with
+``PYMUSIC_IMPORT_BUDGET_MS``.
+"""
+import os
+import re
+import subprocess
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.project.lazy import lazy_module
+
+IMPORT_BUDGET_MS = int(os.getenv('PYMUSIC_IMPORT_BUDGET_MS', '3000'))
+DEFERRED_STACKS = ('langchain', 'langchain_core', 'langchain_openai', 'langchain_community',
+                   'openai', 'pydantic', 'music21', 'rich')
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)$')
+
+
+def _cold_import():
+    probe = 'import sys, backend.project.api.app; print(" ".join(sorted(sys.modules)))'
+    env = dict(os.environ, PYMUSIC_DISABLE_BACKGROUND_INIT='1')
+    return subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', probe],
+        capture_output=True, text=True, check=True, env=env,
+        cwd=Path(__file__).resolve().parents[3],
+    )
+
+
+class AppImportBudgetTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.result = _cold_import()
+
+    def test_cold_import_stays_within_budget(self):
+        cumulative_us = {
+            match.group(4): int(match.group(2))
+            for match in map(_IMPORTTIME_LINE.match, self.result.stderr.splitlines())
+            if match
+        }
+        app_ms = cumulative_us['backend.project.api.app'] / 1000
+        self.assertLessEqual(app_ms, IMPORT_BUDGET_MS, f'app import took {app_ms:.0f} ms')
+
+    def test_heavy_stacks_are_deferred(self):
+        loaded = {name.split('.')[0] for name in self.result.stdout.split()}
+        self.assertEqual(loaded & set(DEFERRED_STACKS), set())
+
+
+class LazyModuleTest(unittest.TestCase):
+    def test_module_loads_on_first_attribute_access(self):
+        sys.modules.pop('colorsys', None)
+        proxy = lazy_module('colorsys')
+        self.assertFalse(proxy.loaded)
+        self.assertEqual(proxy.rgb_to_hsv(1.0, 0.0, 0.0), (0.0, 1.0, 1.0))
+        self.assertTrue(proxy.loaded)
+
+
+class LazyLlmStartTest(unittest.TestCase):
+    def test_first_health_check_starts_the_llm_once(self):
+        with patch.dict(os.environ, {'PYMUSIC_DISABLE_BACKGROUND_INIT': '1'}):
+            from backend.project.api import app as app_module
+
+            client = app_module.app.test_client()
+        started = []
+        with patch.object(app_module, '_llm_started', False), \
+                patch.object(app_module, '_init_llm_background', lambda: started.append(True)), \
+                patch.dict(os.environ, {'PYMUSIC_DISABLE_BACKGROUND_INIT': '0'}):
+            for _ in range(3):
+                self.assertEqual(client.get('/api/health').status_code, 200)
+            for thread in threading.enumerate():
+                if thread is not threading.current_thread() and thread.daemon:
+                    thread.join(timeout=1)
+        self.assertEqual(started, [True])
+
+
+if __name__ == '__main__':
+    unittest.main()
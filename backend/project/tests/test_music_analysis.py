@@ -1,5 +1,15 @@
+import json
+import os
 import unittest
+from unittest.mock import patch
 
+from music21 import interval, note
+
+os.environ['PYMUSIC_DISABLE_BACKGROUND_INIT'] = '1'
+
+from backend.project import music_analysis
+from backend.project.api.app import app
+from backend.project.extensions import limiter
 from backend.project.music_analysis import analyze_scale_build
 
 
@@ -24,5 +34,146 @@ class Music21ScaleAnalysisTest(unittest.TestCase):
             analyze_scale_build('C', 'ionian', [0, 12])
 
 
+class _Music21Reference:
+    """The pre-index algorithm, with music21 consulted once per input."""
+
+    def __init__(self):
+        self.scales = {
+            (root_pc, mode_key): music_analysis._pitch_classes(music_analysis.NOTE_NAMES[root_pc], mode_key)
+            for root_pc in range(12)
+            for mode_key in music_analysis.MODE_CLASSES
+        }
+
+    def candidate(self, root_pc, mode_key, selected):
+        expected, spellings = self.scales[(root_pc, mode_key)]
+        expected_set = set(expected)
+        matches = selected & expected_set
+        missing = expected_set - selected
+        extra = selected - expected_set
+        return {
+            'root': music_analysis.NOTE_NAMES[root_pc].replace('-', 'b'),
+            'rootPitchClass': root_pc,
+            'mode': mode_key,
+            'name': music_analysis.MODE_LABELS[mode_key],
+            'formula': music_analysis.FORMULAS[mode_key],
+            'formulaText': ' – '.join(music_analysis.FORMULAS[mode_key]),
+            'pitchClasses': list(expected),
+            'spellings': list(spellings),
+            'matchingPitchClasses': sorted(matches),
+            'missingPitchClasses': sorted(missing),
+            'extraPitchClasses': sorted(extra),
+            'matchCount': len(matches),
+            'score': round((len(matches) * 2 - len(extra) * 1.5 - len(missing) * 0.25) / 14, 3),
+            'confirmed': selected == expected_set,
+        }
+
+    def ranked(self, selected):
+        ranked = [self.candidate(root_pc, mode_key, selected) for root_pc, mode_key in self.scales]
+        ranked.sort(key=lambda item: (-item['confirmed'], -item['score'], len(item['extraPitchClasses']), len(item['missingPitchClasses']), item['rootPitchClass'], item['mode']))
+        return ranked[:5]
+
+
+class ScaleMatchIndexParityTest(unittest.TestCase):
+    """The bundled index must reproduce the music21 analysis exactly."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.reference = _Music21Reference()
+
+    def test_bundled_index_is_current_with_music21(self):
+        with music_analysis._INDEX_PATH.open(encoding='utf-8') as index_file:
+            self.assertEqual(json.load(index_file), music_analysis.build_match_index())
+
+    def test_every_selection_and_target_matches_music21(self):
+        for selection in range(1 << 12):
+            selected_notes = [pitch_class for pitch_class in range(12) if selection >> pitch_class & 1]
+            selected = set(selected_notes)
+            result = analyze_scale_build('C', 'ionian', selected_notes)
+            self.assertEqual(result['candidates'], self.reference.ranked(selected), selected_notes)
+            for (root_pc, mode_key), candidate in music_analysis._CANDIDATES.items():
+                self.assertEqual(candidate.payload(selection), self.reference.candidate(root_pc, mode_key, selected))
+
+    def test_tonic_intervals_match_music21_for_every_spelling(self):
+        selected_notes = list(range(12))
+        for spelling in ['C', 'C#', 'DB', 'D♭', 'F♯', 'E#', 'FB', 'B#', 'G##', 'A--', 'C#4', 'C~']:
+            tonic = note.Note(music_analysis._music21_name(spelling))
+            expected = [interval.Interval(tonic, note.Note(name)).simpleName for name in music_analysis.NOTE_NAMES]
+            mode_key = 'dorian'
+            result = analyze_scale_build(spelling, mode_key, selected_notes)
+            self.assertEqual(result['selectedIntervals'], expected, spelling)
+            self.assertEqual(result['expectedPitchClasses'], list(self.reference.scales[(tonic.pitch.pitchClass, mode_key)][0]))
+
+
+
+class ScaleAnalysisCacheTest(unittest.TestCase):
+    def setUp(self):
+        music_analysis._tonic_lookup.cache_clear()
+
+    def test_repeat_roots_are_cache_hits_within_the_bound(self):
+        analyze_scale_build('Bb', 'ionian', [0])
+        analyze_scale_build('BB', 'ionian', [2])
+        stats = music_analysis.cache_metrics()['tonics']
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['max_size'], music_analysis.SCALE_ANALYSIS_CACHE_SIZE)
+        for index in range(music_analysis.SCALE_ANALYSIS_CACHE_SIZE + 10):
+            music_analysis._tonic_lookup(f'C{"#" * (index % 2)}{index}')
+        self.assertEqual(music_analysis.cache_metrics()['tonics']['size'], music_analysis.SCALE_ANALYSIS_CACHE_SIZE)
+
+    def test_warmup_fills_every_indexed_tonic(self):
+        self.assertEqual(music_analysis.warm_cache(), len(music_analysis.INDEXED_TONICS))
+        analyze_scale_build('F#', 'lydian', [6])
+        self.assertEqual(music_analysis.cache_metrics()['tonics']['misses'], len(music_analysis.INDEXED_TONICS))
+
+    def test_metrics_endpoint_reports_the_caches(self):
+        analyze_scale_build('C', 'ionian', [0])
+        analyze_scale_build('C', 'ionian', [0])
+        with patch.dict(os.environ, {'PYMUSIC_METRICS_TOKEN': 'ops-token'}):
+            body = app.test_client().get('/api/metrics', headers={'Authorization': 'Bearer ops-token'}).get_json()
+        self.assertEqual(body['scale_analysis']['tonics']['hit_rate'], 0.5)
+
+    def test_metrics_endpoint_is_not_public(self):
+        client = app.test_client()
+        with patch.dict(os.environ, {'PYMUSIC_METRICS_TOKEN': ''}):
+            self.assertEqual(client.get('/api/metrics').status_code, 401)
+        with patch.dict(os.environ, {'PYMUSIC_METRICS_TOKEN': 'ops-token'}):
+            self.assertEqual(client.get('/api/metrics').status_code, 401)
+            self.assertEqual(client.get('/api/metrics', headers={'Authorization': 'Bearer guess'}).status_code, 401)
+
+
+class ScaleVerifyBatchTest(unittest.TestCase):
+    def setUp(self):
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+        limiter_patch = patch.object(limiter, 'enabled', False)
+        limiter_patch.start()
+        self.addCleanup(limiter_patch.stop)
+
+    def test_batch_matches_single_verifies_in_order(self):
+        items = [
+            {'root': 'd', 'mode': 'dorian', 'selectedNotes': [0, 2, 4, 5, 7, 9, 11]},
+            {'root': 'C', 'mode': 'ionian', 'selectedNotes': [0, 2, 3, 5, 7, 9, 10]},
+            {'root': 'Bb', 'mode': 'lydian', 'selectedNotes': [0, 2, 4, 5, 7, 9, 11]},
+        ]
+        response = self.client.post('/api/scale-path/verify-batch', json={'items': items})
+        self.assertEqual(response.status_code, 200)
+        expected = [self.client.post('/api/scale-path/verify', json=item).get_json() for item in items]
+        self.assertEqual(response.get_json()['results'], expected)
+
+    def test_invalid_items_fail_alone(self):
+        response = self.client.post('/api/scale-path/verify-batch', json={'items': [
+            {'root': 'C', 'mode': 'ionian', 'selectedNotes': [0, 12]},
+            'not an item',
+            {'root': 'C', 'mode': 'ionian', 'selectedNotes': [0]},
+        ]})
+        results = response.get_json()['results']
+        self.assertIn('0 through 11', results[0]['error'])
+        self.assertIn('error', results[1])
+        self.assertEqual(results[2]['expectedPitchClasses'], [0, 2, 4, 5, 7, 9, 11])
+
+    def test_batch_size_is_bounded(self):
+        for items in ([], None, [{}] * 101):
+            response = self.client.post('/api/scale-path/verify-batch', json={'items': items})
+            self.assertEqual(response.status_code, 400)
+
 if __name__ == '__main__':
     unittest.main()
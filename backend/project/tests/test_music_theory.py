@@ -0,0 +1,124 @@
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+os.environ['PYMUSIC_DISABLE_BACKGROUND_INIT'] = '1'
+
+from backend.project.api.app import INTERVALS, app
+from backend.project.extensions import limiter
+from backend.project.music.Music import Music
+from backend.project.music.config import SCALE_KEYS
+from backend.project.music.theory import analyze, dominant_seventh_of
+
+
+class MusicTheoryCoreTest(unittest.TestCase):
+    def test_analysis_spells_keys_from_the_legacy_circles(self):
+        self.assertEqual(list(analyze('G', 'ionian').notes), ['G', 'A', 'B', 'C', 'D', 'E', 'F#'])
+        self.assertEqual(list(analyze('F', 'ionian').notes), ['F', 'G', 'A', 'Bb', 'C', 'D', 'E'])
+        self.assertEqual(list(analyze('a', 'aeolian').chords), ['Am', 'Bdim', 'C', 'Dm', 'Em', 'F', 'G'])
+
+    def test_analysis_is_immutable_and_does_not_share_lists(self):
+        analysis = analyze('D', 'dorian')
+        with self.assertRaises(AttributeError):
+            analysis.key = 'E'  # type: ignore[misc]
+        first = analysis.to_dict()
+        first['notes'].append('X')
+        self.assertNotIn('X', analysis.to_dict()['notes'])
+
+    def test_dominant_seventh_of_handles_flats_and_suffixes(self):
+        self.assertEqual(dominant_seventh_of('Bbdim'), dominant_seventh_of('A#'))
+        self.assertEqual(dominant_seventh_of('F#m'), dominant_seventh_of('F#'))
+        self.assertEqual(dominant_seventh_of('Am'), dominant_seventh_of('A'))
+        self.assertTrue(dominant_seventh_of('Am').endswith('7'))
+
+
+class _RecordingLLM:
+    def __init__(self):
+        self.chains = []
+
+    def getParser(self):
+        return self
+
+    def get_format_instructions(self):
+        return ''
+
+    def startingChain(self, prompt):
+        self.chains.append(prompt)
+
+
+class LLMFreeMusicTest(unittest.TestCase):
+    def test_music_imports_without_langchain_or_rich(self):
+        probe = (
+            'import sys, backend.project.music.Music; '
+            'print(sorted({name.split(".")[0] for name in sys.modules} & {"langchain_core", "rich", "pydantic"}))'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', probe], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parents[3],
+        )
+        self.assertEqual(result.stdout.strip(), '[]')
+
+    def test_theory_methods_work_without_an_llm(self):
+        music = Music().setTune('G')
+        music.getNotesFromTune()
+        self.assertEqual(music.getChords()[0], 'G')
+        self.assertEqual(music.getChordProgressions()['ii-V-I'], ['Am', 'D', 'G'])
+
+    def test_prompt_chain_is_built_once_on_first_teacher_use(self):
+        llm = _RecordingLLM()
+        music = Music(llm)
+        music.setTune('C').getNotesFromTune()
+        music.getChords()
+        self.assertEqual(llm.chains, [])
+        music.scaleTeacher
+        music.scaleTeacher
+        self.assertEqual(len(llm.chains), 1)
+
+
+class ConcurrentTheoryRoutesTest(unittest.TestCase):
+    """Mixed-key requests from many threads must never see each other's notes."""
+
+    def setUp(self):
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+
+    def test_mixed_key_requests_do_not_cross_contaminate(self):
+        cases = [
+            (route, key, mode)
+            for route in ('chord-progressions', 'secondary-dominants')
+            for key in SCALE_KEYS
+            for mode in INTERVALS
+        ]
+        expected = {}
+        for route, key, mode in cases:
+            analysis = analyze(key, mode)
+            if route == 'chord-progressions':
+                expected[(route, key, mode)] = analysis.progressions
+            else:
+                expected[(route, key, mode)] = [
+                    {'target_chord': chord, 'dominant_seventh': seventh}
+                    for chord, seventh in zip(analysis.chords, analysis.secondary_dominants)
+                ]
+
+        def fire(index):
+            route, key, mode = cases[(index * 7919) % len(cases)]
+            response = self.client.get(f'/api/{route}/{key.replace("#", "%23")}?interval={mode}')
+            body = response.get_json()
+            payload = body['progressions'] if route == 'chord-progressions' else body['secondary_dominants']
+            return (route, key, mode), body['key'], payload
+
+        with patch.object(limiter, 'enabled', False):
+            with ThreadPoolExecutor(max_workers=16) as pool:
+                results = list(pool.map(fire, range(3000)))
+
+        for case, key, payload in results:
+            self.assertEqual(key, case[1].upper())
+            self.assertEqual(payload, expected[case], case)
+
+
+if __name__ == '__main__':
+    unittest.main()
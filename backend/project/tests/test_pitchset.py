@@ -0,0 +1,45 @@
+import unittest
+from itertools import combinations
+
+from backend.project.music import pitchset
+
+
+class PitchSetTest(unittest.TestCase):
+    def test_masks_round_trip_through_members(self):
+        for mask in range(pitchset.FULL + 1):
+            self.assertEqual(pitchset.mask_of(pitchset.members(mask)), mask)
+            self.assertEqual(pitchset.POPCOUNT[mask], len(pitchset.members(mask)))
+
+    def test_transpose_matches_shifting_every_pitch_class(self):
+        for mask in (0, 1, 0b100000000001, pitchset.SCALE_MASKS['major'], pitchset.FULL):
+            for semitones in range(-13, 14):
+                expected = pitchset.mask_of(pc + semitones for pc in pitchset.members(mask))
+                self.assertEqual(pitchset.transpose(mask, semitones), expected)
+
+    def test_interval_vector_matches_pairwise_count(self):
+        for mask in range(pitchset.FULL + 1):
+            expected = [0] * 6
+            for low, high in combinations(pitchset.members(mask), 2):
+                distance = high - low
+                expected[min(distance, 12 - distance) - 1] += 1
+            self.assertEqual(pitchset.interval_vector(mask), tuple(expected))
+
+    def test_spelling_follows_the_requested_circle(self):
+        self.assertEqual(pitchset.spell(10, (0, 4, 7)), ['A#', 'D', 'F'])
+        self.assertEqual(pitchset.spell(10, (0, 4, 7), flats=True), ['Bb', 'D', 'F'])
+        self.assertEqual(pitchset.pitch_class('Db'), pitchset.pitch_class('C#'))
+        self.assertIsNone(pitchset.pitch_class('H'))
+
+    def test_compare_and_find_scales(self):
+        selected = pitchset.mask_of([0, 4, 7, 10])
+        matches, missing, extra = pitchset.compare(selected, pitchset.SCALE_MASKS['major'])
+        self.assertEqual(pitchset.members(matches), (0, 4, 7))
+        self.assertEqual(pitchset.members(missing), (2, 5, 9, 11))
+        self.assertEqual(pitchset.members(extra), (10,))
+        self.assertIn((5, 'ionian'), pitchset.find_scales(selected))
+        self.assertIn((0, 'mixolydian'), pitchset.find_scales(selected))
+        self.assertNotIn((0, 'ionian'), pitchset.find_scales(selected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import json
+import os
+import unittest
+
+os.environ['PYMUSIC_DISABLE_BACKGROUND_INIT'] = '1'
+
+from backend.project.api.app import INTERVALS, app, scale_catalog
+from backend.project.music.scale_catalog import ScaleAnalysisCatalog
+from backend.project.music.theory import analyze
+
+
+class ScaleAnalysisCatalogTest(unittest.TestCase):
+    def setUp(self):
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+
+    def test_cached_response_matches_a_fresh_analysis(self):
+        response = self.client.get('/api/scale/g?interval=dorian&octaves=2')
+        self.assertEqual(response.status_code, 200)
+        expected = analyze('G', 'dorian', octaves=2).to_dict()
+        self.assertEqual(response.get_json(), expected)
+
+    def test_matching_etag_returns_not_modified(self):
+        first = self.client.get('/api/scale/Bb?interval=lydian')
+        etag = first.headers['ETag']
+        self.assertTrue(etag)
+        second = self.client.get('/api/scale/Bb?interval=lydian', headers={'If-None-Match': etag})
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.data, b'')
+
+    def test_entries_are_frozen_and_shared(self):
+        entry = scale_catalog.get('C', 'ionian', 1)
+        self.assertIs(entry, scale_catalog.get('c', 'ionian', 1))
+        self.assertEqual(json.loads(entry.body)['notes'], list(entry.payload['notes']))
+        with self.assertRaises(TypeError):
+            entry.payload['notes'] = []  # type: ignore[index]
+
+    def test_unknown_keys_are_answered_but_not_retained(self):
+        builds = []
+
+        def build(key, interval_type, octaves):
+            builds.append((key, interval_type, octaves))
+            return {'key': key}
+
+        catalog = ScaleAnalysisCatalog(build, INTERVALS.keys())
+        catalog.get('H', 'ionian', 1)
+        catalog.get('H', 'ionian', 1)
+        self.assertEqual(len(catalog), 0)
+        self.assertEqual(len(builds), 2)
+        self.assertEqual(catalog.warm(), 17 * len(INTERVALS) * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
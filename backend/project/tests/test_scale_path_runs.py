@@ -0,0 +1,264 @@
+import base64
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+os.environ['PYMUSIC_DISABLE_BACKGROUND_INIT'] = '1'
+
+import sqlalchemy as sa
+from flask import Flask
+
+from backend.project import scale_path_codec, scale_path_retention, scale_path_tokens
+from backend.project.api.app import (
+    _generate_scale_path_run, _scale_path_run, complete_scale_path_fragment, get_scale_path_run,
+)
+from backend.project.auth import login_manager
+from backend.project.extensions import limiter
+from backend.project.models import db
+from backend.project.models.user import ScalePathAttempt, ScalePathDailyTotal, ScalePathRun, User
+
+
+class ScalePathRunTest(unittest.TestCase):
+    def setUp(self):
+        self.db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+        self.db_file.close()
+        self.app = Flask(__name__)
+        self.app.config.update(
+            SECRET_KEY='test-secret',
+            SQLALCHEMY_DATABASE_URI=f'sqlite:///{self.db_file.name}',
+            SQLALCHEMY_TRACK_MODIFICATIONS=False,
+            RATELIMIT_ENABLED=False,
+            TESTING=True,
+        )
+        db.init_app(self.app)
+        limiter.init_app(self.app)
+        login_manager.init_app(self.app)
+        self.app.add_url_rule('/api/scale-path/run', view_func=get_scale_path_run)
+        self.app.add_url_rule('/api/scale-path/complete', view_func=complete_scale_path_fragment, methods=['POST'])
+        with self.app.app_context():
+            db.create_all()
+            users = [User(username=name, email=f'{name}@example.com', password_hash='x') for name in ('player', 'rival')]
+            db.session.add_all(users)
+            db.session.commit()
+            self.player_id, self.rival_id = [user.id for user in users]
+        self.client = self.app.test_client()
+        self._login(self.player_id)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+        os.unlink(self.db_file.name)
+
+    def _login(self, user_id):
+        with self.client.session_transaction() as session:
+            session['_user_id'] = str(user_id)
+            session['_fresh'] = True
+
+    def _start(self, **params):
+        response = self.client.get('/api/scale-path/run', query_string={'seed': 'fixed', **params})
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        return response.get_json()
+
+    def _answer(self, run, index):
+        token = scale_path_tokens.decode_run_token(run['runId'], 'test-secret')
+        packed = _scale_path_run(token.seed, token.root, token.mode, token.octaves, token.route_modifier)
+        return scale_path_codec.decode_fragment(packed, index)['gap']
+
+    def _complete(self, run_id, index, position):
+        return self.client.post('/api/scale-path/complete', json={
+            'runId': run_id, 'fragmentIndex': index,
+            'submittedPosition': {'string': position['string'], 'fret': position['fret']},
+        })
+
+    def test_signed_run_is_regenerated_and_scored_without_a_stored_row(self):
+        run = self._start(root='a', mode='aeolian', octaves=2, difficulty=3)
+        self.assertEqual((run['root'], run['mode'], run['fretCount']), ('A', 'aeolian', 17))
+        self.assertEqual(self._start(root='A', mode='aeolian', octaves=2, difficulty=3)['fragments'], run['fragments'])
+        self.assertLessEqual(len(run['runId']), 80)
+
+        gap = self._answer(run, 1)
+        first = self._complete(run['runId'], 1, gap)
+        self.assertEqual(first.status_code, 200, first.get_data(as_text=True))
+        self.assertEqual((first.get_json()['correct'], first.get_json()['xp_awarded']), (True, 30))
+        replay = self._complete(run['runId'], 1, gap).get_json()
+        self.assertTrue(replay['already_recorded'])
+        self.assertEqual(replay['xp_awarded'], 30)
+
+        wrong = {'string': gap['string'], 'fret': (gap['fret'] + 1) % 12}
+        self.assertFalse(self._complete(run['runId'], 0, wrong).get_json()['correct'])
+        with self.app.app_context():
+            self.assertEqual(db.session.query(ScalePathRun).count(), 0)
+            self.assertEqual(db.session.query(ScalePathAttempt).count(), 2)
+            self.assertEqual(db.session.get(User, self.player_id).xp, 30)
+
+    def test_packed_run_matches_the_json_run(self):
+        for seed in ('fixed', 'other', 'third'):
+            run = self._start(seed=seed, octaves=3)
+            packed = self._start(seed=seed, octaves=3, encoding='packed')
+            self.assertEqual(packed['codec'], scale_path_codec.CODEC_VERSION)
+            self.assertNotIn('fragments', packed)
+            blob = base64.b64decode(packed['packed'])
+            self.assertEqual(json.loads(json.dumps(scale_path_codec.decode_run(blob))),
+                             [run['positions'], run['fragments']])
+            self.assertLess(len(packed['packed']) * 10, len(json.dumps(run['positions'] + run['fragments'])))
+
+    def test_tampered_foreign_and_expired_run_ids_are_rejected(self):
+        run = self._start()
+        gap = self._answer(run, 0)
+        payload, signature = run['runId'].split('.')
+        forged = f'{payload[:-2]}{"A" if payload[-2] != "A" else "B"}{payload[-1]}.{signature}'
+        self.assertEqual(self._complete(forged, 0, gap).status_code, 400)
+        self.assertEqual(self._complete('not-a-run', 0, gap).status_code, 400)
+        self.assertEqual(self.client.get('/api/scale-path/run?root=H').status_code, 400)
+        self.assertEqual(self.app.test_client().get('/api/scale-path/run').status_code, 401)
+
+        self._login(self.rival_id)
+        self.assertEqual(self._complete(run['runId'], 0, gap).status_code, 403)
+        self._login(self.player_id)
+        later = datetime.utcnow() + timedelta(seconds=scale_path_tokens.RUN_TTL_SECONDS + 60)
+        with patch('backend.project.api.app.datetime') as clock:
+            clock.utcnow.return_value = later
+            clock.utcfromtimestamp.side_effect = datetime.utcfromtimestamp
+            self.assertEqual(self._complete(run['runId'], 0, gap).status_code, 410)
+
+    def test_legacy_stored_run_ids_still_complete(self):
+        gap = {'string': 'A', 'fret': 3, 'note': 'C', 'stringIndex': 1, 'pitch': 0}
+        with self.app.app_context():
+            db.session.add(ScalePathRun(
+                run_id='scale-path-C-ionian-1-abcd', user_id=self.player_id, root='C', mode='ionian',
+                difficulty=2, octaves=1, fret_count=12, fragments_json=json.dumps([{'gap': gap}]),
+                positions_json='[]', expires_at=datetime.utcnow() + timedelta(hours=1),
+            ))
+            db.session.commit()
+        response = self._complete('scale-path-C-ionian-1-abcd', 0, gap)
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        self.assertEqual(response.get_json()['xp_awarded'], 20)
+
+    def _seed_expired_runs(self, count):
+        expired = (datetime.utcnow() - timedelta(days=2)).strftime('%Y-%m-%d %H:%M:%S.%f')
+        db.session.execute(sa.text('''
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :count)
+            INSERT INTO scale_path_runs (run_id, user_id, root, mode, difficulty, octaves, fret_count,
+                                         fragments_json, positions_json, created_at, expires_at)
+            SELECT 'scale-path-C-ionian-' || i, :user_id, 'C', 'ionian', 1, 1, 12, '[]', '[]', :expired, :expired
+            FROM n
+        '''), {'count': count, 'user_id': self.player_id, 'expired': expired})
+        db.session.add(ScalePathRun(
+            run_id='scale-path-live', user_id=self.player_id, root='C', mode='ionian', fragments_json='[]',
+            positions_json='[]', expires_at=datetime.utcnow() + timedelta(hours=1),
+        ))
+        db.session.commit()
+
+    def test_sweep_batches_grow_from_the_first_batch_within_the_lock_budget(self):
+        self.assertEqual(scale_path_retention._next_batch_size(100, 5.0, 50, 2000), 500)
+        self.assertEqual(scale_path_retention._next_batch_size(100, 0.1, 50, 2000), 2000)
+        self.assertEqual(scale_path_retention._next_batch_size(100, 500.0, 50, 2000), 5)
+        self.assertEqual(scale_path_retention._next_batch_size(0, 0.0, 50, 2000), 2000)
+
+        batches = []
+        with self.app.app_context():
+            self._seed_expired_runs(1500)
+            stats = scale_path_retention.sweep_scale_path_retention(
+                batch_size=400, progress=lambda table, deleted, last_id: batches.append(deleted),
+            )
+            self.assertEqual(stats['runs_deleted'], 1500)
+            self.assertEqual(len(stats['lock_ms']), len(batches))
+            sizes = [after - before for before, after in zip([0] + batches, batches)]
+            self.assertEqual(sizes[0], scale_path_retention.SWEEP_FIRST_BATCH_SIZE)
+            self.assertLessEqual(max(sizes), 400)
+            self.assertEqual([row.run_id for row in ScalePathRun.query], ['scale-path-live'])
+
+    @unittest.skipUnless(os.getenv('PYMUSIC_LARGE_SWEEP_TEST') == '1', 'set PYMUSIC_LARGE_SWEEP_TEST=1 to run')
+    def test_sweep_deletes_a_million_expired_runs_in_short_write_locks(self):
+        with self.app.app_context():
+            self._seed_expired_runs(1_000_000)
+            stats = scale_path_retention.sweep_scale_path_retention(max_lock_ms=100)
+            self.assertEqual(stats['runs_deleted'], 1_000_000)
+            self.assertLess(max(stats['lock_ms']), 100)
+            self.assertEqual([row.run_id for row in ScalePathRun.query], ['scale-path-live'])
+
+    def test_sweep_archives_daily_totals_before_deleting_dead_attempts(self):
+        old = datetime.utcnow() - timedelta(days=3)
+        with self.app.app_context():
+            db.session.execute(ScalePathAttempt.__table__.insert(), [
+                {'user_id': self.player_id, 'run_id': f'run-{index}', 'fragment_index': 0,
+                 'correct': index % 2 == 0, 'xp_awarded': 10 if index % 2 == 0 else 0,
+                 'created_at': old + timedelta(days=index // 3)}
+                for index in range(6)
+            ] + [
+                {'user_id': self.rival_id, 'run_id': 'run-rival', 'fragment_index': 0, 'correct': True,
+                 'xp_awarded': 20, 'created_at': old},
+                {'user_id': self.player_id, 'run_id': 'run-fresh', 'fragment_index': 0, 'correct': True,
+                 'xp_awarded': 10, 'created_at': datetime.utcnow()},
+            ])
+            db.session.commit()
+            before = scale_path_retention.retention_metrics()
+
+            stats = scale_path_retention.sweep_scale_path_retention()
+            self.assertEqual((stats['attempts_deleted'], stats['days_archived']), (7, 3))
+            self.assertEqual([row.run_id for row in ScalePathAttempt.query], ['run-fresh'])
+            totals = {
+                (row.user_id, row.day): (row.attempts, row.correct, row.xp_awarded)
+                for row in ScalePathDailyTotal.query
+            }
+            self.assertEqual(totals, {
+                (self.player_id, old.strftime('%Y-%m-%d')): (3, 2, 20),
+                (self.player_id, (old + timedelta(days=1)).strftime('%Y-%m-%d')): (3, 1, 10),
+                (self.rival_id, old.strftime('%Y-%m-%d')): (1, 1, 20),
+            })
+            after = scale_path_retention.retention_metrics()
+            self.assertEqual(after['sweeps'], before['sweeps'] + 1)
+            self.assertEqual(after['attempts_deleted'], before['attempts_deleted'] + 7)
+
+    def test_overlapping_sweeps_archive_each_attempt_once(self):
+        old = datetime.utcnow() - timedelta(days=3)
+        with self.app.app_context():
+            db.session.execute(ScalePathAttempt.__table__.insert(), [
+                {'user_id': self.player_id, 'run_id': f'run-{index}', 'fragment_index': 0,
+                 'correct': True, 'xp_awarded': 10, 'created_at': old}
+                for index in range(4)
+            ])
+            db.session.commit()
+            attempts = ScalePathAttempt.__table__
+
+            raced = []
+
+            # Another sweep deletes (and archives) this batch between our
+            # SELECT and our DELETE.
+            def race(conn, cursor, statement, parameters, context, executemany):
+                if statement.startswith('DELETE FROM scale_path_attempts') and not raced:
+                    raced.append(statement)
+                    with db.engine.begin() as other:
+                        other.execute(attempts.delete())
+
+            sa.event.listen(db.engine, 'before_cursor_execute', race)
+            try:
+                stats = scale_path_retention.sweep_scale_path_retention()
+            finally:
+                sa.event.remove(db.engine, 'before_cursor_execute', race)
+            self.assertEqual(len(raced), 1)
+            self.assertEqual((stats['attempts_deleted'], stats['days_archived']), (0, 0))
+            self.assertEqual(ScalePathDailyTotal.query.count(), 0)
+
+
+class ScalePathCodecTest(unittest.TestCase):
+    def test_runs_round_trip_exactly(self):
+        for seed in range(40):
+            for mode in scale_path_tokens.MODES:
+                modifier = scale_path_tokens.ROUTE_MODIFIERS[seed % 7]
+                packed = _scale_path_run(seed, 'F#', mode, seed % 3 + 1, modifier)
+                positions, fragments = _generate_scale_path_run(seed, 'F#', mode, seed % 3 + 1, modifier)
+                self.assertEqual(scale_path_codec.decode_run(packed), (positions, fragments))
+
+    def test_unknown_versions_are_rejected(self):
+        packed = _scale_path_run(1, 'C', 'ionian', 1, 'ascending')
+        with self.assertRaises(ValueError):
+            scale_path_codec.decode_run(bytes([scale_path_codec.CODEC_VERSION + 1]) + packed[1:])
+
+
+if __name__ == '__main__':
+    unittest.main()
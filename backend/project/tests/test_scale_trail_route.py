@@ -1,3 +1,5 @@
+import hashlib
+import json
 import os
 import unittest
 
@@ -8,6 +10,19 @@ from backend.project.api.app import (
     _public_scale_path_fragment,
     _select_tier1_fragment,
 )
+from backend.project.music import fretboard, pitchset
+
+ROUTE_MODIFIERS = (
+    'ascending', 'descending', 'same-string', 'nearest-position',
+    'alternate-strings', 'octave-target', 'listen-first',
+)
+PARITY_ROUTES = (
+    ('C', 'ionian', 1, 12), ('A', 'aeolian', 2, 17), ('F#', 'dorian', 3, 22),
+    ('Bb', 'mixolydian', 2, 17), ('E', 'locrian', 1, 12),
+)
+# sha256 of every fragment of 7-move journeys over PARITY_ROUTES x 60 seeds
+# x ROUTE_MODIFIERS, as selected before the neighbour index existed.
+PARITY_DIGEST = '6d41df544567271cdba74d6624625c8f2a404991acb86703088f69463732325a'
 
 
 class ScaleTrailRouteTest(unittest.TestCase):
@@ -74,6 +89,52 @@ class ScaleTrailRouteTest(unittest.TestCase):
         }
         self.assertEqual(open_strings, {0: 'E', 1: 'A', 2: 'D', 3: 'G', 4: 'B', 5: 'E'})
 
+    def test_route_index_matches_walking_the_neck_for_every_root_mode_and_octave(self):
+        for root in ('C', 'C#', 'Db', 'D', 'Eb', 'E', 'F', 'F#', 'G', 'Ab', 'A', 'Bb', 'B'):
+            for mode in pitchset.MODES:
+                root_tone = pitchset.PITCH_CLASS_OF[root]
+                scale = {(root_tone + step) % 12 for step in pitchset.SCALE_INTERVALS[mode]}
+                for octaves, fret_count in ((1, 12), (2, 17), (3, 22)):
+                    expected = [
+                        {'string': string_note, 'fret': fret, 'note': pitchset.SHARP_NAMES[pitch],
+                         'stringIndex': string_index, 'pitch': pitch}
+                        for string_index, string_note in enumerate(('E', 'A', 'D', 'G', 'B', 'E'))
+                        for fret in range(fret_count + 1)
+                        for pitch in [(pitchset.PITCH_CLASS_OF[string_note] + fret) % 12]
+                        if pitch in scale
+                    ]
+                    self.assertEqual(_build_scale_route(root, mode, octaves, fret_count), expected)
+
+        by_pitch = fretboard.positions_by_pitch(fretboard.STANDARD_TUNING)
+        self.assertEqual(sum(len(positions) for positions in by_pitch), 6 * 25)
+        self.assertIn((0, 0), by_pitch[4])
+        self.assertIn((5, 12), by_pitch[4])
+
+    def _journey_digest(self, shared_index):
+        digest = hashlib.sha256()
+        for root, mode, octaves, fret_count in PARITY_ROUTES:
+            positions = _build_scale_route(root, mode, octaves, fret_count)
+            for seed in range(60):
+                for modifier in ROUTE_MODIFIERS:
+                    anchor, visited = None, []
+                    neighbours = fretboard.RouteNeighbours(positions) if shared_index else None
+                    for index in range(7):
+                        fragment = _select_tier1_fragment(
+                            positions, root, mode, index, seed * 7919 + 13, modifier,
+                            anchor=anchor, visited=visited, neighbours=neighbours,
+                        )
+                        digest.update(json.dumps(fragment, sort_keys=True).encode())
+                        anchor = fragment['gap']
+                        if shared_index:
+                            neighbours.visit(fragment['gap'])
+                        else:
+                            visited.append(fragment['gap'])
+        return digest.hexdigest()
+
+    def test_neighbour_index_selects_exactly_the_previous_fragments(self):
+        self.assertEqual(self._journey_digest(shared_index=False), PARITY_DIGEST)
+        self.assertEqual(self._journey_digest(shared_index=True), PARITY_DIGEST)
+
     def test_public_fragment_never_exposes_correctness_or_gap(self):
         private = _select_tier1_fragment(self.positions, 'C', 'ionian', 0, 12, 'ascending')
         assert private is not None
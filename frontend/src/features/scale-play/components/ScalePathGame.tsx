@@ -70,7 +70,7 @@ const ScalePathGame: React.FC = () => {
     setTrail([])
     setWrongBranch(null)
     try {
-      const response = await getScalePathRun({})
+      const response = await getScalePathRun({ encoding: 'packed' })
       const normalized = normalizeRun(response.data)
       dispatch({ type: 'RUN_LOADED', run: normalized })
       setShowCompass(false)
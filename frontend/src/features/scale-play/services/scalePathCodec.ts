@@ -0,0 +1,74 @@
+// Decode a packed Scale Path run (GET /api/scale-path/run?encoding=packed).
+// Mirrors backend/project/scale_path_codec.py; the root and mode tables must
+// stay in the order of backend/project/scale_path_tokens.py.
+
+import type { ScalePathFragment, ScalePathPosition } from '../state/scalePathReducer'
+
+export const SCALE_PATH_CODEC_VERSION = 1
+
+const HEADER_BYTES = 7
+const WITH_ANSWERS = 0x01
+const UP = 0x08
+const FRETS_PER_STRING = 25 // MAX_FRETS + 1
+const STANDARD_TUNING = ['E', 'A', 'D', 'G', 'B', 'E']
+const SHARP_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+const OPEN_PITCH = [4, 9, 2, 7, 11, 4]
+const ROOTS = ['C', 'C#', 'DB', 'D', 'D#', 'EB', 'E', 'F', 'F#', 'GB', 'G', 'G#', 'AB', 'A', 'A#', 'BB', 'B']
+const MODES = ['ionian', 'dorian', 'phrygian', 'lydian', 'mixolydian', 'aeolian', 'locrian']
+
+function positionAt(byte: number): ScalePathPosition {
+  const stringIndex = Math.floor(byte / FRETS_PER_STRING)
+  const fret = byte % FRETS_PER_STRING
+  const pitch = (OPEN_PITCH[stringIndex] + fret) % 12
+  return { string: STANDARD_TUNING[stringIndex], fret, note: SHARP_NAMES[pitch], stringIndex, pitch }
+}
+
+function base64Bytes(text: string): Uint8Array {
+  const binary = atob(text)
+  const bytes = new Uint8Array(binary.length)
+  for (let i = 0; i < binary.length; i += 1) bytes[i] = binary.charCodeAt(i)
+  return bytes
+}
+
+export function decodeScalePathRun(packed: string): {
+  positions: ScalePathPosition[]
+  fragments: ScalePathFragment[]
+} {
+  const blob = base64Bytes(packed)
+  if (blob.length < HEADER_BYTES || blob[0] !== SCALE_PATH_CODEC_VERSION) {
+    throw new Error(`Not a version ${SCALE_PATH_CODEC_VERSION} Scale Path run`)
+  }
+  const withAnswers = (blob[1] & WITH_ANSWERS) !== 0
+  const root = ROOTS[blob[2]]
+  const mode = MODES[blob[3]]
+  const difficulty = blob[4]
+  let offset = HEADER_BYTES + blob[5]
+  const positions = Array.from(blob.subarray(HEADER_BYTES, offset), positionAt)
+  const fragments: ScalePathFragment[] = []
+  for (let fragmentIndex = 0; fragmentIndex < blob[6]; fragmentIndex += 1) {
+    const anchor = positionAt(blob[offset])
+    const clue = blob[offset + 1]
+    const count = (clue >> 4) & 0x03
+    const candidateBytes = Array.from(blob.subarray(offset + 2, offset + 2 + count))
+    offset += 2 + count
+    const fragment: ScalePathFragment = {
+      fragmentIndex,
+      root,
+      mode,
+      difficulty,
+      anchor,
+      suffix: [anchor],
+      candidates: candidateBytes.map(positionAt),
+      direction: clue & UP ? 'up' : 'left',
+      degreeClue: String(clue & 0x07),
+    }
+    if (withAnswers) {
+      const gapByte = blob[offset]
+      fragment.gap = positionAt(gapByte)
+      fragment.candidates = candidateBytes.map((byte) => ({ ...positionAt(byte), isCorrect: byte === gapByte }))
+      offset += 1
+    }
+    fragments.push(fragment)
+  }
+  return { positions, fragments }
+}
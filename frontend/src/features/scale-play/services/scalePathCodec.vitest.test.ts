@@ -0,0 +1,45 @@
+import { describe, expect, it } from 'vitest'
+import { decodeScalePathRun } from './scalePathCodec'
+
+// Seed 3, A aeolian, one octave, packed by backend/project/scale_path_codec.py.
+const PUBLIC_RUN =
+  'AQANBQEwBwABAwUHCAoMGRscHiAhIyUyNDU3OTs8PktNT1BSVFVXZGVnaWpsbnB9foCChIWHiQU7aiUcHD83DE03PWk8O2k2anBlajkAhIKCNQgBiYk5bgEg'
+const RUN_WITH_ANSWERS =
+  'AQENBQEwBwABAwUHCAoMGRscHiAhIyUyNDU3OTs8PktNT1BSVFVXZGVnaWpsbnB9foCChIWHiQU7aiUcHBw/NwxNNzc9aTw7aWk2anBlamo5AISCgoI1CAGJiYk5bgEgbg=='
+
+describe('Scale Path run codec', () => {
+  it('rebuilds the JSON run the server would have sent', () => {
+    const { positions, fragments } = decodeScalePathRun(PUBLIC_RUN)
+    expect(positions).toHaveLength(48)
+    expect(positions[0]).toEqual({ string: 'E', fret: 0, note: 'E', stringIndex: 0, pitch: 4 })
+    expect(positions[47]).toEqual({ string: 'E', fret: 12, note: 'E', stringIndex: 5, pitch: 4 })
+    expect(fragments).toHaveLength(7)
+    const anchor = { string: 'A', fret: 3, note: 'C', stringIndex: 1, pitch: 0 }
+    expect(fragments[1]).toEqual({
+      fragmentIndex: 1,
+      root: 'A',
+      mode: 'aeolian',
+      difficulty: 1,
+      anchor,
+      suffix: [anchor],
+      candidates: [
+        { string: 'D', fret: 5, note: 'G', stringIndex: 2, pitch: 7 },
+        { string: 'E', fret: 12, note: 'E', stringIndex: 0, pitch: 4 },
+        { string: 'G', fret: 2, note: 'A', stringIndex: 3, pitch: 9 },
+      ],
+      direction: 'up',
+      degreeClue: '7',
+    })
+  })
+
+  it('marks the correct candidate only when the blob carries answers', () => {
+    const { fragments } = decodeScalePathRun(RUN_WITH_ANSWERS)
+    expect(fragments[1].gap).toEqual({ string: 'D', fret: 5, note: 'G', stringIndex: 2, pitch: 7 })
+    expect(fragments[1].candidates.map((candidate) => candidate.isCorrect)).toEqual([true, false, false])
+    expect(decodeScalePathRun(PUBLIC_RUN).fragments[1].gap).toBeUndefined()
+  })
+
+  it('rejects unknown codec versions', () => {
+    expect(() => decodeScalePathRun(btoa('\x02\x00\x00\x00\x01\x00\x00'))).toThrow()
+  })
+})
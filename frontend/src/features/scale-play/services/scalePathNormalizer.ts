@@ -1,6 +1,7 @@
 // Normalize API scale data → game data for Scale Path
 
 import type { ScalePathFragment, ScalePathPosition, ScalePathRun } from '../state/scalePathReducer'
+import { decodeScalePathRun } from './scalePathCodec'
 
 export interface NormalizedFragment {
   id: string
@@ -31,7 +32,7 @@ export function normalizeFragment(raw: ScalePathFragment, index: number): Normal
   }
 }
 
-export function normalizeRun(raw: ScalePathRun): {
+export function normalizeRun(raw: ScalePathRun & { packed?: string }): {
   runId: string
   root: string
   mode: string
@@ -44,6 +45,7 @@ export function normalizeRun(raw: ScalePathRun): {
   routeModifier: string
   seed: string
 } {
+  if (raw.packed) raw = { ...raw, ...decodeScalePathRun(raw.packed) }
   return {
     runId: raw.runId,
     root: raw.root,
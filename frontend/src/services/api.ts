@@ -98,7 +98,7 @@ export const recordAnalyticsEvent = (event, activity, properties = {}) =>
 export const getDailyChallenges = (
   limit = 10,
   offset = 0,
-  options: { random?: boolean; excludeIds?: Array<number | string> } = {},
+  options: { random?: boolean; review?: boolean; excludeIds?: Array<number | string>; after?: string | null } = {},
 ) => {
   const params = new URLSearchParams({
     limit: String(limit),
@@ -106,7 +106,11 @@ export const getDailyChallenges = (
   })
 
   if (options.random) params.set('random', '1')
+  // Due spaced-repetition skills first (signed-in players only).
+  if (options.review) params.set('review', '1')
   if (options.excludeIds?.length) params.set('exclude_ids', options.excludeIds.join(','))
+  // `next_cursor` from the previous page; the server then ignores `offset`.
+  if (options.after) params.set('after', options.after)
 
   return api.get(`/api/daily-challenges?${params.toString()}`)
 }
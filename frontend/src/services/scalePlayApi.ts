@@ -8,6 +8,8 @@ export interface ScalePathRunParams {
   octaves?: number
   difficulty?: number
   seed?: string
+  // 'packed' swaps positions/fragments for one base64 blob; see scalePathCodec.
+  encoding?: 'packed'
 }
 
 export const getScalePathRun = (params: ScalePathRunParams = {}) => {
@@ -17,6 +19,7 @@ export const getScalePathRun = (params: ScalePathRunParams = {}) => {
   if (params.octaves) qs.set('octaves', String(params.octaves))
   if (params.difficulty) qs.set('difficulty', String(params.difficulty))
   if (params.seed) qs.set('seed', params.seed)
+  if (params.encoding) qs.set('encoding', params.encoding)
   return api.get(`/api/scale-path/run?${qs.toString()}`)
 }
 
@@ -33,3 +36,9 @@ export const completeScalePathFragment = (payload: CompleteScalePathFragmentPayl
 
 export const verifyScaleLabBuild = (payload: { root: string; mode: string; selectedNotes: number[] }) =>
   api.post('/api/scale-path/verify', payload)
+
+export type ScaleLabBuildPayload = { root: string; mode: string; selectedNotes: number[] }
+
+// Up to 100 items; results come back in the same order, with `error` set on invalid items.
+export const verifyScaleLabBuilds = (items: ScaleLabBuildPayload[]) =>
+  api.post('/api/scale-path/verify-batch', { items })